@@ -21,8 +21,177 @@ __email__ = "SparkDustJoe@gmail.com (see repository in GitHub.com/sparkdustjoe f
 __license__ = "CC0";
 __copyright__ = "(c) 2019 Dustin J. Sparks (CC0 License)";
 
-#import array;
-#import sys;
+import os;
+import struct;
+import time;
+
+# constant tables per Word_Size_Bits, shared by every NorxParams
+__ROT_CONSTS__ = {32: (8, 11, 16, 31), 64: (8, 19, 40, 63)};
+__INIT_CONSTS__ = {
+    32: (0xA3D8D930, 0x3FA8B72C, 0xED84EB49, 0xEDCA4787, 
+         0x335463EB, 0xF994220B, 0xBE0BF5C9, 0xD7C49104),
+    64: (0xB15E641748DE5E6B, 0xAA95E955E10F8410, 0x28D1034441A9DD40, 0x7F31BBF964E93BF5,
+         0xB5E9E22493DFFB96, 0xB980C852479FAFBD, 0xDA24516BF55EAFD4, 0x86026AE8536F1501),
+};
+__WORD_BITS_MASKS__ = {32: 0xffffffff, 64: 0xffffffffffffffff};
+# bulk little-endian word codecs: a whole rate block (12 words), and the 4 words of a key/nonce/capacity
+__RATE_CODECS__ = {32: struct.Struct('<12I'), 64: struct.Struct('<12Q')};
+__WORD4_CODECS__ = {32: struct.Struct('<4I'), 64: struct.Struct('<4Q')};
+__F_KERNELS__ = {}; # (Word_Size_Bits, Rounds) -> generated permutation
+
+def __f_kernel__(w, r):
+    """
+    Return the straight-line F permutation for w-bit words and r rounds (generated once, then cached).
+    The kernel takes the 16 word State S and permutes it in place: every G step of every round is 
+    unrolled, the State is held in local variables, and the rotation constants and word mask are inlined.
+    """
+    kernel = __F_KERNELS__.get((w, r));
+    if kernel is None:
+        kernel = __build_f_kernel__(w, r);
+        __F_KERNELS__[(w, r)] = kernel;
+    return kernel;
+
+def __build_f_kernel__(w, r):
+    rc = __ROT_CONSTS__.get(w);
+    if rc is None: raise Exception("Unsupported word size: " + str(w));
+    mask = hex((1 << w) - 1);
+    s = ["s" + str(i) for i in range(0, 16)];
+    def H(x, y): # x = H(x, y)
+        return "    %s = ((%s ^ %s) ^ ((%s & %s) << 1)) & %s" % (x, x, y, x, y, mask);
+    def ROT(x, y, n): # x = ROT(x ^ y, n)
+        return "    %s ^= %s; %s = ((%s >> %d) | (%s << %d)) & %s" % (x, y, x, x, n, x, w - n, mask);
+    steps = ((0, 4, 8, 12), (1, 5, 9, 13), (2, 6, 10, 14), (3, 7, 11, 15), # Column step
+             (0, 5, 10, 15), (1, 6, 11, 12), (2, 7, 8, 13), (3, 4, 9, 14)); # Diagonal step
+    src = ["def F(S):", "    " + ", ".join(s) + " = S"];
+    for i in range(0, r):
+        for (a, b, c, d) in steps:
+            a, b, c, d = s[a], s[b], s[c], s[d];
+            src.append(H(a, b));
+            src.append(ROT(d, a, rc[0]));
+            src.append(H(c, d));
+            src.append(ROT(b, c, rc[1]));
+            src.append(H(a, b));
+            src.append(ROT(d, a, rc[2]));
+            src.append(H(c, d));
+            src.append(ROT(b, c, rc[3]));
+    src.append("    " + ", ".join("S[" + str(i) + "]" for i in range(0, 16)) + " = " + ", ".join(s));
+    scope = {};
+    exec(compile("\n".join(src), "<NORX F kernel W=%d R=%d>" % (w, r), "exec"), scope);
+    return scope["F"];
+
+def __lane_worker__(params, S, x, last, decrypt):
+    """
+    Process one lane (runs in an executor, possibly in another process): x holds this lane's full blocks
+    back to back, last is the final (partial) block of the payload when this lane owns it, else None.
+    Returns tuple(lane State, output for x (+ last)).
+    """
+    W, R, P, T = params;
+    norx = PyNORX(Word_Size_Bits=W, Rounds=R, Lanes=P, Tag_Size_Bits=T);
+    b = norx.BYTES_RATE;
+    out = bytearray(len(x) + (len(last) if last is not None else 0));
+    x = memoryview(x);
+    block = norx.__dec_block_into__ if decrypt else norx.__enc_block_into__;
+    for i in range(0, len(x), b):
+        block(S, x[i:i+b], out, i);
+    if last is not None:
+        (norx.__dec_last_into__ if decrypt else norx.__enc_last_into__)(S, last, out, len(x));
+    return (S, bytes(out));
+
+def __batch_worker__(params, records, decrypt):
+    """
+    Process one chunk of an aead_encrypt_many/aead_decrypt_many batch (runs in an executor).
+    """
+    W, R, P, T = params;
+    return PyNORX(Word_Size_Bits=W, Rounds=R, Lanes=P, Tag_Size_Bits=T).__batch__(records, decrypt);
+
+def __numpy_backend__():
+    """
+    Return the PyNORXNUMPY module when numpy is importable, else None (imported lazily, on first use)
+    """
+    try:
+        import PyNORXNUMPY;
+    except ImportError:
+        return None;
+    return PyNORXNUMPY if PyNORXNUMPY.AVAILABLE else None;
+
+def __c_backend__():
+    """
+    Return the PyNORXC module when its compiled core is built and loads, else None (imported lazily, on first use)
+    """
+    try:
+        import PyNORXC;
+    except ImportError:
+        return None;
+    return PyNORXC if PyNORXC.AVAILABLE else None;
+
+class NorxParams(object):
+    """
+    The immutable constants derived from one (Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits) configuration.
+    Interned: NorxParams(W, R, P, T) returns the same object for the same configuration, so every PyNORX 
+    object starts from it (PyNORX copies the fields into its own slots once, in __init__).
+    """
+    __slots__ = (
+        'NORX_W_BITS', 'NORX_R', 'NORX_P', 'NORX_T_BITS', 'BYTES_WORD', 'BYTES_NONCE', 'BYTES_KEY', 'BITS_STATE',
+        'BYTES_STATE', 'BYTES_CAPACITY', 'BITS_CAPACITY', 'BYTES_TAG', 'BYTES_RATE', 'WORDS_RATE',
+        '__ROT_CONST__', '__INIT_CONST__', '__WORD_BITS_MASK__', '__F__', '__RATE_CODEC__', '__WORD4_CODEC__',
+    );
+    __INTERNED__ = {};
+    WORDS_NONCE = 4; # per spec 3.0 "4w"
+    WORDS_KEY = 4; # per spec 3.0 "4w"
+    WORDS_CAPACITY = 4; # per spec 3.0 "4w"
+
+    def __new__(cls, Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits):
+        params = cls.__INTERNED__.get((Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits));
+        if params is not None:
+            return params;
+        assert Word_Size_Bits in [32, 64]
+        assert 63 >= Rounds >= 1
+        assert 255 >= Lanes >= 1 # inifinite parallelism (P=0) not supported
+        assert 4 * Word_Size_Bits >= Tag_Size_Bits >= 0
+        assert Tag_Size_Bits % 8 == 0 # byte-aligned tags only
+        params = object.__new__(cls);
+        def put(name, value): # __setattr__ refuses every assignment, see below
+            object.__setattr__(params, name, value);
+        put('NORX_W_BITS', Word_Size_Bits);
+        put('NORX_R', Rounds);
+        put('NORX_P', Lanes);
+        put('NORX_T_BITS', Tag_Size_Bits);
+        put('BYTES_WORD', Word_Size_Bits // 8); # integer division
+        put('BYTES_NONCE', params.BYTES_WORD * cls.WORDS_NONCE);
+        put('BYTES_KEY', params.BYTES_WORD * cls.WORDS_KEY);
+        put('BITS_STATE', Word_Size_Bits * 16); # per spec, state is 16w
+        put('BYTES_STATE', params.BITS_STATE // 8); # integer division
+        put('BYTES_CAPACITY', params.BYTES_WORD * cls.WORDS_CAPACITY);
+        put('BITS_CAPACITY', params.BYTES_CAPACITY * 8);
+        put('BYTES_TAG', Tag_Size_Bits // 8); # integer division
+        put('BYTES_RATE', params.BYTES_STATE - params.BYTES_CAPACITY);
+        put('WORDS_RATE', params.BYTES_RATE // params.BYTES_WORD); # integer division
+        put('__ROT_CONST__', __ROT_CONSTS__[Word_Size_Bits]);
+        put('__INIT_CONST__', __INIT_CONSTS__[Word_Size_Bits]);
+        put('__WORD_BITS_MASK__', __WORD_BITS_MASKS__[Word_Size_Bits]);
+        put('__F__', __f_kernel__(Word_Size_Bits, Rounds)); # unrolled F^R, see PyNORX.__f_funct__
+        put('__RATE_CODEC__', __RATE_CODECS__[Word_Size_Bits]);
+        put('__WORD4_CODEC__', __WORD4_CODECS__[Word_Size_Bits]);
+        cls.__INTERNED__[(Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits)] = params;
+        return params;
+
+    def __setattr__(self, name, value):
+        raise AttributeError("NorxParams objects are immutable.");
+
+    def __delattr__(self, name):
+        raise AttributeError("NorxParams objects are immutable.");
+
+    def __reduce__(self):
+        return (NorxParams, (self.NORX_W_BITS, self.NORX_R, self.NORX_P, self.NORX_T_BITS));
+
+def __build_params_binder__():
+    # straight-line "self.X = params.X" for every NorxParams field, generated once like the F kernels
+    src = ["def bind(self, params):"] + ["    self.%s = params.%s" % (name, name) for name in NorxParams.__slots__];
+    scope = {};
+    exec(compile("\n".join(src), "<NorxParams binder>", "exec"), scope);
+    return scope["bind"];
+
+__bind_params__ = __build_params_binder__(); # copies a NorxParams into the slots of a PyNORX object
 
 class PyNORX(object):
     """
@@ -35,7 +204,22 @@ class PyNORX(object):
     Copyright (c) 2019 under a CC0 License
     """
 
-    def __init__(self, *, Word_Size_Bits=64, Rounds=4, Lanes=1, Tag_Size_Bits=256):
+    __slots__ = ('__PARAMS__', 'executor', 'state_cache', '__CORE__', '__F_RAW__', '__HOOK__', '__STATS__') + \
+        NorxParams.__slots__; # the parameters are plain slots: they are read on every block
+    PIPELINE_BATCH_MIN = 3; # smallest parallel work (see __batch_backend__) handed to the pipelined backend
+    NUMPY_BATCH_MIN = 192; # smallest parallel work handed to the NumPy backend instead (3 pipeline widths)
+    WORDS_NONCE = NorxParams.WORDS_NONCE;
+    WORDS_KEY = NorxParams.WORDS_KEY;
+    WORDS_CAPACITY = NorxParams.WORDS_CAPACITY;
+    DOMAIN_HEAD_TAG = 1 << 0;
+    DOMAIN_PYLD_TAG = 1 << 1;
+    DOMAIN_TRAIL_TAG = 1 << 2;
+    DOMAIN_FIN_TAG = 1 << 3;
+    DOMAIN_BR_TAG = 1 << 4;
+    DOMAIN_MRG_TAG = 1 << 5;
+
+    def __init__(self, *, Word_Size_Bits=64, Rounds=4, Lanes=1, Tag_Size_Bits=256, executor=None, backend=None,
+                 state_cache=0):
         """
         Create a new Norx object (not initialized; see seperate 'init' step for supplying the Key and Nonce)
         Allowed values: 
@@ -43,69 +227,48 @@ class PyNORX(object):
             1-63 Rounds (inclusive), Default = 4,
             1 to 255 parallel Lanes (inclusive), Default = 1
             0-128 (32-bit-words) or 0-256 (64-bit-words) (inclusive), Default = 256
+            executor (only used when Lanes > 1), Default = None (lanes are processed serially):
+                a concurrent.futures.Executor instance (e.g. ProcessPoolExecutor(8)) or an Executor class
+                (e.g. ProcessPoolExecutor, a fresh pool is then created per call) that runs the lanes concurrently
+            backend for aead_encrypt/aead_decrypt, Default = None (the compiled core when it is built, see PyNORXC,
+                else the Python code): 'c' (an Exception when it is not built) or 'python'
+            state_cache, Default = 0 (off): keep up to this many States after init() and the header in a
+                NorxStateCache (the state_cache attribute, see its stats()), keyed by a keyed hash of
+                (parameters, key, nonce, header), so that re-encrypting or re-verifying a message only costs the
+                payload and tag phases
+            An executor (with Lanes > 1) or a state_cache are features of the Python code: with either of them
+            backend None selects the Python code and backend 'c' is an Exception.
         """
-        assert Word_Size_Bits in [32, 64]
-        assert 63 >= Rounds >= 1
-        assert 255 >= Lanes >= 1 # inifinite parallelism (P=0) not supported
-        assert 4 * Word_Size_Bits >= Tag_Size_Bits >= 0
-        assert Tag_Size_Bits % 8 == 0 # byte-aligned tags only
-        self.NORX_W_BITS = Word_Size_Bits
-        self.NORX_R = Rounds
-        self.NORX_P = Lanes
-        self.NORX_T_BITS = Tag_Size_Bits;
-        self.BYTES_WORD = Word_Size_Bits // 8; # integer division
-        self.WORDS_NONCE = 4; # per spec 3.0 "4w"
-        self.BYTES_NONCE = self.BYTES_WORD * self.WORDS_NONCE;
-        self.WORDS_KEY = 4; # per spec 3.0 "4w"
-        self.BYTES_KEY = self.BYTES_WORD * self.WORDS_KEY;
-        self.BITS_STATE = Word_Size_Bits * 16; # per spec, state is 16w
-        self.BYTES_STATE = self.BITS_STATE // 8; # integer division
-        self.WORDS_CAPACITY = 4; # per spec 3.0 "4w"
-        self.BYTES_CAPACITY = self.BYTES_WORD * self.WORDS_CAPACITY;
-        self.BITS_CAPACITY = self.BYTES_CAPACITY * 8;
-        self.BYTES_TAG = self.NORX_T_BITS // 8; # integer division
-        self.BYTES_RATE = self.BYTES_STATE - self.BYTES_CAPACITY; 
-        self.WORDS_RATE = self.BYTES_RATE // self.BYTES_WORD; # integer division
-        self.DOMAIN_HEAD_TAG = 1 << 0;
-        self.DOMAIN_PYLD_TAG = 1 << 1;
-        self.DOMAIN_TRAIL_TAG = 1 << 2;
-        self.DOMAIN_FIN_TAG = 1 << 3;
-        self.DOMAIN_BR_TAG = 1 << 4;
-        self.DOMAIN_MRG_TAG = 1 << 5;
-
-        if Word_Size_Bits == 32:
-            self.__ROT_CONST__ = (8, 11, 16, 31);
-            self.__INIT_CONST__ = (
-                0xA3D8D930, 0x3FA8B72C, 0xED84EB49, 0xEDCA4787, 
-                0x335463EB, 0xF994220B, 0xBE0BF5C9, 0xD7C49104)
-            self.__WORD_BITS_MASK__ = 0xffffffff
-        elif Word_Size_Bits == 64:
-            self.__ROT_CONST__ = (8, 19, 40, 63)
-            self.__INIT_CONST__ = (
-                0xB15E641748DE5E6B, 0xAA95E955E10F8410, 0x28D1034441A9DD40, 0x7F31BBF964E93BF5,
-                0xB5E9E22493DFFB96, 0xB980C852479FAFBD, 0xDA24516BF55EAFD4, 0x86026AE8536F1501)
-            self.__WORD_BITS_MASK__ = 0xffffffffffffffff
-
-    def __load__(self, x):
-        return int.from_bytes(x, byteorder = 'little', signed = False);
-
-    def __load_from__(self, buffer, index, word_size_bytes):
-        return self.__load__(buffer[index:index+word_size_bytes]);
-
-    def __store__(self, x):
-        return x.to_bytes(length = self.BYTES_WORD, byteorder = 'little');
-
-    def __rot_r__(self, a, n):
-        return ((a >> n) | (a << (self.NORX_W_BITS - n))) & self.__WORD_BITS_MASK__
-
-    def __h_funct__(self, a, b):
-        return ((a ^ b) ^ ((a & b) << 1)) & self.__WORD_BITS_MASK__
+        params = NorxParams.__INTERNED__.get((Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits));
+        if params is None: # first object with this configuration
+            params = NorxParams(Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits);
+        self.__PARAMS__ = params; # shared, see NorxParams
+        __bind_params__(self, params); # __F__ too, per object so that enable_stats can wrap it
+        self.executor = executor;
+        self.state_cache = NorxStateCache(state_cache) if state_cache > 0 else None;
+        if backend not in (None, 'c', 'python'):
+            raise Exception("Unknown PyNORX backend " + repr(backend) + " (use None, 'c' or 'python').");
+        python_only = (executor is not None and Lanes > 1) or self.state_cache is not None;
+        if backend == 'c' and python_only:
+            raise Exception("The compiled PyNORX core does not use an executor or a state_cache (use backend=None).");
+        self.__CORE__ = None if backend == 'python' or python_only else __c_backend__();
+        if backend == 'c' and self.__CORE__ is None:
+            raise Exception("The compiled PyNORX core is not built (run: python PyNORXC.py build).");
+
+    @property
+    def backend(self):
+        """
+        'c' when aead_encrypt/aead_decrypt run through the compiled core (PyNORXC), else 'python'
+        """
+        return 'python' if self.__CORE__ is None else 'c';
 
     def __g_funct__(self, S, a, b, c, d): 
         # take advantage of passing State contents by Object Ref
-        ROT = self.__rot_r__;
-        RC = self.__ROT_CONST__;
-        H = self.__h_funct__;
+        w, mask, RC = self.NORX_W_BITS, self.__WORD_BITS_MASK__, self.__ROT_CONST__;
+        def ROT(x, n):
+            return ((x >> n) | (x << (w - n))) & mask
+        def H(x, y):
+            return ((x ^ y) ^ ((x & y) << 1)) & mask
         S[a] = H(S[a], S[b])
         S[d] = ROT(S[a] ^ S[d], RC[0])
         S[c] = H(S[c], S[d])
@@ -117,6 +280,11 @@ class PyNORX(object):
         return;
 
     def __f_funct__(self, S, r):
+        __f_kernel__(self.NORX_W_BITS, r)(S);
+        return;
+
+    def __f_funct_ref__(self, S, r):
+        # readable reference for the generated kernels, not used on the hot path
         G = self.__g_funct__;
         for i in range(0, r):
             # Column step
@@ -139,33 +307,47 @@ class PyNORX(object):
         return y;
 
     def init(self, n, k):
-        b = self.BYTES_WORD
-
-        K = [self.__load_from__(k, 0, b),
-             self.__load_from__(k, b, b),
-             self.__load_from__(k, 2*b, b),
-             self.__load_from__(k, 3*b, b)];
-        N = [self.__load_from__(n, 0, b),
-             self.__load_from__(n, b, b),
-             self.__load_from__(n, 2*b, b),
-             self.__load_from__(n, 3*b, b)];
+        K = self.__WORD4_CODEC__.unpack_from(k, 0);
+        N = self.__WORD4_CODEC__.unpack_from(n, 0);
+        return self.__init_state__(N, K);
 
+    def __init_state__(self, N, K):
+        # init() from the already parsed nonce and key words
         U = self.__INIT_CONST__
-        S = [
-            N[0], N[1], N[2], N[3], K[0], K[1], K[2], K[3],
-            U[0], U[1], U[2], U[3], U[4], U[5], U[6], U[7]
-            ];
+        S = [N[0], N[1], N[2], N[3], K[0], K[1], K[2], K[3],
+             U[0], U[1], U[2], U[3], U[4], U[5], U[6], U[7]];
         S[12] ^= self.NORX_W_BITS # mix in session parameters
         S[13] ^= self.NORX_R
         S[14] ^= self.NORX_P
         S[15] ^= self.NORX_T_BITS
-        self.__f_funct__(S, self.NORX_R) # permute
+        self.__F__(S) # permute
         S[12] ^= K[0] # added in V3.0, mix Key into State Capacity 
         S[13] ^= K[1] #  again after initialization
         S[14] ^= K[2]
         S[15] ^= K[3]
         return S;
 
+    def __header_state__(self, h, n, k, K):
+        # State after init() and the header h, from the state_cache when there is one
+        cache = self.state_cache;
+        if cache is None:
+            return self.__cached_header_state__(None, (), h, n, K);
+        params = bytes((self.NORX_W_BITS, self.NORX_R, self.NORX_P, self.NORX_T_BITS // 8));
+        return self.__cached_header_state__(cache, (params, k), h, n, K);
+
+    def __cached_header_state__(self, cache, parts, h, n, K):
+        # State after init() and the header h; a NorxStateCache (or None) keeps it under the digest of parts, n, h
+        if cache is not None:
+            key = cache.digest(*parts, n, h);
+            S = cache.get(key);
+            if S is not None:
+                return S;
+        S = self.__init_state__(self.__WORD4_CODEC__.unpack_from(n, 0), K);
+        self.__absorb__(S, h, self.DOMAIN_HEAD_TAG);
+        if cache is not None:
+            cache.put(key, S);
+        return S;
+
     def __absorb__(self, S, x, tag):
         inlen = len(x)
         if inlen > 0:
@@ -177,12 +359,11 @@ class PyNORX(object):
             self.__absorb_last__(S, x[n*i:n*i+inlen], tag)
 
     def __absorb_block__(self, S, x, tag):
-        b = self.BYTES_WORD
         S[15] ^= tag
-        self.__f_funct__(S, self.NORX_R)
+        self.__F__(S)
+        X = self.__RATE_CODEC__.unpack_from(x, 0);
         for i in range(0, self.WORDS_RATE):
-            y = b*i;
-            S[i] ^= self.__load_from__(x, y, b);
+            S[i] ^= X[i];
 
     def __absorb_last__(self, S, x, tag):
         y = self.__pad__(x)
@@ -190,7 +371,7 @@ class PyNORX(object):
 
     def __merge_lane__(self, S, L):
         L[15] ^= self.DOMAIN_MRG_TAG;
-        self.__f_funct__(L, self.NORX_R);
+        self.__F__(L);
         for i in range(0, 16):
             S[i] ^= L[i];
             L[i] |= self.__WORD_BITS_MASK__; # destroy contents of old state
@@ -227,21 +408,132 @@ class PyNORX(object):
         return c
 
     def __enc_block__(self, S, x):
-        c = bytearray()
-        b = self.BYTES_WORD
         S[15] ^= self.DOMAIN_PYLD_TAG
-        self.__f_funct__(S, self.NORX_R)
+        self.__F__(S)
+        X = self.__RATE_CODEC__.unpack_from(x, 0);
         for i in range(0, self.WORDS_RATE):
-            y = b*i;
-            S[i] ^= self.__load_from__(x, y, b);
-            c += self.__store__(S[i])
-        return c;
+            S[i] ^= X[i];
+        return self.__RATE_CODEC__.pack(*S[:self.WORDS_RATE]);
 
     def __enc_last__(self, S, x):
         y = self.__pad__(x)
         c = self.__enc_block__(S, y)
         return c[:len(x)]
 
+    def __enc_block_into__(self, S, x, out, o):
+        S[15] ^= self.DOMAIN_PYLD_TAG
+        self.__F__(S)
+        X = self.__RATE_CODEC__.unpack_from(x, 0);
+        for i in range(0, self.WORDS_RATE):
+            S[i] ^= X[i];
+        self.__RATE_CODEC__.pack_into(out, o, *S[:self.WORDS_RATE]);
+
+    def __enc_last_into__(self, S, x, out, o):
+        y = self.__pad__(x)
+        self.__enc_block_into__(S, y, y, 0) # encrypt the padded block in place
+        out[o:o+len(x)] = memoryview(y)[:len(x)]
+
+    def __dec_block_into__(self, S, x, out, o):
+        S[15] ^= self.DOMAIN_PYLD_TAG
+        self.__F__(S)
+        C = self.__RATE_CODEC__.unpack_from(x, 0);
+        self.__RATE_CODEC__.pack_into(out, o, *[S[i] ^ C[i] for i in range(0, self.WORDS_RATE)]);
+        for i in range(0, self.WORDS_RATE):
+            S[i] = C[i];
+
+    def __dec_last_into__(self, S, x, out, o):
+        m = self.__dec_last__(S, x); # a single (partial) block, nothing to gain from writing it in place
+        out[o:o+len(x)] = m
+
+    def __crypt_into__(self, SL, x, out, o, block, last):
+        # walk the blocks of x round-robin over the lane states SL (a single State for P=1), results go to out[o:]
+        b = self.BYTES_RATE;
+        inlen = len(x);
+        lane_ptr = 0
+        if inlen > 0:
+            i = 0
+            while inlen - i >= b:
+                block(SL[lane_ptr], x[i:i+b], out, o+i);
+                i += b;
+                lane_ptr = (lane_ptr + 1) % len(SL);
+            last(SL[lane_ptr], x[i:], out, o+i)
+
+    def __dec_skip_block__(self, S, x, out, o):
+        # __dec_block_into__ without the plaintext: the State just takes the ciphertext words (out is unused)
+        S[15] ^= self.DOMAIN_PYLD_TAG
+        self.__F__(S)
+        C = self.__RATE_CODEC__.unpack_from(x, 0);
+        for i in range(0, self.WORDS_RATE):
+            S[i] = C[i];
+
+    def __dec_skip_last__(self, S, x, out, o):
+        # __dec_last_into__ without the plaintext (out is unused)
+        S[15] ^= self.DOMAIN_PYLD_TAG
+        self.__F__(S)
+        buffer = bytearray(self.__RATE_CODEC__.pack(*S[:self.WORDS_RATE]));
+        buffer[:len(x)] = x; # replace the buffer with actual data (x)
+        buffer[len(x)] ^= 0x01; # apply padding bits at length and last byte
+        buffer[-1] ^= 0x80;
+        C = self.__RATE_CODEC__.unpack_from(buffer, 0);
+        for i in range(0, self.WORDS_RATE):
+            S[i] = C[i];
+
+    def __branch__(self, S):
+        # split the State into NORX_P lane States (returns list, the State itself for P=1)
+        if (self.NORX_P == 1):
+            return [S];
+        S[15] ^= self.DOMAIN_BR_TAG;
+        self.__F__(S);
+        SL = [S[:]]; # skip lane 0 for the next step (XOR 0 has no effect)
+        for i in range(1, self.NORX_P):
+            SL.append(S[:]); # make a copy
+            for j in range(0, self.WORDS_RATE): # per spec, only the RATE words of the STATE are affected 
+                SL[i][j] ^= i # tag the lane number into every RATE word of the states
+        return SL;
+
+    def __merge__(self, S, SL):
+        # merge the lane States produced by __branch__ back into a single State (returns the State)
+        if (self.NORX_P == 1):
+            return SL[0];
+        for i in range(0, len(S)): S[i] = 0; # burn the state
+        for i in range(0, self.NORX_P):
+            S = self.__merge_lane__(S, SL[i]); # merge the lane back into the main state, 
+        SL.clear(); # then destroy the lanes (contents cleared to all 1's in __merge_lane__ itself)
+        return S;
+
+    def __cryptP2_parallel__(self, SL, x, decrypt, final = True):
+        # same result as __encryptP2__/__decryptP2__, but every lane's stride of blocks runs in self.executor
+        # (final=False: x holds only full blocks, starting at lane 0, and more payload follows)
+        b = self.BYTES_RATE;
+        P = self.NORX_P;
+        x = memoryview(x).cast('B');
+        y = bytearray(len(x));
+        if len(x) == 0:
+            return y;
+        blocks = len(x) // b; # full blocks, the rest (possibly empty) is the last block, owned by lane blocks % P
+        params = (self.NORX_W_BITS, self.NORX_R, self.NORX_P, self.NORX_T_BITS);
+        executor = self.executor;
+        owned = isinstance(executor, type); # an Executor class, create (and shut down) a pool just for this call
+        if owned:
+            executor = executor();
+        try:
+            jobs = [];
+            for j in range(0, P):
+                lane = b''.join(x[i*b:(i+1)*b] for i in range(j, blocks, P));
+                last = x[blocks*b:].tobytes() if final and j == blocks % P else None;
+                if lane or last is not None:
+                    jobs.append(executor.submit(__lane_worker__, params, SL[j], lane, last, decrypt));
+            for j in range(0, len(jobs)): # lanes without blocks were skipped, they come last
+                SL[j], out = jobs[j].result();
+                for q, i in enumerate(range(j, blocks, P)): # re-interleave the lane output
+                    y[i*b:(i+1)*b] = out[q*b:(q+1)*b];
+                if j == blocks % P: # the last block trails the full ones
+                    y[blocks*b:] = out[(len(out) // b) * b:];
+        finally:
+            if owned:
+                executor.shutdown();
+        return y;
+
     def __decryptP1__(self, S, x):
         b = self.BYTES_RATE;
         m = bytearray()
@@ -273,90 +565,414 @@ class PyNORX(object):
         return m
 
     def __dec_block__(self, S, x):
-        m = bytearray()
-        b = self.BYTES_WORD
         S[15] ^= self.DOMAIN_PYLD_TAG
-        self.__f_funct__(S, self.NORX_R)
+        self.__F__(S)
+        C = self.__RATE_CODEC__.unpack_from(x, 0);
+        m = self.__RATE_CODEC__.pack(*[S[i] ^ C[i] for i in range(0, self.WORDS_RATE)]);
         for i in range(0, self.WORDS_RATE):
-            y = b*i;
-            c = self.__load_from__(x, y, b);
-            m += self.__store__(S[i] ^ c)
-            S[i] = c
+            S[i] = C[i];
         return m;
 
     def __dec_last__(self, S, x):
-        m = bytearray()
-        buffer = bytearray()
-        b = self.BYTES_WORD
         S[15] ^= self.DOMAIN_PYLD_TAG
-        self.__f_funct__(S, self.NORX_R)
-        for i in range(0, self.WORDS_RATE):
-            buffer += self.__store__(S[i]);
+        self.__F__(S)
+        buffer = bytearray(self.__RATE_CODEC__.pack(*S[:self.WORDS_RATE]));
         buffer[:len(x)] = x; # replace the buffer with actual data (x)
         buffer[len(x)] ^= 0x01; # apply padding bits at length and last byte
         buffer[-1] ^= 0x80;
+        C = self.__RATE_CODEC__.unpack_from(buffer, 0);
+        m = self.__RATE_CODEC__.pack(*[S[i] ^ C[i] for i in range(0, self.WORDS_RATE)]);
         for i in range(0, self.WORDS_RATE):
-            y = b*i;
-            c = self.__load_from__(buffer, y, b);
-            m += self.__store__(S[i] ^ c)
-            S[i] = c
+            S[i] = C[i];
         return m[:len(x)]
 
     def __gen_tag__(self, S, k):
-        b = self.BYTES_WORD
-        K = [self.__load_from__(k, 0, b), # prep the key again for mixing into the State
-             self.__load_from__(k, b, b),
-             self.__load_from__(k, 2*b, b),
-             self.__load_from__(k, 3*b, b)];
-        t = bytearray();
+        K = self.__WORD4_CODEC__.unpack_from(k, 0); # prep the key again for mixing into the State
+        return self.__gen_tag_words__(S, K);
+
+    def __gen_tag_words__(self, S, K):
+        # __gen_tag__ from the already parsed key words
         S[15] ^= self.DOMAIN_FIN_TAG;
-        self.__f_funct__(S, self.NORX_R);
+        self.__F__(S);
         S[12] ^= K[0]; # added in v3.0, mix key into Capacity of State
         S[13] ^= K[1]; #   during post-processing / tag generation
         S[14] ^= K[2];
         S[15] ^= K[3];
-        self.__f_funct__(S, self.NORX_R);
+        self.__F__(S);
         S[12] ^= K[0]; # added in v3.0, mix key into Capacity of State
         S[13] ^= K[1]; #   during post-processing / tag generation
         S[14] ^= K[2];
         S[15] ^= K[3];
-        for i in range(0, self.WORDS_CAPACITY):
-            t += self.__store__(S[i + self.WORDS_RATE]);
+        t = bytearray(self.__WORD4_CODEC__.pack(*S[self.WORDS_RATE:])); # the capacity words
         for i in range(0, 16): S[i] = 0; # burn state, no longer needed
         del S;
         return t[:self.NORX_T_BITS // 8]; # integer division
 
+    def __verify_tag__(self, t0, t1):
+        if len(t0) != self.BYTES_TAG or len(t1) != self.BYTES_TAG:
+            return False;
+        acc = 0 # verify tag
+        for i in range(0, self.BYTES_TAG):
+            acc |= t0[i] ^ t1[i]; # any bit set to '1' (a difference between the two values) will stick
+        return acc == 0; # and any '1' bit != 0, meaning something is different
+
+    def enable_stats(self, hook = None):
+        """
+        Start collecting per-phase statistics (see stats()); hook, if given, is called as 
+        hook(phase, bytes, seconds) after every phase ('init', 'header', 'payload', 'merge', 'trailer', 'tag').
+        Costs nothing while disabled: this swaps in an instrumented subclass, and disable_stats() swaps it out.
+        Streams (encryptor/decryptor/mac) report every update call and the end of every phase, aead_decrypt_lazy
+        and aead_decrypt_to every chunk. Work nested in a timed call (a stream update running the executor) is
+        counted once, in that call. Lanes run by an executor in other processes, and the NumPy/pipelined batch
+        backends, are not counted; the compiled core (see backend) is bypassed while statistics are enabled, so
+        they always describe the Python code.
+        """
+        if not isinstance(self, __InstrumentedPyNORX__):
+            self.__F_RAW__ = self.__F__;
+            self.__class__ = __InstrumentedPyNORX__;
+        self.__HOOK__ = hook;
+        self.reset_stats();
+
+    def disable_stats(self):
+        """
+        Stop collecting statistics and restore the uninstrumented hot paths
+        """
+        if isinstance(self, __InstrumentedPyNORX__):
+            self.__class__ = PyNORX;
+            self.__F__ = self.__F_RAW__;
+            del self.__F_RAW__, self.__HOOK__, self.__STATS__;
+
+    def stats(self):
+        """
+        Statistics collected since enable_stats()/reset_stats() (returns dict, or None while disabled):
+            'permutations' (F calls), 'rounds' (permutations * Rounds), 
+            'phases': {phase: {'calls', 'bytes', 'seconds'}}
+        """
+        return None;
+
+    def reset_stats(self):
+        """
+        Zero the collected statistics (no effect while disabled)
+        """
+        return;
+
+    def __timed__(self, phase, size, fn, *args):
+        # fn(*args) as (part of) phase, for code outside the phase methods (streams, chunked decryption);
+        # just the call while statistics are disabled
+        return fn(*args);
+
+    def encryptor(self, n, k):
+        """
+        Start an incremental encryption (returns a NorxEncryptor, see update_header/update/update_trailer/finalize)
+        """
+        return NorxEncryptor(self, n, k);
+
+    def decryptor(self, n, k):
+        """
+        Start an incremental decryption (returns a NorxDecryptor, see update_header/update/update_trailer/finalize)
+        """
+        return NorxDecryptor(self, n, k);
+
+    def mac(self, n, k, data = None):
+        """
+        Start an incremental tag-only computation over data that is not encrypted (returns a NorxMAC, see 
+        update/digest/verify; the tag equals aead_encrypt(data, b'', b'', n, k), data is the header)
+        """
+        mac = NorxMAC(self, n, k);
+        if data is not None:
+            mac.update(data);
+        return mac;
+
+    def key_context(self, k, cache_size = 0):
+        """
+        Bind a key to this object (returns a NorxKeyContext, the key is parsed once for all of its messages)
+        """
+        return NorxKeyContext(self, k, cache_size);
+
+    def session(self, k, prefix = None, **options):
+        """
+        Bind a key to this object for sending (returns a NorxSession, which generates the nonces itself)
+        """
+        return NorxSession(self, k, prefix, **options);
+
     def aead_encrypt(self, h, m, t, n, k):
         """
         Encrypt and tag message (returns bytearray(ciphertext if any + tag of Tag_Size_Bits size))
         """
         assert len(k) == self.BYTES_KEY;
         assert len(n) == self.BYTES_NONCE;
+        return self.__aead_encrypt__(h, m, t, n, k);
+
+    def __aead_encrypt__(self, h, m, t, n, k):
+        # body of aead_encrypt, key and nonce lengths already checked by the caller
+        if self.__CORE__ is not None:
+            return self.__CORE__.aead_encrypt(self.__PARAMS__, h, m, t, n, k);
+        return self.__aead_encrypt_py__(h, m, t, n, k);
+
+    def __aead_encrypt_py__(self, h, m, t, n, k):
+        K = self.__WORD4_CODEC__.unpack_from(k, 0);
+        S = self.__header_state__(h, n, k, K);
+        return self.__seal__(S, m, t, K);
+
+    def __seal__(self, S, m, t, K):
+        # payload, trailer and tag phases of aead_encrypt, from the State after the header
+        c, tag = self.__seal_detached__(S, m, t, K);
+        c += tag;
+        return bytes(c);
+
+    def __seal_detached__(self, S, m, t, K):
+        # __seal__ with the tag kept apart (returns tuple(bytearray of ciphertext, bytearray of tag))
         c = bytearray();
-        S = self.init(n, k);
-        self.__absorb__(S, h, self.DOMAIN_HEAD_TAG);
         if (self.NORX_P == 1):
             c += self.__encryptP1__(S, m);
         elif (self.NORX_P > 1):
-            #raise Exception("Parallelism (P>1) not supported.");
-            S[15] ^= self.DOMAIN_BR_TAG;
-            self.__f_funct__(S, self.NORX_R);
-            SL = {};
-            SL[0] = S[:]; # skip lane 0 for the next step (XOR 0 has no effect)
-            for i in range(1, self.NORX_P):
-                SL[i] = S[:]; #make a copy
-                for j in range(0, self.WORDS_RATE): # per spec, only the RATE words of the STATE are affected 
-                    SL[i][j] ^= i # tag the lane number into every RATE word of the states
-            c += self.__encryptP2__(SL, m);
-            for i in range(0, len(S)): S[i] = 0; # burn the state
-            for i in range(0, self.NORX_P):
-                S = self.__merge_lane__(S, SL[i]); # merge the lane back into the main state, 
-                del SL[i]; # then destroy the lane (contents cleared to all 1's in the function itself)
+            SL = self.__branch__(S);
+            if self.executor is not None:
+                c += self.__cryptP2_parallel__(SL, m, False);
+            else:
+                c += self.__encryptP2__(SL, m);
+            S = self.__merge__(S, SL);
         else: # p == 0
             raise Exception("Inifite parallelism (P=0) not supported.");
         self.__absorb__(S, t, self.DOMAIN_TRAIL_TAG);
-        c += self.__gen_tag__(S, k);
-        return bytes(c);
+        return (c, self.__gen_tag_words__(S, K));
+
+    def aead_encrypt_detached(self, h, m, t, n, k):
+        """
+        Encrypt and tag message, the tag is returned apart (no ciphertext + tag buffer is built or split)
+        (returns tuple(bytearray of ciphertext, empty if none, bytes of tag of Tag_Size_Bits size))
+        """
+        assert len(k) == self.BYTES_KEY;
+        assert len(n) == self.BYTES_NONCE;
+        if self.backend == 'c':
+            return self.__CORE__.aead_encrypt_detached(self.__PARAMS__, h, m, t, n, k);
+        K = self.__WORD4_CODEC__.unpack_from(k, 0);
+        S = self.__header_state__(h, n, k, K);
+        c, tag = self.__seal_detached__(S, m, t, K);
+        return (c, bytes(tag));
+
+    def aead_encrypt_into(self, out, h, m, t, n, k, offset = 0):
+        """
+        Encrypt and tag message straight into a writable buffer (bytearray, memoryview, mmap, ...) at offset
+        Any buffer-protocol object is accepted for h, m and t, no intermediate copies of them are made.
+        (returns the number of bytes written: ciphertext length + tag of Tag_Size_Bits size)
+        """
+        assert len(k) == self.BYTES_KEY;
+        assert len(n) == self.BYTES_NONCE;
+        out = memoryview(out).cast('B');
+        m = memoryview(m).cast('B');
+        assert not out.readonly;
+        assert 0 <= offset and len(out) - offset >= len(m) + self.BYTES_TAG;
+        S = self.__header_state__(memoryview(h).cast('B'), n, k, self.__WORD4_CODEC__.unpack_from(k, 0));
+        SL = self.__branch__(S);
+        self.__crypt_into__(SL, m, out, offset, self.__enc_block_into__, self.__enc_last_into__);
+        S = self.__merge__(S, SL);
+        self.__absorb__(S, memoryview(t).cast('B'), self.DOMAIN_TRAIL_TAG);
+        d = offset + len(m);
+        out[d:d+self.BYTES_TAG] = self.__gen_tag__(S, k);
+        return len(m) + self.BYTES_TAG;
+
+    def aead_decrypt_into(self, out, h, c, t, n, k, offset = 0):
+        """
+        Decrypt and validate ciphertext (+ tag) straight into a writable buffer at offset
+        Any buffer-protocol object is accepted for h, c and t, no intermediate copies of them are made.
+        On a failed validation the written plaintext is wiped (zeroed) again.
+        (returns tuple(True/False, number of plaintext bytes written))
+        """
+        assert len(k) == self.BYTES_KEY;
+        assert len(n) == self.BYTES_NONCE;
+        assert len(c) >= self.BYTES_TAG;
+        out = memoryview(out).cast('B');
+        c = memoryview(c).cast('B');
+        d = len(c) - self.BYTES_TAG;
+        c, t0 = c[:d], c[d:];
+        assert not out.readonly;
+        assert 0 <= offset and len(out) - offset >= d;
+        S = self.__header_state__(memoryview(h).cast('B'), n, k, self.__WORD4_CODEC__.unpack_from(k, 0));
+        SL = self.__branch__(S);
+        self.__crypt_into__(SL, c, out, offset, self.__dec_block_into__, self.__dec_last_into__);
+        S = self.__merge__(S, SL);
+        self.__absorb__(S, memoryview(t).cast('B'), self.DOMAIN_TRAIL_TAG);
+        t1 = self.__gen_tag__(S, k);
+        if not self.__verify_tag__(t0, t1):
+            out[offset:offset+d] = bytes(d); # validation failed, do not leave plaintext behind
+            return (False, 0);
+        return (True, d);
+
+    def aead_encrypt_many(self, records, *, executor = None, chunk_size = 256):
+        """
+        Encrypt and tag a batch of messages, records is a sequence of tuple(h, m, t, n, k), or a columnar dict
+        {'h': [...], 'm': [...], 't': [...], 'n': [...], 'k': [...]} (all the same length).
+        Keys and nonces are validated once for the whole batch before anything is encrypted.
+        executor (optional, instance or class as for PyNORX(executor=...)) processes chunks of chunk_size records.
+        (returns list of bytes(ciphertext if any + tag), in the order of records)
+        """
+        records = self.__batch_records__(records);
+        for (h, m, t, n, k) in records:
+            assert len(k) == self.BYTES_KEY;
+            assert len(n) == self.BYTES_NONCE;
+        return self.__run_batch__(records, False, executor, chunk_size);
+
+    def aead_decrypt_many(self, records, *, executor = None, chunk_size = 256):
+        """
+        Decrypt and validate a batch of messages, records as for aead_encrypt_many with c (ciphertext + tag) in
+        place of m. A record that fails (bad tag, or malformed key/nonce/ciphertext) does not abort the batch.
+        (returns list of tuple(True/False, bytearray of plaintext if any), in the order of records)
+        """
+        records = self.__batch_records__(records);
+        return self.__run_batch__(records, True, executor, chunk_size);
+
+    def __batch_records__(self, records):
+        if isinstance(records, dict):
+            columns = [records[x] for x in ('h', 'c' if 'c' in records else 'm', 't', 'n', 'k')];
+            assert all(len(x) == len(columns[0]) for x in columns);
+            return list(zip(*columns));
+        return list(records);
+
+    def __run_batch__(self, records, decrypt, executor, chunk_size):
+        assert chunk_size >= 1;
+        if executor is None:
+            return self.__batch__(records, decrypt);
+        params = (self.NORX_W_BITS, self.NORX_R, self.NORX_P, self.NORX_T_BITS);
+        owned = isinstance(executor, type); # an Executor class, create (and shut down) a pool just for this call
+        if owned:
+            executor = executor();
+        try:
+            jobs = [executor.submit(__batch_worker__, params, [tuple(bytes(x) if isinstance(x, memoryview) else x
+                    for x in record) for record in records[i:i+chunk_size]], decrypt) # memoryviews can't be pickled
+                    for i in range(0, len(records), chunk_size)];
+            results = [];
+            for job in jobs:
+                results += job.result();
+        finally:
+            if owned:
+                executor.shutdown();
+        return results;
+
+    def __batch_backend__(self, records):
+        # PyNORXNUMPY / PyNORXPIPELINE for the whole batch, or None for one message at a time (the compiled core
+        # beats both, when it is there). Both step their messages in lockstep, so what they gain depends on the
+        # parallel work, the total permutations over those of the longest record, not on the record count alone:
+        # one long record keeps NumPy stepping over nearly empty columns long after the short ones are done.
+        if self.__CORE__ is not None or self.NORX_P != 1 or len(records) < self.PIPELINE_BATCH_MIN:
+            return None;
+        b = self.BYTES_RATE;
+        blocks = [(len(h) + len(x) + len(t)) // b + 1 for (h, x, t, n, k) in records];
+        parallel = sum(blocks) / max(blocks);
+        if parallel >= self.NUMPY_BATCH_MIN:
+            backend = __numpy_backend__();
+            if backend is not None:
+                return backend;
+        if parallel >= self.PIPELINE_BATCH_MIN: # fused permutations over big integers, up to 64 messages a step
+            import PyNORXPIPELINE;
+            return PyNORXPIPELINE;
+        return None;
+
+    def __batch__(self, records, decrypt):
+        backend = self.__batch_backend__(records);
+        if backend is not None: # vectorized over the whole batch, see PyNORXNUMPY / PyNORXPIPELINE
+            if not decrypt:
+                return backend.aead_encrypt_batch(self, records);
+            valid = [j for j in range(0, len(records)) if len(records[j][4]) == self.BYTES_KEY and
+                     len(records[j][3]) == self.BYTES_NONCE and len(records[j][1]) >= self.BYTES_TAG];
+            results = [(False, None)] * len(records); # malformed records stay failed
+            for j, result in zip(valid, backend.aead_decrypt_batch(self, [records[j] for j in valid])):
+                results[j] = result;
+            return results;
+        results = [];
+        if not decrypt:
+            for (h, m, t, n, k) in records:
+                results.append(self.__aead_encrypt__(h, m, t, n, k));
+            return results;
+        for (h, c, t, n, k) in records:
+            if len(k) != self.BYTES_KEY or len(n) != self.BYTES_NONCE or len(c) < self.BYTES_TAG:
+                results.append((False, None)); # malformed record, report it and carry on
+            else:
+                results.append(self.__aead_decrypt__(h, c, t, n, k));
+        return results;
+
+    def __decrypt_pass__(self, h, c, t, n, k, chunk_size, block, last):
+        # generator: one full decryption, yielding the plaintext in (about) chunk_size pieces as memoryviews of a
+        # reused buffer, then returning the tag it computed; c is the ciphertext without the tag
+        b = self.BYTES_RATE;
+        K = self.__WORD4_CODEC__.unpack_from(k, 0);
+        S = self.__header_state__(h, n, k, K);
+        SL = self.__branch__(S);
+        run = max(1, chunk_size // b) * b; # whole blocks per chunk
+        out = bytearray(run);
+        view = memoryview(out);
+        def chunk(x, lane_ptr): # returns the lane of the next block
+            full = len(x) - len(x) % b;
+            for o in range(0, full, b):
+                block(SL[lane_ptr], x[o:o+b], out, o);
+                lane_ptr = (lane_ptr + 1) % len(SL);
+            if len(x) < run: # the payload ends in this chunk, with a partial (possibly empty) block
+                last(SL[lane_ptr], x[full:], out, full);
+            return lane_ptr;
+        lane_ptr = 0;
+        for i in range(0, len(c), run):
+            x = c[i:i+run];
+            lane_ptr = self.__timed__('payload', len(x), chunk, x, lane_ptr);
+            yield view[:len(x)];
+        if len(c) > 0 and len(c) % run == 0: # the payload ended on a chunk boundary, the empty last block is due
+            self.__timed__('payload', 0, last, SL[lane_ptr], c[len(c):], out, 0);
+        S = self.__merge__(S, SL);
+        self.__absorb__(S, t, self.DOMAIN_TRAIL_TAG);
+        return self.__gen_tag_words__(S, K);
+
+    def aead_decrypt_lazy(self, h, c, t, n, k, chunk_size = 64 * 1024):
+        """
+        Verify-then-release decryption in two passes over c (ciphertext + tag, any buffer-protocol object):
+        the first pass only computes and checks the tag (no plaintext is produced or kept), only then a 
+        generator is handed out that decrypts again, yielding bytes chunks of about chunk_size bytes.
+        Memory use is bounded by chunk_size. The generator re-checks the tag at its end and raises an Exception
+        if c was modified between (or during) the passes.
+        (returns tuple(True/False, generator of plaintext chunks or None))
+        """
+        assert len(k) == self.BYTES_KEY;
+        assert len(n) == self.BYTES_NONCE;
+        assert len(c) >= self.BYTES_TAG;
+        assert chunk_size >= 1;
+        c = memoryview(c).cast('B');
+        d = len(c) - self.BYTES_TAG;
+        c, t0 = c[:d], bytes(c[d:]);
+        verify = self.__decrypt_pass__(h, c, t, n, k, chunk_size, self.__dec_skip_block__, self.__dec_skip_last__);
+        while True:
+            try:
+                next(verify);
+            except StopIteration as done:
+                t1 = done.value;
+                break;
+        if not self.__verify_tag__(t0, t1):
+            return (False, None); # validation failed, nothing was decrypted
+        return (True, self.__release__(h, c, t, n, k, t0, chunk_size));
+
+    def __release__(self, h, c, t, n, k, t0, chunk_size):
+        # second pass of aead_decrypt_lazy
+        chunks = self.__decrypt_pass__(h, c, t, n, k, chunk_size, self.__dec_block_into__, self.__dec_last_into__);
+        while True:
+            try:
+                m = next(chunks);
+            except StopIteration as done:
+                t1 = done.value;
+                break;
+            if len(m) > 0:
+                yield bytes(m);
+        if not self.__verify_tag__(t0, t1):
+            raise Exception("Ciphertext changed after validation, discard the plaintext released so far.");
+
+    def aead_decrypt_to(self, sink, h, c, t, n, k, chunk_size = 64 * 1024):
+        """
+        aead_decrypt_lazy straight into sink (a callable, or an object with a write method, e.g. a file):
+        nothing is written unless the tag is valid (returns True/False)
+        """
+        valid, chunks = self.aead_decrypt_lazy(h, c, t, n, k, chunk_size);
+        if not valid:
+            return False;
+        write = sink.write if hasattr(sink, 'write') else sink;
+        for m in chunks:
+            write(m);
+        return True;
 
     def aead_decrypt(self, h, c, t, n, k):
         """
@@ -365,36 +981,57 @@ class PyNORX(object):
         assert len(k) == self.BYTES_KEY;
         assert len(n) == self.BYTES_NONCE;
         assert len(c) >= self.NORX_T_BITS // 8; # integer division
-        m = bytearray()
-        #c = bytearray(c)
+        return self.__aead_decrypt__(h, c, t, n, k);
+
+    def __aead_decrypt__(self, h, c, t, n, k):
+        # body of aead_decrypt, key, nonce and ciphertext lengths already checked by the caller
+        if self.__CORE__ is not None:
+            return self.__CORE__.aead_decrypt(self.__PARAMS__, h, c, t, n, k);
+        return self.__aead_decrypt_py__(h, c, t, n, k);
+
+    def __aead_decrypt_py__(self, h, c, t, n, k):
+        K = self.__WORD4_CODEC__.unpack_from(k, 0);
+        S = self.__header_state__(h, n, k, K);
+        return self.__open__(S, c, t, K);
+
+    def aead_decrypt_detached(self, h, c, t, n, k, tag):
+        """
+        Decrypt ciphertext (WITHOUT the tag) and validate it against tag, see aead_encrypt_detached
+        (returns tuple(True/False, bytearray of plaintext if any))
+        """
+        assert len(k) == self.BYTES_KEY;
+        assert len(n) == self.BYTES_NONCE;
+        if len(tag) != self.BYTES_TAG:
+            return (False, None);
+        if self.backend == 'c':
+            return self.__CORE__.aead_decrypt_detached(self.__PARAMS__, h, c, t, tag, n, k);
+        K = self.__WORD4_CODEC__.unpack_from(k, 0);
+        S = self.__header_state__(h, n, k, K);
+        return self.__open_detached__(S, c, t, K, tag);
+
+    def __open__(self, S, c, t, K):
+        # payload, trailer and tag phases of aead_decrypt, from the State after the header
+        c = memoryview(c).cast('B'); # split off the tag without copying
         d = len(c)-self.BYTES_TAG;
-        c, t0 = c[:d], c[d:];
-        S = self.init(n, k);
-        self.__absorb__(S, h, self.DOMAIN_HEAD_TAG);
+        return self.__open_detached__(S, c[:d], t, K, c[d:]);
+
+    def __open_detached__(self, S, c, t, K, t0):
+        # __open__ with the ciphertext and the tag t0 passed apart
+        m = bytearray()
         if (self.NORX_P == 1):
             m += self.__decryptP1__(S, c);
         elif (self.NORX_P > 1):
-            S[15] ^= self.DOMAIN_BR_TAG;
-            self.__f_funct__(S, self.NORX_R);
-            SL = {};
-            SL[0] = S[:]; # skip lane 0 for the next step (XOR 0 has no effect)
-            for i in range(1, self.NORX_P): 
-                SL[i] = S[:]; # make a copy
-                for j in range(0, self.WORDS_RATE): # per spec, only the RATE words of the STATE are affected 
-                    SL[i][j] ^= i # tag the lane number into every RATE word of the states
-            m += self.__decryptP2__(SL, c); 
-            for i in range(0, len(S)): S[i] = 0; # burn the state
-            for i in range(0, self.NORX_P):
-                S = self.__merge_lane__(S, SL[i]); # merge the lane back into the main state, 
-                del SL[i]; # then destroy the lane (contents cleared to all 1's in the function itself)
+            SL = self.__branch__(S);
+            if self.executor is not None:
+                m += self.__cryptP2_parallel__(SL, c, True);
+            else:
+                m += self.__decryptP2__(SL, c);
+            S = self.__merge__(S, SL);
         else:
             raise Exception("Inifite parallelism (P=0) not supported.");
         self.__absorb__(S, t, self.DOMAIN_TRAIL_TAG);
-        t1 = self.__gen_tag__(S, k);
-        acc = 0 # verify tag
-        for i in range(0, self.BYTES_TAG):
-            acc |= t0[i] ^ t1[i]; # any bit set to '1' (a difference between the two values) will stick
-        if acc != 0: # and any '1' bit != 0, meaning something is different
+        t1 = self.__gen_tag_words__(S, K);
+        if not self.__verify_tag__(t0, t1):
             del m;
             return (False, None); # validation failed, return nothing
             #if (m): #DEBUGGING ONLY!!!
@@ -407,7 +1044,510 @@ class PyNORX(object):
             else:
                 return (True, None); # don't return an empty array (validation still passes)
 
+class __InstrumentedPyNORX__(PyNORX):
+    """
+    PyNORX with per-phase timing and permutation counting, see PyNORX.enable_stats (never constructed directly)
+    """
+    __slots__ = (); # same layout as PyNORX, objects switch between the two classes
+    __PHASES__ = ('init', 'header', 'payload', 'merge', 'trailer', 'tag');
+    backend = 'python'; # the compiled core can not be instrumented
+    __aead_encrypt__ = PyNORX.__aead_encrypt_py__;
+    __aead_decrypt__ = PyNORX.__aead_decrypt_py__;
+
+    def stats(self):
+        stats = self.__STATS__;
+        return {
+            "permutations": stats["permutations"],
+            "rounds": stats["permutations"] * self.NORX_R,
+            "phases": {phase: dict(stats[phase]) for phase in self.__PHASES__},
+        };
+
+    def reset_stats(self):
+        stats = {phase: {"calls": 0, "bytes": 0, "seconds": 0.0} for phase in self.__PHASES__};
+        stats["permutations"] = 0;
+        stats["depth"] = 0; # timed calls in progress, only the outermost one is recorded
+        self.__STATS__ = stats;
+        F = self.__F_RAW__;
+        def counted(S):
+            stats["permutations"] += 1;
+            F(S);
+        self.__F__ = counted;
+
+    def __timed__(self, phase, size, fn, *args):
+        stats = self.__STATS__;
+        if stats["depth"] > 0:
+            return fn(*args);
+        stats["depth"] += 1;
+        t = time.perf_counter();
+        try:
+            result = fn(*args);
+        finally:
+            stats["depth"] -= 1;
+        t = time.perf_counter() - t;
+        record = stats[phase];
+        record["calls"] += 1;
+        record["bytes"] += size;
+        record["seconds"] += t;
+        if self.__HOOK__ is not None:
+            self.__HOOK__(phase, size, t);
+        return result;
+
+    def __init_state__(self, N, K):
+        return self.__timed__('init', 0, super().__init_state__, N, K);
+
+    def __absorb__(self, S, x, tag):
+        phase = 'header' if tag == self.DOMAIN_HEAD_TAG else 'trailer';
+        return self.__timed__(phase, len(x), super().__absorb__, S, x, tag);
+
+    def __encryptP1__(self, S, x):
+        return self.__timed__('payload', len(x), super().__encryptP1__, S, x);
+
+    def __encryptP2__(self, SL, x):
+        return self.__timed__('payload', len(x), super().__encryptP2__, SL, x);
+
+    def __decryptP1__(self, S, x):
+        return self.__timed__('payload', len(x), super().__decryptP1__, S, x);
+
+    def __decryptP2__(self, SL, x):
+        return self.__timed__('payload', len(x), super().__decryptP2__, SL, x);
+
+    def __cryptP2_parallel__(self, SL, x, decrypt, final = True):
+        return self.__timed__('payload', len(x), super().__cryptP2_parallel__, SL, x, decrypt, final);
+
+    def __crypt_into__(self, SL, x, out, o, block, last):
+        return self.__timed__('payload', len(x), super().__crypt_into__, SL, x, out, o, block, last);
+
+    def __merge__(self, S, SL):
+        return self.__timed__('merge', 0, super().__merge__, S, SL);
+
+    def __gen_tag_words__(self, S, K):
+        return self.__timed__('tag', 0, super().__gen_tag_words__, S, K);
+
+class NorxStateCache(object):
+    """
+    A bounded LRU cache of sponge States, with hit/miss/eviction counters.
+    States are copied on the way in and on the way out, so callers can never alter a cached State, and
+    every State that leaves the cache (eviction, replacement, clear) is zeroized. Entries are looked up by
+    digest(): a keyed hash under a secret drawn for this cache, so no key, nonce or header is kept.
+    """
+
+    def __init__(self, maxsize = 128):
+        assert maxsize >= 1;
+        self.maxsize = maxsize;
+        self.hits = 0;
+        self.misses = 0;
+        self.evictions = 0;
+        import collections, hashlib, threading; # only needed once a cache exists, keeps them out of 'import PyNORX'
+        self.__entries__ = collections.OrderedDict();
+        self.__lock__ = threading.Lock();
+        self.__blake2b__ = hashlib.blake2b;
+        self.__secret__ = os.urandom(32);
+
+    def digest(self, *parts):
+        """
+        Keyed hash of parts (bytes-like objects) to look entries up by (returns bytes)
+        """
+        x = self.__blake2b__(key=self.__secret__, digest_size=32);
+        for part in parts:
+            x.update(len(part).to_bytes(8, 'little')); # length-prefixed, so parts can not run into each other
+            x.update(part);
+        return x.digest();
+
+    def __burn__(self, S):
+        for i in range(0, len(S)): S[i] = 0;
+
+    def get(self, key):
+        """
+        Look up a State (returns a copy of the State, or None)
+        """
+        with self.__lock__:
+            S = self.__entries__.get(key);
+            if S is None:
+                self.misses += 1;
+                return None;
+            self.__entries__.move_to_end(key);
+            self.hits += 1;
+            return S[:];
+
+    def put(self, key, S):
+        """
+        Store a copy of the State S, evicting (and zeroizing) the least recently used States beyond maxsize
+        """
+        with self.__lock__:
+            old = self.__entries__.pop(key, None);
+            if old is not None:
+                self.__burn__(old);
+            self.__entries__[key] = S[:];
+            while len(self.__entries__) > self.maxsize:
+                self.__burn__(self.__entries__.popitem(last = False)[1]);
+                self.evictions += 1;
+
+    def clear(self):
+        """
+        Zeroize and drop every cached State
+        """
+        with self.__lock__:
+            for S in self.__entries__.values():
+                self.__burn__(S);
+            self.__entries__.clear();
+
+    def stats(self):
+        """
+        Cache counters (returns dict of hits, misses, evictions, size and maxsize)
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self.__entries__), "maxsize": self.maxsize};
+
+class NorxKeyContext(object):
+    """
+    A key bound to a PyNORX object (see PyNORX.key_context): the key is parsed into its words once instead of
+    in every init()/__gen_tag__. With cache_size > 0 the State after init() and the header is kept in a 
+    NorxStateCache. NORX mixes the nonce into the State before the header, so there is no nonce-independent
+    State to share: entries are keyed on (a keyed hash of) nonce and header and only pay off when the same pair comes back,
+    i.e. re-verification or re-encryption of a message under the nonce it already used. 
+    """
+
+    def __init__(self, norx, k, cache_size = 0):
+        assert isinstance(norx, PyNORX);
+        assert len(k) == norx.BYTES_KEY;
+        self.norx = norx;
+        self.__k__ = bytes(k); # for the compiled core, which parses keys itself
+        self.__K__ = norx.__WORD4_CODEC__.unpack_from(k, 0);
+        self.cache = NorxStateCache(cache_size) if cache_size > 0 else None;
+
+    def __state__(self, h, n):
+        # State after init() and the header, from the cache when possible
+        return self.norx.__cached_header_state__(self.cache, (), h, n, self.__K__);
+
+    def aead_encrypt(self, h, m, t, n):
+        """
+        Encrypt and tag message with the bound key (returns bytes(ciphertext if any + tag of Tag_Size_Bits size))
+        """
+        assert len(n) == self.norx.BYTES_NONCE;
+        if self.cache is None and self.norx.backend == 'c':
+            return self.norx.__aead_encrypt__(h, m, t, n, self.__k__);
+        return self.norx.__seal__(self.__state__(h, n), m, t, self.__K__);
+
+    def aead_decrypt(self, h, c, t, n):
+        """
+        Decrypt and validate ciphertext with the bound key (returns tuple(True/False, bytearray of plaintext if any))
+        """
+        assert len(n) == self.norx.BYTES_NONCE;
+        assert len(c) >= self.norx.BYTES_TAG;
+        if self.cache is None and self.norx.backend == 'c':
+            return self.norx.__aead_decrypt__(h, c, t, n, self.__k__);
+        return self.norx.__open__(self.__state__(h, n), c, t, self.__K__);
+
+    def burn(self):
+        """
+        Forget the key and zeroize every cached State, the context can not be used afterwards
+        """
+        self.__k__ = self.__K__ = None;
+        if self.cache is not None:
+            self.cache.clear();
+
+class NorxSession(object):
+    """
+    A key bound to a PyNORX object for sending messages (see PyNORX.session): aead_encrypt picks the nonce itself,
+    a fixed prefix followed by a 64-bit little-endian message counter, so a session never repeats a nonce and
+    costs no os.urandom call per message. The prefix (random by default, drawn once) must not be used again with
+    the same key by another session. The key is parsed once, see NorxKeyContext.
+    Threads reserve counters block_size at a time from the shared counter (one lock acquisition per block) and
+    use their range without locking: nonces are unique across threads, but only ordered within each thread, and
+    counters reserved and not used are skipped. Once the counter reaches 2^64 the session refuses to encrypt.
+    """
+    COUNTER_LIMIT = 1 << 64;
+
+    def __init__(self, norx, k, prefix = None, *, counter = 0, block_size = 1024):
+        import threading; # see NorxStateCache
+        assert isinstance(norx, PyNORX);
+        if prefix is None:
+            prefix = os.urandom(norx.BYTES_NONCE - 8);
+        assert len(prefix) == norx.BYTES_NONCE - 8;
+        assert 0 <= counter <= self.COUNTER_LIMIT;
+        assert block_size >= 1;
+        self.norx = norx;
+        self.prefix = bytes(prefix);
+        self.block_size = block_size;
+        self.context = NorxKeyContext(norx, k);
+        self.__counter__ = counter; # first counter not reserved by any thread yet
+        self.__lock__ = threading.Lock();
+        self.__local__ = threading.local(); # per thread: next counter, end of its reserved range
+
+    def __reserve__(self):
+        # reserve the next range of counters for the calling thread (returns tuple(first, end))
+        with self.__lock__:
+            first = self.__counter__;
+            if first >= self.COUNTER_LIMIT:
+                raise Exception("NorxSession nonce counter space exhausted (or session burned), start a new session.");
+            end = min(first + self.block_size, self.COUNTER_LIMIT);
+            self.__counter__ = end;
+        return (first, end);
+
+    def next_nonce(self):
+        """
+        Take the next nonce of the calling thread (returns bytes, never the same twice in this session)
+        """
+        local = self.__local__;
+        i = getattr(local, 'next', 0);
+        if i >= getattr(local, 'end', 0):
+            i, local.end = self.__reserve__();
+        local.next = i + 1;
+        return self.prefix + i.to_bytes(8, 'little');
+
+    def remaining(self):
+        """
+        Counters not reserved by any thread yet (returns int, the session encrypts at least that many messages more)
+        """
+        return self.COUNTER_LIMIT - self.__counter__;
+
+    def aead_encrypt(self, h, m, t):
+        """
+        Encrypt and tag message under the next nonce (returns tuple(nonce, bytes(ciphertext if any + tag)))
+        """
+        n = self.next_nonce();
+        return (n, self.context.aead_encrypt(h, m, t, n));
+
+    def aead_decrypt(self, h, c, t, n):
+        """
+        Decrypt and validate ciphertext sent with nonce n (returns tuple(True/False, bytearray of plaintext if any))
+        """
+        return self.context.aead_decrypt(h, c, t, n);
+
+    def burn(self):
+        """
+        Forget the key and exhaust the counter, the session can not be used afterwards
+        """
+        import threading;
+        with self.__lock__:
+            self.__counter__ = self.COUNTER_LIMIT;
+            self.__local__ = threading.local(); # drop the ranges threads still hold
+        self.context.burn();
+
+class NorxStream(object):
+    """
+    Common plumbing for the incremental (streaming) NORX interfaces.
+    Input is fed in three phases: header, payload, trailer (in that order, each may be empty or skipped).
+    Full BYTES_RATE blocks are processed as soon as they are available, so at most one partial block
+    is buffered at any time and memory use does not depend on the size of the message.
+    With Lanes > 1 the State branches when the payload starts, every full payload block goes to the next lane
+    in turn and the lanes are merged when the payload ends. When the PyNORX object has an executor, payload
+    blocks are collected instead until every lane has LANE_RUN_BLOCKS of them, then the lanes process their
+    runs concurrently (see PyNORX(executor=...)); up to Lanes * LANE_RUN_BLOCKS blocks are buffered then.
+    """
+    LANE_RUN_BLOCKS = 64;
+    __PHASE_HEAD__ = 0;
+    __PHASE_PYLD__ = 1;
+    __PHASE_TRAIL__ = 2;
+    __PHASE_DONE__ = 3;
+
+    def __init__(self, norx, n, k):
+        assert isinstance(norx, PyNORX);
+        assert len(k) == norx.BYTES_KEY;
+        assert len(n) == norx.BYTES_NONCE;
+        self.norx = norx;
+        self.__k__ = bytes(k);
+        self.__S__ = norx.init(n, k);
+        self.__phase__ = self.__PHASE_HEAD__;
+        self.__buf__ = bytearray(); # never holds a full block between calls
+        self.__count__ = 0; # bytes fed into the current phase
+        self.__out__ = bytearray(); # payload output of the last (partial) block, released by finalize
+        self.__SL__ = None; # lane States during the payload, see PyNORX.__branch__
+        self.__lane__ = 0; # lane of the next full payload block
+        self.__run__ = None; # payload blocks collected for the executor (Lanes > 1 with an executor only)
+
+    def __feed__(self, x, block):
+        # run 'block' over every full block of (buffer + x), keep the rest buffered
+        b = self.norx.BYTES_RATE;
+        buf = self.__buf__;
+        out = bytearray();
+        x = memoryview(x).cast('B');
+        self.__count__ += len(x);
+        i = 0;
+        if buf:
+            i = min(b - len(buf), len(x));
+            buf += x[:i];
+            if len(buf) < b:
+                return out;
+            out += block(buf);
+            buf.clear();
+        while len(x) - i >= b:
+            out += block(x[i:i+b]);
+            i += b;
+        buf += x[i:];
+        return out;
+
+    def __close_phase__(self):
+        # process the final (padded) block of the current phase, if that phase had any input, and
+        # branch the lanes before / merge them after the payload
+        norx = self.norx;
+        S = self.__S__;
+        if self.__phase__ == self.__PHASE_HEAD__:
+            if self.__count__ > 0:
+                norx.__timed__('header', 0, norx.__absorb_last__, S, self.__buf__, norx.DOMAIN_HEAD_TAG);
+            self.__SL__ = norx.__branch__(S); # also for an empty payload, like aead_encrypt
+            if norx.NORX_P > 1 and norx.executor is not None:
+                self.__run__ = bytearray();
+        elif self.__phase__ == self.__PHASE_PYLD__:
+            norx.__timed__('payload', 0, self.__close_payload__);
+            self.__S__ = norx.__merge__(S, self.__SL__);
+            self.__SL__ = self.__run__ = None;
+        elif self.__phase__ == self.__PHASE_TRAIL__ and self.__count__ > 0:
+            norx.__timed__('trailer', 0, norx.__absorb_last__, S, self.__buf__, norx.DOMAIN_TRAIL_TAG);
+        for i in range(0, len(self.__buf__)): self.__buf__[i] = 0; # burn the buffered input
+        self.__buf__.clear();
+        self.__count__ = 0;
+        self.__phase__ += 1;
+
+    def __close_payload__(self):
+        if self.__run__:
+            self.__out__ += self.__flush__();
+        if self.__count__ > 0: # the last block belongs to the lane after the last full block
+            self.__out__ += self.__last__(self.__SL__[self.__lane__], self.__buf__);
+
+    def __enter_phase__(self, phase):
+        if self.__phase__ > phase:
+            raise Exception("NORX stream input out of order (header, payload, trailer) or already finalized.");
+        while self.__phase__ < phase:
+            self.__close_phase__();
+
+    def update_header(self, h):
+        """
+        Absorb more header (associated data) bytes, only allowed before any payload
+        """
+        self.__enter_phase__(self.__PHASE_HEAD__);
+        self.norx.__timed__('header', len(h), self.__feed__, h, self.__head_block__);
+
+    def update_trailer(self, t):
+        """
+        Absorb more trailer bytes, only allowed after all of the payload
+        """
+        self.__enter_phase__(self.__PHASE_TRAIL__);
+        self.norx.__timed__('trailer', len(t), self.__feed__, t, self.__trail_block__);
+
+    def __head_block__(self, x):
+        self.norx.__absorb_block__(self.__S__, x, self.norx.DOMAIN_HEAD_TAG);
+        return b'';
+
+    def __trail_block__(self, x):
+        self.norx.__absorb_block__(self.__S__, x, self.norx.DOMAIN_TRAIL_TAG);
+        return b'';
+
+    def __payload_block__(self, x):
+        # a full payload block, for the next lane in turn (or for the run collected for the executor)
+        norx = self.norx;
+        if self.__run__ is not None:
+            self.__run__ += x;
+            if len(self.__run__) < self.LANE_RUN_BLOCKS * norx.NORX_P * norx.BYTES_RATE:
+                return b'';
+            return self.__flush__();
+        S = self.__SL__[self.__lane__];
+        self.__lane__ = (self.__lane__ + 1) % norx.NORX_P;
+        return self.__block__(S, x);
+
+    def __flush__(self):
+        # process the collected run of full payload blocks (starts at lane 0), every lane's share in the executor
+        norx = self.norx;
+        run = self.__run__;
+        out = norx.__cryptP2_parallel__(self.__SL__, run, self.__DECRYPT__, False);
+        self.__lane__ = (len(run) // norx.BYTES_RATE) % norx.NORX_P;
+        run[:] = bytes(len(run)); # burn the collected input
+        run.clear();
+        return out;
+
+    def __final_tag__(self):
+        self.__enter_phase__(self.__PHASE_DONE__);
+        t = self.norx.__gen_tag__(self.__S__, self.__k__); # burns the state
+        self.__k__ = None;
+        out = bytes(self.__out__);
+        self.__out__.clear();
+        return out, t;
+
+class NorxEncryptor(NorxStream):
+    """
+    Incremental NORX encryption (see PyNORX.encryptor).
+    Concatenating the results of every update() and of finalize() gives exactly aead_encrypt(h, m, t, n, k).
+    """
+    __DECRYPT__ = False;
+
+    def update(self, m):
+        """
+        Encrypt more payload bytes (returns bytes, the ciphertext of every completed BYTES_RATE block)
+        """
+        self.__enter_phase__(self.__PHASE_PYLD__);
+        return bytes(self.norx.__timed__('payload', len(m), self.__feed__, m, self.__payload_block__));
+
+    def __block__(self, S, x):
+        return self.norx.__enc_block__(S, x);
+
+    def __last__(self, S, x):
+        return self.norx.__enc_last__(S, x);
+
+    def finalize(self):
+        """
+        Finish the message (returns bytes(remaining ciphertext if any + tag of Tag_Size_Bits size))
+        """
+        c, t = self.__final_tag__();
+        return c + bytes(t);
+
+class NorxDecryptor(NorxStream):
+    """
+    Incremental NORX decryption (see PyNORX.decryptor). The ciphertext is fed WITHOUT the tag, the tag is
+    passed to finalize(). NOTE: plaintext is released before the tag is verified, callers must discard 
+    everything they received if finalize() reports a failure.
+    """
+    __DECRYPT__ = True;
+
+    def update(self, c):
+        """
+        Decrypt more ciphertext bytes (returns bytes, the plaintext of every completed BYTES_RATE block)
+        """
+        self.__enter_phase__(self.__PHASE_PYLD__);
+        return bytes(self.norx.__timed__('payload', len(c), self.__feed__, c, self.__payload_block__));
+
+    def __block__(self, S, x):
+        return self.norx.__dec_block__(S, x);
+
+    def __last__(self, S, x):
+        return self.norx.__dec_last__(S, x);
+
+    def finalize(self, tag):
+        """
+        Finish the message and validate the tag (returns tuple(True/False, bytes of remaining plaintext or None))
+        """
+        m, t1 = self.__final_tag__();
+        if not self.norx.__verify_tag__(tag, t1):
+            return (False, None);
+        return (True, m);
+
+class NorxMAC(NorxStream):
+    """
+    Incremental NORX authentication without encryption (see PyNORX.mac): the data is absorbed as the header
+    of a message with an empty payload and trailer, through the NorxStream plumbing, so at most one partial
+    block is buffered. digest() does not end the computation, more data can follow.
+    """
+
+    def update(self, data):
+        """
+        Absorb more data (any buffer-protocol object)
+        """
+        self.update_header(data);
+
+    def digest(self):
+        """
+        Tag of all data so far (returns bytes of Tag_Size_Bits size)
+        """
+        import copy; # only needed here
+        final = copy.copy(self); # finalizes a copy, more data may follow
+        final.__S__, final.__buf__, final.__out__ = self.__S__[:], bytearray(self.__buf__), bytearray();
+        return bytes(final.__final_tag__()[1]);
+
+    def verify(self, tag):
+        """
+        Compare tag with digest() (returns True/False)
+        """
+        return self.norx.__verify_tag__(tag, self.digest());
+
 if (__name__ == "__main__"):
     import PyNORXTESTS;
-    import PyNORXTESTCASES;
-    PyNORXTESTS.RUN_TESTS();
+    raise SystemExit(1 if PyNORXTESTS.RUN_TESTS() else 0);
@@ -0,0 +1,97 @@
+__doc__ = """
+    asyncio front end for PyNORX: small messages are processed inline, large ones are handed to an executor
+    (a thread pool by default) so the event loop keeps running while the permutation grinds through them.
+    Streaming payloads (any async iterable of byte chunks) go through NorxEncryptor/NorxDecryptor and come out
+    as an async iterator of chunks, ready to be written to an asyncio.StreamWriter as they are produced.
+    """
+
+import asyncio;
+import functools;
+
+from PyNORX import PyNORX;
+
+class AsyncPyNORX(object):
+    """
+    asyncio facade over a PyNORX object.
+    Messages shorter than inline_threshold bytes (header + payload + trailer) are processed directly in the
+    event loop, anything larger runs in executor (None = the loop's default executor). Streaming chunks are
+    handled the same way, by their size.
+    """
+
+    def __init__(self, norx, *, executor = None, inline_threshold = 64 * 1024):
+        assert isinstance(norx, PyNORX);
+        assert inline_threshold >= 0;
+        self.norx = norx;
+        self.executor = executor;
+        self.inline_threshold = inline_threshold;
+
+    async def __run__(self, size, fn, *args):
+        if size < self.inline_threshold:
+            return fn(*args);
+        loop = asyncio.get_running_loop();
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args));
+
+    async def aead_encrypt(self, h, m, t, n, k):
+        """
+        Awaitable PyNORX.aead_encrypt (returns bytes(ciphertext if any + tag of Tag_Size_Bits size))
+        """
+        return await self.__run__(len(h) + len(m) + len(t), self.norx.aead_encrypt, h, m, t, n, k);
+
+    async def aead_decrypt(self, h, c, t, n, k):
+        """
+        Awaitable PyNORX.aead_decrypt (returns tuple(True/False, bytearray of plaintext if any))
+        """
+        return await self.__run__(len(h) + len(c) + len(t), self.norx.aead_decrypt, h, c, t, n, k);
+
+    async def encrypt_stream(self, h, chunks, t, n, k):
+        """
+        Encrypt a payload arriving as an async (or plain) iterable of byte chunks.
+        Async generator of bytes: the ciphertext of each chunk's completed blocks, then the rest + the tag.
+        """
+        enc = self.norx.encryptor(n, k);
+        await self.__run__(len(h), enc.update_header, h);
+        async for chunk in self.__chunks__(chunks):
+            c = await self.__run__(len(chunk), enc.update, chunk);
+            if c:
+                yield c;
+        await self.__run__(len(t), enc.update_trailer, t);
+        yield enc.finalize();
+
+    async def decrypt_stream(self, h, chunks, t, tag, n, k):
+        """
+        Decrypt a payload (ciphertext WITHOUT the tag) arriving as an async (or plain) iterable of byte chunks.
+        Async generator of bytes plaintext. The tag is checked at the end and an Exception is raised when it does
+        not match: like NorxDecryptor, plaintext is released before validation and must be discarded then.
+        """
+        dec = self.norx.decryptor(n, k);
+        await self.__run__(len(h), dec.update_header, h);
+        async for chunk in self.__chunks__(chunks):
+            m = await self.__run__(len(chunk), dec.update, chunk);
+            if m:
+                yield m;
+        await self.__run__(len(t), dec.update_trailer, t);
+        valid, m = dec.finalize(tag);
+        if not valid:
+            raise Exception("NORX tag validation failed, discard the plaintext released so far.");
+        if m:
+            yield m;
+
+    async def __chunks__(self, chunks):
+        if hasattr(chunks, '__aiter__'):
+            async for chunk in chunks:
+                yield chunk;
+        else:
+            for chunk in chunks:
+                yield chunk;
+
+    async def encrypt_to(self, writer, h, chunks, t, n, k):
+        """
+        Encrypt a streaming payload straight into an asyncio.StreamWriter, draining as it goes
+        (returns the number of bytes written)
+        """
+        written = 0;
+        async for c in self.encrypt_stream(h, chunks, t, n, k):
+            writer.write(c);
+            written += len(c);
+            await writer.drain();
+        return written;
@@ -0,0 +1,133 @@
+__doc__ = """
+    PyNORX benchmark suite: sweeps Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits and payload sizes and reports
+    throughput (MB/s), an estimated cycles/byte (at an assumed clock rate), per-call latency percentiles and
+    peak traced memory for aead_encrypt, aead_decrypt and the F permutation alone.
+    Results are written as JSON so runs can be compared across commits, e.g.:
+        python PyNORXBENCH.py --sizes 0,64,4096,1048576 --output bench.json
+    """
+
+import argparse;
+import json;
+import os;
+import platform;
+import sys;
+import time;
+import tracemalloc;
+
+from PyNORX import PyNORX, __version__;
+
+def parse_size(x):
+    """
+    Parse a byte count with an optional K/M/G (binary) suffix, e.g. '64M' (returns int)
+    """
+    x = x.strip().upper();
+    scale = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}.get(x[-1:], 1);
+    return int(x[:-1] if scale > 1 else x) * scale;
+
+def percentiles(samples, points = (50, 90, 99)):
+    """
+    Nearest-rank percentiles of samples (returns dict 'p50': value, ...)
+    """
+    samples = sorted(samples);
+    return {"p" + str(p): samples[min(len(samples) - 1, max(0, -(-p * len(samples) // 100) - 1))] for p in points};
+
+def measure(fn, size, *, min_time = 0.2, min_calls = 3, max_calls = 1000, ghz = 3.0, memory = True):
+    """
+    Time repeated calls of fn() processing size bytes each (returns dict of the measurements)
+    Calls are repeated until min_time seconds and min_calls calls are reached (at most max_calls).
+    Peak memory is traced in one extra call, outside of the timed ones (tracemalloc slows everything down).
+    """
+    samples = [];
+    total = 0.0;
+    while len(samples) < max_calls and (len(samples) < min_calls or total < min_time):
+        t = time.perf_counter();
+        fn();
+        t = time.perf_counter() - t;
+        samples.append(t);
+        total += t;
+    result = {
+        "calls": len(samples),
+        "seconds": total,
+        "latency_s": dict(percentiles(samples), min=min(samples), mean=total / len(samples)),
+    };
+    if size > 0:
+        rate = size * len(samples) / total; # bytes per second
+        result["mb_per_s"] = rate / 1e6;
+        result["cycles_per_byte"] = ghz * 1e9 / rate; # an estimate, assumes one core at ghz
+    if memory:
+        tracemalloc.start();
+        fn();
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1];
+        tracemalloc.stop();
+    return result;
+
+def bench_config(W, R, P, T, sizes, **options):
+    """
+    Benchmark one (W, R, P, T) configuration (returns list of result dicts)
+    """
+    norx = PyNORX(Word_Size_Bits=W, Rounds=R, Lanes=P, Tag_Size_Bits=T);
+    config = {"W": W, "R": R, "P": P, "T": T, "backend": norx.backend};
+    k = os.urandom(norx.BYTES_KEY);
+    n = os.urandom(norx.BYTES_NONCE);
+    results = [];
+    S = list(range(0, 16));
+    ref = PyNORX(Word_Size_Bits=W, Rounds=R, Lanes=P, Tag_Size_Bits=T, backend='python'); # __F__ is Python only
+    results.append(dict(config, op="permutation", size=norx.BYTES_STATE, backend=ref.backend,
+        **measure(lambda: ref.__F__(S), norx.BYTES_STATE, min_calls=100, max_calls=100000, **options)));
+    for size in sizes:
+        m = os.urandom(size);
+        c = norx.aead_encrypt(b'', m, b'', n, k);
+        results.append(dict(config, op="aead_encrypt", size=size,
+            **measure(lambda: norx.aead_encrypt(b'', m, b'', n, k), size, **options)));
+        results.append(dict(config, op="aead_decrypt", size=size,
+            **measure(lambda: norx.aead_decrypt(b'', c, b'', n, k), size, **options)));
+    return results;
+
+def run(words = (32, 64), rounds = (4, 6), lanes = (1, 4), tags = None, sizes = (0, 64, 1024, 65536), **options):
+    """
+    Sweep every combination (tags None = the full 4 words tag) (returns dict with 'meta' and 'results')
+    """
+    results = [];
+    for W in words:
+        for R in rounds:
+            for P in lanes:
+                for T in (tags or (4 * W,)):
+                    if T > 4 * W: continue; # tag larger than the capacity of this word size
+                    results += bench_config(W, R, P, T, sizes, **options);
+    meta = {
+        "pynorx_version": __version__,
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "options": options,
+    };
+    return {"meta": meta, "results": results};
+
+def main(argv = None):
+    ints = lambda x: tuple(int(y) for y in x.split(','));
+    parser = argparse.ArgumentParser(description="PyNORX benchmark suite (JSON output)");
+    parser.add_argument("--words", type=ints, default=(32, 64), help="Word_Size_Bits values, default 32,64");
+    parser.add_argument("--rounds", type=ints, default=(4, 6), help="Rounds values, default 4,6");
+    parser.add_argument("--lanes", type=ints, default=(1, 4), help="Lanes values, default 1,4");
+    parser.add_argument("--tags", type=ints, default=None, help="Tag_Size_Bits values, default 4 words");
+    parser.add_argument("--sizes", type=lambda x: tuple(parse_size(y) for y in x.split(',')),
+        default=(0, 64, 1024, 65536), help="payload sizes (K/M/G suffixes allowed, up to e.g. 64M), "
+        "default 0,64,1K,64K");
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement, default 0.2");
+    parser.add_argument("--ghz", type=float, default=3.0, help="clock rate for the cycles/byte estimate");
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory runs");
+    parser.add_argument("--output", default="-", help="JSON output file, default stdout");
+    args = parser.parse_args(argv);
+    report = run(args.words, args.rounds, args.lanes, args.tags, args.sizes,
+        min_time=args.min_time, ghz=args.ghz, memory=not args.no_memory);
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=1);
+        sys.stdout.write("\n");
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1);
+    return 0;
+
+if (__name__ == "__main__"):
+    sys.exit(main());
@@ -0,0 +1,300 @@
+/*
+ * Compiled core for PyNORX (NORX AEAD v3.0), loaded through ctypes by PyNORXC.py.
+ * Covers every configuration PyNORX accepts: 32 or 64-bit words, 1-63 rounds, 1-255 lanes, 0 to 4 words of tag.
+ * Plain C99 without dependencies. Words are held as uint64_t (masked to 32 bits for W = 32) and loaded/stored
+ * little-endian byte by byte, so the result does not depend on the byte order of the machine.
+ * Build (PyNORXC.build() does this): cc -O3 -shared -fPIC -o _pynorxc.so PyNORXC.c
+ * Same algorithm as the Python code, CC0 like the rest of PyNORX (see LICENSE).
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define HEAD_TAG 0x01
+#define PYLD_TAG 0x02
+#define TRAIL_TAG 0x04
+#define FIN_TAG 0x08
+#define BR_TAG 0x10
+#define MRG_TAG 0x20
+#define WORDS_RATE 12
+#define MAX_RATE 96
+
+typedef struct {
+    int w, r, p, t; /* Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits */
+    size_t bw, rate; /* bytes per word, bytes per rate block */
+} params_t;
+
+static const uint64_t INIT32[8] = {
+    0xA3D8D930, 0x3FA8B72C, 0xED84EB49, 0xEDCA4787, 0x335463EB, 0xF994220B, 0xBE0BF5C9, 0xD7C49104};
+static const uint64_t INIT64[8] = {
+    0xB15E641748DE5E6BULL, 0xAA95E955E10F8410ULL, 0x28D1034441A9DD40ULL, 0x7F31BBF964E93BF5ULL,
+    0xB5E9E22493DFFB96ULL, 0xB980C852479FAFBDULL, 0xDA24516BF55EAFD4ULL, 0x86026AE8536F1501ULL};
+
+static int setup(params_t *P, int w, int r, int p, int t)
+{
+    if ((w != 32 && w != 64) || r < 1 || r > 63 || p < 1 || p > 255 || t < 0 || t > 4 * w || t % 8 != 0)
+        return -1;
+    P->w = w; P->r = r; P->p = p; P->t = t;
+    P->bw = (size_t)w / 8;
+    P->rate = WORDS_RATE * P->bw;
+    return 0;
+}
+
+static uint64_t load(const uint8_t *x, size_t bw)
+{
+    uint64_t v = 0;
+    for (size_t i = 0; i < bw; i++) v |= (uint64_t)x[i] << (8 * i);
+    return v;
+}
+
+static void store(uint8_t *x, uint64_t v, size_t bw)
+{
+    for (size_t i = 0; i < bw; i++) x[i] = (uint8_t)(v >> (8 * i));
+}
+
+/* F^R with the word size fixed at compile time, so each variant is fully specialized */
+#define DEFINE_F(NAME, W, MASK, R0, R1, R2, R3) \
+static void NAME(uint64_t *S, int rounds) \
+{ \
+    const uint64_t mask = MASK; \
+    const int w = W, r0 = R0, r1 = R1, r2 = R2, r3 = R3; \
+    uint64_t s[16]; \
+    memcpy(s, S, sizeof(s)); \
+    for (int i = 0; i < rounds; i++) { \
+        G(0, 4, 8, 12) G(1, 5, 9, 13) G(2, 6, 10, 14) G(3, 7, 11, 15) /* Column step */ \
+        G(0, 5, 10, 15) G(1, 6, 11, 12) G(2, 7, 8, 13) G(3, 4, 9, 14) /* Diagonal step */ \
+    } \
+    memcpy(S, s, sizeof(s)); \
+}
+#define H(x, y) (((x ^ y) ^ ((x & y) << 1)) & mask)
+#define ROT(x, n) (((x >> n) | (x << (w - n))) & mask)
+#define G(a, b, c, d) \
+    s[a] = H(s[a], s[b]); s[d] = ROT((s[a] ^ s[d]), r0); \
+    s[c] = H(s[c], s[d]); s[b] = ROT((s[b] ^ s[c]), r1); \
+    s[a] = H(s[a], s[b]); s[d] = ROT((s[a] ^ s[d]), r2); \
+    s[c] = H(s[c], s[d]); s[b] = ROT((s[b] ^ s[c]), r3);
+
+DEFINE_F(f32, 32, 0xffffffffULL, 8, 11, 16, 31)
+DEFINE_F(f64, 64, 0xffffffffffffffffULL, 8, 19, 40, 63)
+
+#undef G
+#undef ROT
+#undef H
+
+static void F(const params_t *P, uint64_t *S)
+{
+    if (P->w == 32) f32(S, P->r);
+    else f64(S, P->r);
+}
+
+static void init(const params_t *P, uint64_t *S, const uint8_t *n, const uint8_t *k, uint64_t *K)
+{
+    const uint64_t *U = P->w == 32 ? INIT32 : INIT64;
+    for (int i = 0; i < 4; i++) {
+        S[i] = load(n + i * P->bw, P->bw);
+        S[4 + i] = K[i] = load(k + i * P->bw, P->bw);
+    }
+    for (int i = 0; i < 8; i++) S[8 + i] = U[i];
+    S[12] ^= (uint64_t)P->w; /* mix in session parameters */
+    S[13] ^= (uint64_t)P->r;
+    S[14] ^= (uint64_t)P->p;
+    S[15] ^= (uint64_t)P->t;
+    F(P, S);
+    for (int i = 0; i < 4; i++) S[12 + i] ^= K[i];
+}
+
+static void absorb_block(const params_t *P, uint64_t *S, const uint8_t *x, uint64_t tag)
+{
+    S[15] ^= tag;
+    F(P, S);
+    for (int i = 0; i < WORDS_RATE; i++) S[i] ^= load(x + i * P->bw, P->bw);
+}
+
+static void pad(const params_t *P, uint8_t *y, const uint8_t *x, size_t len)
+{
+    memset(y, 0, P->rate);
+    if (len) memcpy(y, x, len);
+    y[len] ^= 0x01;
+    y[P->rate - 1] ^= 0x80;
+}
+
+static void absorb(const params_t *P, uint64_t *S, const uint8_t *x, size_t len, uint64_t tag)
+{
+    uint8_t y[MAX_RATE];
+    if (len == 0) return;
+    for (; len >= P->rate; x += P->rate, len -= P->rate) absorb_block(P, S, x, tag);
+    pad(P, y, x, len);
+    absorb_block(P, S, y, tag);
+}
+
+static void enc_block(const params_t *P, uint64_t *S, const uint8_t *x, uint8_t *out)
+{
+    S[15] ^= PYLD_TAG;
+    F(P, S);
+    for (int i = 0; i < WORDS_RATE; i++) {
+        S[i] ^= load(x + i * P->bw, P->bw);
+        store(out + i * P->bw, S[i], P->bw);
+    }
+}
+
+static void dec_block(const params_t *P, uint64_t *S, const uint8_t *x, uint8_t *out)
+{
+    S[15] ^= PYLD_TAG;
+    F(P, S);
+    for (int i = 0; i < WORDS_RATE; i++) {
+        uint64_t c = load(x + i * P->bw, P->bw);
+        store(out + i * P->bw, S[i] ^ c, P->bw);
+        S[i] = c;
+    }
+}
+
+static void enc_last(const params_t *P, uint64_t *S, const uint8_t *x, size_t len, uint8_t *out)
+{
+    uint8_t y[MAX_RATE];
+    pad(P, y, x, len);
+    enc_block(P, S, y, y);
+    if (len) memcpy(out, y, len);
+}
+
+static void dec_last(const params_t *P, uint64_t *S, const uint8_t *x, size_t len, uint8_t *out)
+{
+    uint8_t y[MAX_RATE];
+    S[15] ^= PYLD_TAG;
+    F(P, S);
+    for (int i = 0; i < WORDS_RATE; i++) store(y + i * P->bw, S[i], P->bw);
+    if (len) memcpy(y, x, len); /* the key stream fills the gap after the ciphertext */
+    y[len] ^= 0x01;
+    y[P->rate - 1] ^= 0x80;
+    for (int i = 0; i < WORDS_RATE; i++) {
+        uint64_t c = load(y + i * P->bw, P->bw);
+        store(y + i * P->bw, S[i] ^ c, P->bw);
+        S[i] = c;
+    }
+    if (len) memcpy(out, y, len);
+}
+
+/* payload phase: blocks go round-robin over the lanes, S is the State after the header (and the result) */
+static int crypt(const params_t *P, uint64_t *S, const uint8_t *x, size_t len, uint8_t *out, int decrypt)
+{
+    uint64_t *SL = S;
+    size_t lane = 0;
+    if (P->p > 1) { /* branch */
+        SL = malloc(sizeof(uint64_t) * 16 * (size_t)P->p);
+        if (SL == NULL) return -1;
+        S[15] ^= BR_TAG;
+        F(P, S);
+        for (int i = 0; i < P->p; i++) {
+            memcpy(SL + 16 * i, S, sizeof(uint64_t) * 16);
+            for (int j = 0; j < WORDS_RATE; j++) SL[16 * i + j] ^= (uint64_t)i;
+        }
+    }
+    if (len > 0) {
+        for (; len >= P->rate; x += P->rate, out += P->rate, len -= P->rate) {
+            if (decrypt) dec_block(P, SL + 16 * lane, x, out);
+            else enc_block(P, SL + 16 * lane, x, out);
+            lane = (lane + 1) % (size_t)P->p;
+        }
+        if (decrypt) dec_last(P, SL + 16 * lane, x, len, out);
+        else enc_last(P, SL + 16 * lane, x, len, out);
+    }
+    if (P->p > 1) { /* merge */
+        memset(S, 0, sizeof(uint64_t) * 16);
+        for (int i = 0; i < P->p; i++) {
+            uint64_t *L = SL + 16 * i;
+            L[15] ^= MRG_TAG;
+            F(P, L);
+            for (int j = 0; j < 16; j++) S[j] ^= L[j];
+        }
+        memset(SL, 0xff, sizeof(uint64_t) * 16 * (size_t)P->p); /* destroy the lanes */
+        free(SL);
+    }
+    return 0;
+}
+
+static void gen_tag(const params_t *P, uint64_t *S, const uint64_t *K, uint8_t *tag)
+{
+    uint8_t t[32];
+    S[15] ^= FIN_TAG;
+    F(P, S);
+    for (int i = 0; i < 4; i++) S[12 + i] ^= K[i];
+    F(P, S);
+    for (int i = 0; i < 4; i++) S[12 + i] ^= K[i];
+    for (int i = 0; i < 4; i++) store(t + i * P->bw, S[12 + i], P->bw);
+    memcpy(tag, t, (size_t)P->t / 8);
+    memset(S, 0, sizeof(uint64_t) * 16); /* burn state, no longer needed */
+    memset(t, 0, sizeof(t));
+}
+
+/*
+ * c receives mlen bytes of ciphertext and tag the Tag_Size_Bits / 8 bytes of tag
+ * returns 0, or -1 for unsupported parameters / out of memory
+ */
+int pynorx_aead_encrypt_detached(int w, int r, int p, int t, uint8_t *c, uint8_t *tag,
+    const uint8_t *h, size_t hlen, const uint8_t *m, size_t mlen, const uint8_t *tr, size_t tlen,
+    const uint8_t *n, const uint8_t *k)
+{
+    params_t P;
+    uint64_t S[16], K[4];
+    if (setup(&P, w, r, p, t) != 0) return -1;
+    init(&P, S, n, k, K);
+    absorb(&P, S, h, hlen, HEAD_TAG);
+    if (crypt(&P, S, m, mlen, c, 0) != 0) return -1;
+    absorb(&P, S, tr, tlen, TRAIL_TAG);
+    gen_tag(&P, S, K, tag);
+    memset(K, 0, sizeof(K));
+    return 0;
+}
+
+/*
+ * c receives mlen bytes of ciphertext followed by the Tag_Size_Bits / 8 bytes of tag
+ * returns 0, or -1 for unsupported parameters / out of memory
+ */
+int pynorx_aead_encrypt(int w, int r, int p, int t, uint8_t *c,
+    const uint8_t *h, size_t hlen, const uint8_t *m, size_t mlen, const uint8_t *tr, size_t tlen,
+    const uint8_t *n, const uint8_t *k)
+{
+    return pynorx_aead_encrypt_detached(w, r, p, t, c, c + mlen, h, hlen, m, mlen, tr, tlen, n, k);
+}
+
+/*
+ * c holds mlen bytes of ciphertext, tag the Tag_Size_Bits / 8 bytes of tag, m receives mlen bytes of plaintext
+ * returns 0 when the tag is valid, 1 when it is not (m is zeroed then), -1 for unsupported parameters / out of memory
+ */
+int pynorx_aead_decrypt_detached(int w, int r, int p, int t, uint8_t *m,
+    const uint8_t *h, size_t hlen, const uint8_t *c, size_t mlen, const uint8_t *tr, size_t tlen,
+    const uint8_t *tag, const uint8_t *n, const uint8_t *k)
+{
+    params_t P;
+    uint64_t S[16], K[4];
+    uint8_t t1[32];
+    size_t d = (size_t)t / 8;
+    unsigned acc = 0;
+    if (setup(&P, w, r, p, t) != 0) return -1;
+    init(&P, S, n, k, K);
+    absorb(&P, S, h, hlen, HEAD_TAG);
+    if (crypt(&P, S, c, mlen, m, 1) != 0) return -1;
+    absorb(&P, S, tr, tlen, TRAIL_TAG);
+    gen_tag(&P, S, K, t1);
+    memset(K, 0, sizeof(K));
+    for (size_t i = 0; i < d; i++) acc |= t1[i] ^ tag[i]; /* constant time compare */
+    if (acc != 0) {
+        if (mlen) memset(m, 0, mlen);
+        return 1;
+    }
+    return 0;
+}
+
+/*
+ * c holds clen bytes of ciphertext + tag (clen >= Tag_Size_Bits / 8), m receives clen - tag bytes of plaintext
+ * returns 0 when the tag is valid, 1 when it is not (m is zeroed then), -1 for unsupported parameters / out of memory
+ */
+int pynorx_aead_decrypt(int w, int r, int p, int t, uint8_t *m,
+    const uint8_t *h, size_t hlen, const uint8_t *c, size_t clen, const uint8_t *tr, size_t tlen,
+    const uint8_t *n, const uint8_t *k)
+{
+    size_t d = (size_t)t / 8;
+    if (t < 0 || clen < d) return -1;
+    return pynorx_aead_decrypt_detached(w, r, p, t, m, h, hlen, c, clen - d, tr, tlen, c + clen - d, n, k);
+}
@@ -0,0 +1,127 @@
+__doc__ = """
+    Optional compiled backend for PyNORX: PyNORXC.c (a small C implementation of NORX v3.0 bundled with PyNORX)
+    built as a shared library and called through ctypes. Nothing has to be installed besides a C compiler:
+        python PyNORXC.py build
+    compiles the library next to this file (or call build()). Once it exists, new PyNORX objects run
+    aead_encrypt/aead_decrypt through it automatically; PyNORX(..., backend='python') opts out and the
+    backend attribute of a PyNORX object tells which one it uses. AVAILABLE is False when the library is not
+    built (or fails to load) and PyNORX silently keeps to the pure Python code.
+    """
+
+import ctypes;
+import os;
+import sys;
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "PyNORXC.c");
+LIBRARY = os.path.join(os.path.dirname(SOURCE),
+    "_pynorxc" + (".dll" if sys.platform in ("win32", "cygwin") else ".so")); # shared library suffix
+
+def build(cc = None, flags = ("-O3", "-shared", "-fPIC")):
+    """
+    Compile PyNORXC.c into LIBRARY with the C compiler cc (None = $CC, else 'cc') and load it
+    (returns True when the compiled backend is available afterwards)
+    """
+    import subprocess; # only needed to build, keeps it out of the first PyNORX()
+    cc = cc or os.environ.get("CC") or "cc";
+    subprocess.check_call([cc, *flags, "-o", LIBRARY, SOURCE]);
+    return load();
+
+def load():
+    """
+    Load LIBRARY when it is built and up to date with PyNORXC.c (returns True/False, see AVAILABLE)
+    """
+    global __LIB__, AVAILABLE;
+    __LIB__, AVAILABLE = None, False;
+    try:
+        if os.path.getmtime(LIBRARY) < os.path.getmtime(SOURCE):
+            return False; # stale build, the Python code is the reference
+        lib = ctypes.CDLL(LIBRARY);
+    except OSError:
+        return False;
+    for fn in (lib.pynorx_aead_encrypt, lib.pynorx_aead_decrypt):
+        fn.restype = ctypes.c_int;
+        fn.argtypes = [ctypes.c_int] * 4 + [ctypes.c_void_p] + [ctypes.c_char_p, ctypes.c_size_t] * 3 + \
+            [ctypes.c_char_p] * 2;
+    lib.pynorx_aead_encrypt_detached.restype = lib.pynorx_aead_decrypt_detached.restype = ctypes.c_int;
+    lib.pynorx_aead_encrypt_detached.argtypes = [ctypes.c_int] * 4 + [ctypes.c_void_p] * 2 + \
+        [ctypes.c_char_p, ctypes.c_size_t] * 3 + [ctypes.c_char_p] * 2;
+    lib.pynorx_aead_decrypt_detached.argtypes = [ctypes.c_int] * 4 + [ctypes.c_void_p] + \
+        [ctypes.c_char_p, ctypes.c_size_t] * 3 + [ctypes.c_char_p] * 3;
+    __LIB__, AVAILABLE = lib, True;
+    return True;
+
+def __bytes__(x):
+    return x if type(x) is bytes else bytes(x);
+
+def __out__(size):
+    # writable bytearray of size bytes and the ctypes view passed to C for it
+    out = bytearray(size);
+    return (out, (ctypes.c_char * size).from_buffer(out));
+
+def aead_encrypt(params, h, m, t, n, k):
+    """
+    Compiled aead_encrypt with the NorxParams params, key and nonce lengths already checked
+    (returns bytes(ciphertext if any + tag))
+    """
+    h, m, t = __bytes__(h), __bytes__(m), __bytes__(t);
+    out, view = __out__(len(m) + params.BYTES_TAG);
+    if __LIB__.pynorx_aead_encrypt(params.NORX_W_BITS, params.NORX_R, params.NORX_P, params.NORX_T_BITS, view,
+            h, len(h), m, len(m), t, len(t), __bytes__(n), __bytes__(k)) != 0:
+        raise MemoryError("PyNORXC: encryption failed.");
+    del view;
+    return bytes(out);
+
+def aead_decrypt(params, h, c, t, n, k):
+    """
+    Compiled aead_decrypt with the NorxParams params, key, nonce and ciphertext lengths already checked
+    (returns tuple(True/False, bytearray of plaintext if any))
+    """
+    h, c, t = __bytes__(h), __bytes__(c), __bytes__(t);
+    out, view = __out__(len(c) - params.BYTES_TAG);
+    result = __LIB__.pynorx_aead_decrypt(params.NORX_W_BITS, params.NORX_R, params.NORX_P, params.NORX_T_BITS,
+        view, h, len(h), c, len(c), t, len(t), __bytes__(n), __bytes__(k));
+    del view;
+    if result < 0:
+        raise MemoryError("PyNORXC: decryption failed.");
+    if result != 0:
+        return (False, None); # validation failed, return nothing (out was zeroed)
+    return (True, out if out else None);
+
+def aead_encrypt_detached(params, h, m, t, n, k):
+    """
+    Compiled aead_encrypt with the tag written to a buffer of its own, lengths already checked
+    (returns tuple(bytearray of ciphertext, empty if none, bytes of tag))
+    """
+    h, m, t = __bytes__(h), __bytes__(m), __bytes__(t);
+    out, view = __out__(len(m));
+    tag, tag_view = __out__(params.BYTES_TAG);
+    if __LIB__.pynorx_aead_encrypt_detached(params.NORX_W_BITS, params.NORX_R, params.NORX_P, params.NORX_T_BITS,
+            view, tag_view, h, len(h), m, len(m), t, len(t), __bytes__(n), __bytes__(k)) != 0:
+        raise MemoryError("PyNORXC: encryption failed.");
+    del view, tag_view;
+    return (out, bytes(tag));
+
+def aead_decrypt_detached(params, h, c, t, tag, n, k):
+    """
+    Compiled aead_decrypt of ciphertext c with its tag passed apart, lengths (tag included) already checked
+    (returns tuple(True/False, bytearray of plaintext if any))
+    """
+    h, c, t = __bytes__(h), __bytes__(c), __bytes__(t);
+    out, view = __out__(len(c));
+    result = __LIB__.pynorx_aead_decrypt_detached(params.NORX_W_BITS, params.NORX_R, params.NORX_P,
+        params.NORX_T_BITS, view, h, len(h), c, len(c), t, len(t), __bytes__(tag), __bytes__(n), __bytes__(k));
+    del view;
+    if result < 0:
+        raise MemoryError("PyNORXC: decryption failed.");
+    if result != 0:
+        return (False, None); # validation failed, return nothing (out was zeroed)
+    return (True, out if out else None);
+
+__LIB__ = None;
+AVAILABLE = False;
+load();
+
+if (__name__ == "__main__"):
+    if sys.argv[1:] != ["build"]:
+        sys.exit("usage: python PyNORXC.py build");
+    print(LIBRARY if build() else "PyNORXC: built, but the library could not be loaded");
@@ -0,0 +1,267 @@
+__doc__ = """
+    File encryption with PyNORX: a self-describing container and a command line front end.
+    Container layout (all integers little-endian):
+        magic b'NORX' | version (1 byte) | W | R | P (1 byte each) | Tag_Size_Bits (2 bytes) | chunk size (4 bytes)
+        | nonce (4 words) | chunk 0 (ciphertext + tag) | chunk 1 | ...
+    Every chunk is sealed on its own with aead_encrypt (the compiled core when it is built, see PyNORXC):
+        nonce of chunk i = nonce + i (as a little-endian integer, wrapping around)
+        header of chunk i = container header | chunk index (8 bytes) | final flag (1 byte)
+    so the parameters, chunk size and nonce are authenticated with every chunk, and chunks can not be reordered,
+    dropped or truncated without failing validation. Every chunk but the last holds exactly chunk size bytes of
+    plaintext, an empty file is a single empty chunk. Version 1 containers (the whole file as one NORX message,
+    with the container header as its header) are still decrypted, streamed through NorxDecryptor.
+    The parameters also decide how strong the check is (a forged header with Tag_Size_Bits = 0 checks nothing),
+    so decrypt_file refuses containers whose parameters differ from the expected ones or whose tag is shorter
+    than min_tag_bits. Input files are memory-mapped and processed one chunk at a time, so memory use stays
+    constant however large the file is.
+    '-' stands for stdin/stdout, e.g.:
+        python PyNORXFILE.py encrypt --key-file my.key big.log big.log.norx
+        cat big.log.norx | python PyNORXFILE.py decrypt --key-file my.key - - > big.log
+    """
+
+import argparse;
+import contextlib;
+import io;
+import mmap;
+import os;
+import stat;
+import struct;
+import sys;
+
+from PyNORX import PyNORX;
+
+MAGIC = b'NORX';
+VERSION = 2; # written by encrypt_file, decrypt_file also reads version 1
+__HEADER__ = struct.Struct('<4sBBBBHI'); # magic, version, W, R, P, T, chunk size (the nonce follows)
+__CHUNK__ = struct.Struct('<QB'); # chunk index, final flag
+DEFAULT_CHUNK_SIZE = 1 << 20;
+MAX_READ_SIZE = 1 << 24; # largest single read while decrypting, whatever chunk size a container claims
+MIN_TAG_BITS = 128; # shortest tag decrypt_file accepts unless the caller lowers min_tag_bits
+
+def check_parameters(W, R, P, T, *, Word_Size_Bits = None, Rounds = None, Lanes = None, Tag_Size_Bits = None,
+                     min_tag_bits = MIN_TAG_BITS):
+    """
+    Validate parameters read from an (unauthenticated) container header against the allowed ranges, the
+    expected values (None = any) and the minimum tag size; raises an Exception on the first mismatch
+    """
+    if W not in (32, 64) or not 1 <= R <= 63 or not 1 <= P <= 255 or not 0 <= T <= 4 * W or T % 8 != 0:
+        raise Exception("Corrupt PyNORX container header.");
+    for (name, value, expected) in (("Word_Size_Bits", W, Word_Size_Bits), ("Rounds", R, Rounds),
+            ("Lanes", P, Lanes), ("Tag_Size_Bits", T, Tag_Size_Bits)):
+        if expected is not None and value != expected:
+            raise Exception("PyNORX container " + name + " is " + str(value) + ", expected " + str(expected) + ".");
+    if T < min_tag_bits:
+        raise Exception("PyNORX container tag of " + str(T) + " bits is shorter than the minimum of " +
+            str(min_tag_bits) + ".");
+
+def chunk_nonce(n, i):
+    """
+    Nonce of chunk i: the base nonce n plus i, as a little-endian integer modulo 2^(8*len(n)) (returns bytes)
+    """
+    return ((int.from_bytes(n, 'little') + i) % (1 << (8 * len(n)))).to_bytes(len(n), 'little');
+
+def chunk_header(h, i, final):
+    """
+    Header of chunk i of the container with header h, final for the last chunk (returns bytes)
+    """
+    return h + __CHUNK__.pack(i, 1 if final else 0);
+
+def pack_header(norx, n, chunk_size):
+    """
+    Container header for the parameters of norx, nonce n and chunk_size (returns bytes)
+    """
+    assert len(n) == norx.BYTES_NONCE;
+    assert 0 < chunk_size <= MAX_READ_SIZE;
+    return __HEADER__.pack(MAGIC, VERSION, norx.NORX_W_BITS, norx.NORX_R, norx.NORX_P, norx.NORX_T_BITS,
+        chunk_size) + bytes(n);
+
+def read_header(f, **expected):
+    """
+    Read and parse a container header from the binary file f, expected as for check_parameters
+    (returns tuple(PyNORX object with the stored parameters, nonce, chunk size, raw header bytes))
+    """
+    raw = __read_exactly__(f, __HEADER__.size);
+    magic, version, W, R, P, T, chunk_size = __HEADER__.unpack(raw);
+    if magic != MAGIC or version not in (1, VERSION):
+        raise Exception("Not a PyNORX container (or an unsupported version).");
+    if chunk_size == 0 or (version != 1 and chunk_size > MAX_READ_SIZE): # version 1 reads are capped instead
+        raise Exception("Corrupt PyNORX container header.");
+    check_parameters(W, R, P, T, **expected);
+    norx = PyNORX(Word_Size_Bits=W, Rounds=R, Lanes=P, Tag_Size_Bits=T);
+    n = __read_exactly__(f, norx.BYTES_NONCE);
+    return (norx, n, chunk_size, raw + n);
+
+def __read_exactly__(f, size):
+    x = f.read(size);
+    if len(x) != size:
+        raise Exception("Truncated PyNORX container.");
+    return x;
+
+def __open__(path, mode):
+    # binary file object for path, '-' is stdin/stdout (left open when the 'with' block ends)
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin.buffer if 'r' in mode else sys.stdout.buffer);
+    return open(path, mode);
+
+def __mapped__(f):
+    # memory map of the regular file f, or None (pipes, terminals, empty files)
+    try:
+        if not stat.S_ISREG(os.fstat(f.fileno()).st_mode) or os.fstat(f.fileno()).st_size == 0:
+            return None;
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ);
+    except (OSError, ValueError, io.UnsupportedOperation):
+        return None;
+
+def __chunks__(f, chunk_size, hold):
+    # yield the rest of the binary file f in chunk_size pieces, except for its last hold bytes
+    # (returned as the generator's value); regular files are memory-mapped and sliced without copies
+    mm = __mapped__(f);
+    if mm is not None:
+        view = memoryview(mm);
+        start, end = f.tell(), len(mm) - hold;
+        if end < start:
+            raise Exception("Truncated PyNORX container.");
+        try:
+            for i in range(start, end, chunk_size):
+                yield view[i:min(i + chunk_size, end)];
+            return bytes(view[end:]);
+        finally:
+            try:
+                view.release();
+                mm.close();
+            except BufferError: # the caller still holds a slice, the map is closed once that is collected
+                pass;
+    pending = bytearray(); # every piece but the last is exactly chunk_size bytes, as with the map
+    while True:
+        x = f.read(chunk_size);
+        if not x:
+            break;
+        pending += x;
+        while len(pending) - hold >= chunk_size:
+            yield bytes(pending[:chunk_size]);
+            del pending[:chunk_size];
+    if len(pending) < hold:
+        raise Exception("Truncated PyNORX container.");
+    if len(pending) > hold:
+        yield bytes(pending[:len(pending) - hold]);
+    return bytes(pending[len(pending) - hold:]);
+
+def __flag_last__(chunks):
+    # tuple(chunk, True for the last one) for every chunk, a single empty chunk when there are none
+    previous = None;
+    for x in chunks:
+        if previous is not None:
+            yield (previous, False);
+        previous = x;
+    yield (previous if previous is not None else b'', True);
+
+def encrypt_file(src, dst, k, n = None, *, Word_Size_Bits = 64, Rounds = 4, Lanes = 1, Tag_Size_Bits = 256,
+                 chunk_size = DEFAULT_CHUNK_SIZE):
+    """
+    Encrypt the file src into the container dst ('-' for stdin/stdout), with key k and nonce n
+    (None = a fresh random nonce) (returns the number of bytes written)
+    """
+    norx = PyNORX(Word_Size_Bits=Word_Size_Bits, Rounds=Rounds, Lanes=Lanes, Tag_Size_Bits=Tag_Size_Bits);
+    if n is None:
+        n = os.urandom(norx.BYTES_NONCE);
+    h = pack_header(norx, n, chunk_size);
+    context = norx.key_context(k);
+    with __open__(src, 'rb') as fin, __open__(dst, 'wb') as fout:
+        written = fout.write(h);
+        for (i, (x, final)) in enumerate(__flag_last__(__chunks__(fin, chunk_size, 0))):
+            written += fout.write(context.aead_encrypt(chunk_header(h, i, final), x, b'', chunk_nonce(n, i)));
+        fout.flush();
+    context.burn();
+    return written;
+
+def __decrypt_chunks__(fin, fout, norx, n, k, chunk_size, h):
+    # version 2: open the chunks one by one, plaintext is written once its chunk validated (returns True/False)
+    context = norx.key_context(k);
+    d = norx.BYTES_TAG;
+    try:
+        for (i, (x, final)) in enumerate(__flag_last__(__chunks__(fin, chunk_size + d, 0))):
+            if len(x) < d:
+                return False; # truncated
+            valid, m = context.aead_decrypt(chunk_header(h, i, final), x, b'', chunk_nonce(n, i));
+            if not valid:
+                return False;
+            if m:
+                fout.write(m);
+        return True;
+    finally:
+        context.burn();
+
+def __decrypt_stream__(fin, fout, norx, n, k, chunk_size, h):
+    # version 1: one NORX message, plaintext is written as it is decrypted (returns True/False)
+    dec = norx.decryptor(n, k);
+    dec.update_header(h);
+    chunks = __chunks__(fin, min(chunk_size, MAX_READ_SIZE), norx.BYTES_TAG);
+    while True:
+        try:
+            fout.write(dec.update(next(chunks)));
+        except StopIteration as done:
+            tag = done.value;
+            break;
+    valid, m = dec.finalize(tag);
+    if valid and m:
+        fout.write(m);
+    return valid;
+
+def decrypt_file(src, dst, k, *, Word_Size_Bits = None, Rounds = None, Lanes = None, Tag_Size_Bits = None,
+                 min_tag_bits = MIN_TAG_BITS):
+    """
+    Decrypt and validate the container src into dst ('-' for stdin/stdout) with key k (returns True/False)
+    The parameters are those encrypt_file took: None accepts whatever the container holds, anything else must
+    match it, and tags shorter than min_tag_bits are refused (an Exception, before anything is written).
+    Plaintext is written chunk by chunk; when validation fails dst is deleted again (stdout can not be
+    taken back: callers of a pipeline must discard its output when False is returned / the exit code is 1).
+    """
+    with __open__(src, 'rb') as fin:
+        norx, n, chunk_size, h = read_header(fin, Word_Size_Bits=Word_Size_Bits, Rounds=Rounds, Lanes=Lanes,
+            Tag_Size_Bits=Tag_Size_Bits, min_tag_bits=min_tag_bits);
+        with __open__(dst, 'wb') as fout:
+            decrypt = __decrypt_stream__ if h[4] == 1 else __decrypt_chunks__; # h[4]: the version byte
+            valid = decrypt(fin, fout, norx, n, k, chunk_size, h);
+            fout.flush();
+    if not valid and dst != '-':
+        os.remove(dst);
+    return valid;
+
+def __key__(args):
+    if args.key_hex is not None:
+        return bytes.fromhex(args.key_hex);
+    with open(args.key_file, 'rb') as f:
+        return f.read();
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Encrypt/decrypt files with PyNORX ('-' = stdin/stdout)");
+    parser.add_argument("mode", choices=("encrypt", "decrypt"));
+    parser.add_argument("src");
+    parser.add_argument("dst");
+    key = parser.add_mutually_exclusive_group(required=True);
+    key.add_argument("--key-file", help="file holding the raw key (4 words: 16 or 32 bytes)");
+    key.add_argument("--key-hex", help="the key as hex digits");
+    # decrypt refuses containers with other parameters than --words/--rounds/--lanes (and --tag-bits when given)
+    parser.add_argument("--words", type=int, default=64, choices=(32, 64), help="Word_Size_Bits, default 64");
+    parser.add_argument("--rounds", type=int, default=4, help="Rounds, default 4");
+    parser.add_argument("--lanes", type=int, default=1, help="Lanes, default 1");
+    parser.add_argument("--tag-bits", type=int, default=None,
+        help="Tag_Size_Bits, default 4 words (decrypt: any, down to --min-tag-bits)");
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="chunk size in bytes (encrypt)");
+    parser.add_argument("--min-tag-bits", type=int, default=MIN_TAG_BITS,
+        help="decrypt: refuse containers with shorter tags, default " + str(MIN_TAG_BITS));
+    args = parser.parse_args(argv);
+    k = __key__(args);
+    if args.mode == "encrypt":
+        encrypt_file(args.src, args.dst, k, Word_Size_Bits=args.words, Rounds=args.rounds, Lanes=args.lanes,
+            Tag_Size_Bits=args.tag_bits if args.tag_bits is not None else 4 * args.words,
+            chunk_size=args.chunk_size);
+        return 0;
+    if not decrypt_file(args.src, args.dst, k, Word_Size_Bits=args.words, Rounds=args.rounds, Lanes=args.lanes,
+            Tag_Size_Bits=args.tag_bits, min_tag_bits=args.min_tag_bits):
+        sys.stderr.write("PyNORX: validation FAILED, output discarded.\n");
+        return 1;
+    return 0;
+
+if (__name__ == "__main__"):
+    sys.exit(main());
@@ -0,0 +1,313 @@
+__doc__ = """
+    Differential fuzzing and a performance regression gate for PyNORX.
+    fuzz() draws random configurations (any W, R, P incl. 3 and 255, T incl. 0 and odd byte counts), random
+    header/payload/trailer lengths clustered around the block boundaries and random chunkings, and checks that
+    every fast path of PyNORX (see PATHS and the batch paths) returns exactly what the frozen reference
+    implementation (PyNORXREFERENCE) returns, for genuine and for forged ciphertexts.
+    gate() times key configurations against the reference in the same process and fails when the measured
+    speedup falls more than threshold below the one recorded in GATE (a ratio, so it holds across machines).
+        python PyNORXFUZZ.py fuzz --iterations 500 --seed 7
+        python PyNORXFUZZ.py gate --threshold 0.25
+    Both exit with status 1 on a failure and print what to replay.
+    """
+
+import argparse;
+import random;
+import sys;
+
+from PyNORX import PyNORX;
+from PyNORXREFERENCE import PyNORX as ReferenceNORX;
+
+# (W, R, P, T) -> speedup of aead_encrypt/aead_decrypt (pure Python backend) over the reference, 4 KiB payloads
+GATE = {
+    (64, 4, 1, 256): 1.5,
+    (32, 4, 1, 128): 1.5,
+    (64, 6, 4, 256): 1.45,
+};
+GATE_SIZE = 4096;
+
+def random_config(rng):
+    """
+    Random (Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits), edge values favored (returns tuple)
+    """
+    W = rng.choice((32, 64));
+    R = rng.choice((1, 2, 4, 6, rng.randint(1, 63)));
+    P = rng.choice((1, 1, 1, 2, 3, 4, 255, rng.randint(1, 255)));
+    T = rng.choice((4 * W, 0, 8, 8 * rng.randint(0, W // 2)));
+    return (W, R, P, T);
+
+def random_length(rng, b):
+    """
+    Random length for rate blocks of b bytes: empty, around one or two block boundaries, or anything up to 5 blocks
+    """
+    return rng.choice((0, 1, b - 1, b, b + 1, 2 * b - 1, 2 * b, rng.randint(0, 5 * b)));
+
+def random_chunks(rng, size):
+    """
+    Random split of size bytes into chunk lengths (returns list of ints, empty chunks included)
+    """
+    chunks = [];
+    while size > 0:
+        x = rng.choice((0, 1, rng.randint(1, 7), rng.randint(1, 200)));
+        chunks.append(min(x, size));
+        size -= chunks[-1];
+    return chunks + [0] * rng.randint(0, 1);
+
+def __split__(x, chunks):
+    o = 0;
+    for c in chunks:
+        yield x[o:o+c];
+        o += c;
+
+def __norm__(result):
+    # aead_decrypt result with the plaintext as bytes, for comparisons across paths
+    valid, m = result;
+    return (valid, bytes(m) if m else None);
+
+class FuzzCase(object):
+    """
+    One random message of a fuzz iteration: the inputs, chunkings and the reference outputs
+    """
+
+    def __init__(self, rng, ref):
+        b = ref.BYTES_RATE;
+        data = lambda size: bytes(rng.getrandbits(8) for i in range(0, size));
+        self.h, self.m, self.t = (data(random_length(rng, b)) for i in range(0, 3));
+        self.n, self.k = data(ref.BYTES_NONCE), data(ref.BYTES_KEY);
+        self.chunks = [random_chunks(rng, len(x)) for x in (self.h, self.m, self.t)];
+        self.c = bytes(ref.aead_encrypt(self.h, self.m, self.t, self.n, self.k));
+        forged = bytearray(self.c);
+        if forged:
+            forged[rng.randrange(0, len(forged))] ^= 1 << rng.randrange(0, 8);
+        self.forged = bytes(forged);
+        self.opened = [__norm__(ref.aead_decrypt(self.h, x, self.t, self.n, self.k)) for x in (self.c, self.forged)];
+        self.lazy_chunk = rng.choice((1, b, rng.randint(1, 300)));
+
+    def describe(self):
+        return "len(h, m, t) = " + str((len(self.h), len(self.m), len(self.t)));
+
+# every path: tuple(name, applies(W, R, P, T, options), encrypt(norx, case), decrypt(norx, case, c))
+def __stream_encrypt__(norx, case):
+    enc = norx.encryptor(case.n, case.k);
+    enc.LANE_RUN_BLOCKS = 1; # with an executor, flush a run of blocks every Lanes blocks
+    for x in __split__(case.h, case.chunks[0]): enc.update_header(x);
+    c = b''.join(enc.update(x) for x in __split__(case.m, case.chunks[1]));
+    for x in __split__(case.t, case.chunks[2]): enc.update_trailer(x);
+    return c + enc.finalize();
+
+def __stream_decrypt__(norx, case, c):
+    d = norx.BYTES_TAG;
+    dec = norx.decryptor(case.n, case.k);
+    dec.LANE_RUN_BLOCKS = 1;
+    for x in __split__(case.h, case.chunks[0]): dec.update_header(x);
+    m = b''.join(dec.update(x) for x in __split__(c[:len(c)-d], case.chunks[1]));
+    for x in __split__(case.t, case.chunks[2]): dec.update_trailer(x);
+    valid, rest = dec.finalize(c[len(c)-d:]);
+    return (valid, m + rest) if valid else (False, None); # released plaintext is discarded on failure
+
+def __into_encrypt__(norx, case):
+    out = bytearray(3 + len(case.m) + norx.BYTES_TAG);
+    norx.aead_encrypt_into(memoryview(out), case.h, case.m, case.t, case.n, case.k, 3);
+    return bytes(out[3:]);
+
+def __into_decrypt__(norx, case, c):
+    out = bytearray(len(c) - norx.BYTES_TAG);
+    valid, size = norx.aead_decrypt_into(out, case.h, memoryview(c), case.t, case.n, case.k);
+    return (valid, out[:size] if valid else None);
+
+def __detached_encrypt__(norx, case):
+    c, tag = norx.aead_encrypt_detached(case.h, case.m, case.t, case.n, case.k);
+    return bytes(c) + tag;
+
+def __detached_decrypt__(norx, case, c):
+    d = len(c) - norx.BYTES_TAG;
+    return norx.aead_decrypt_detached(case.h, c[:d], case.t, case.n, case.k, c[d:]);
+
+def __context_encrypt__(norx, case):
+    context = norx.key_context(case.k, cache_size=2);
+    first = context.aead_encrypt(case.h, case.m, case.t, case.n);
+    return first if context.aead_encrypt(case.h, case.m, case.t, case.n) == first else b'cached State differs';
+
+def __context_decrypt__(norx, case, c):
+    return norx.key_context(case.k, cache_size=2).aead_decrypt(case.h, c, case.t, case.n);
+
+def __cached_encrypt__(norx, case):
+    first = norx.aead_encrypt(case.h, case.m, case.t, case.n, case.k);
+    return first if norx.aead_encrypt(case.h, case.m, case.t, case.n, case.k) == first else b'cached State differs';
+
+def __session_encrypt__(norx, case):
+    session = norx.session(case.k, case.n[:-8], counter=int.from_bytes(case.n[-8:], 'little'));
+    n, c = session.aead_encrypt(case.h, case.m, case.t);
+    return c if n == case.n else b'wrong nonce';
+
+def __lazy_decrypt__(norx, case, c):
+    valid, chunks = norx.aead_decrypt_lazy(case.h, c, case.t, case.n, case.k, case.lazy_chunk);
+    return (valid, b''.join(chunks)) if valid else (False, None);
+
+def __decrypt_to__(norx, case, c):
+    out = bytearray();
+    return (True, out) if norx.aead_decrypt_to(out.extend, case.h, c, case.t, case.n, case.k, case.lazy_chunk) \
+        else (False, None);
+
+def __stats_encrypt__(norx, case):
+    norx.enable_stats();
+    try:
+        return norx.aead_encrypt(case.h, case.m, case.t, case.n, case.k);
+    finally:
+        norx.disable_stats();
+
+def __stats_decrypt__(norx, case, c):
+    norx.enable_stats();
+    try:
+        return norx.aead_decrypt(case.h, c, case.t, case.n, case.k);
+    finally:
+        norx.disable_stats();
+
+def __plain_encrypt__(norx, case):
+    return norx.aead_encrypt(case.h, case.m, case.t, case.n, case.k);
+
+def __plain_decrypt__(norx, case, c):
+    return norx.aead_decrypt(case.h, c, case.t, case.n, case.k);
+
+def __compiled__():
+    try:
+        import PyNORXC;
+    except ImportError:
+        return False;
+    return PyNORXC.AVAILABLE;
+
+PATHS = (
+    ("python", lambda P, options: True, __plain_encrypt__, __plain_decrypt__),
+    ("compiled", lambda P, options: options["compiled"], __plain_encrypt__, __plain_decrypt__),
+    ("detached", lambda P, options: True, __detached_encrypt__, __detached_decrypt__),
+    ("compiled detached", lambda P, options: options["compiled"], __detached_encrypt__, __detached_decrypt__),
+    ("lane executor", lambda P, options: P > 1, __plain_encrypt__, __plain_decrypt__),
+    ("into", lambda P, options: True, __into_encrypt__, __into_decrypt__),
+    ("stream", lambda P, options: True, __stream_encrypt__, __stream_decrypt__),
+    ("stream executor", lambda P, options: P > 1, __stream_encrypt__, __stream_decrypt__),
+    ("key context", lambda P, options: True, __context_encrypt__, __context_decrypt__),
+    ("state cache", lambda P, options: True, __cached_encrypt__, __plain_decrypt__),
+    ("session", lambda P, options: True, __session_encrypt__, None),
+    ("lazy", lambda P, options: True, None, __lazy_decrypt__),
+    ("decrypt to", lambda P, options: True, None, __decrypt_to__),
+    ("instrumented", lambda P, options: True, __stats_encrypt__, __stats_decrypt__),
+);
+
+def __batch_paths__(P, options):
+    # tuple(name, encrypt_batch(norx, records), decrypt_batch(norx, records)) for every batch path of P
+    paths = [("many", lambda norx, records: norx.aead_encrypt_many(records),
+              lambda norx, records: norx.aead_decrypt_many(records))];
+    if P == 1:
+        import PyNORXPIPELINE;
+        paths.append(("pipeline", lambda norx, records: PyNORXPIPELINE.aead_encrypt_batch(norx, records, width=3),
+                      lambda norx, records: PyNORXPIPELINE.aead_decrypt_batch(norx, records, width=3)));
+        if options["numpy"]:
+            import PyNORXNUMPY;
+            paths.append(("numpy", PyNORXNUMPY.aead_encrypt_batch, PyNORXNUMPY.aead_decrypt_batch));
+    return paths;
+
+def fuzz(iterations = 100, seed = None, *, batch = 4, log = None):
+    """
+    Run iterations random configurations with up to batch messages each through every path
+    (returns list of failure descriptions, empty when every path matched the reference)
+    log, if given, is called with every failure description as it is found.
+    """
+    from concurrent.futures import ThreadPoolExecutor;
+    try:
+        import PyNORXNUMPY;
+        numpy = PyNORXNUMPY.AVAILABLE;
+    except ImportError:
+        numpy = False;
+    options = {"compiled": __compiled__(), "numpy": numpy};
+    seed = random.randrange(0, 1 << 32) if seed is None else seed;
+    rng = random.Random(seed);
+    failures = [];
+    def fail(text):
+        failures.append(text);
+        if log is not None: log(text);
+    with ThreadPoolExecutor(4) as executor:
+        for i in range(0, iterations):
+            W, R, P, T = config = random_config(rng);
+            where = "seed " + str(seed) + " iteration " + str(i) + " (W, R, P, T) = " + str(config);
+            kw = dict(Word_Size_Bits=W, Rounds=R, Lanes=P, Tag_Size_Bits=T);
+            ref = ReferenceNORX(**kw);
+            cases = [FuzzCase(rng, ref) for j in range(0, rng.randint(1, batch))];
+            for (name, applies, encrypt, decrypt) in PATHS:
+                if not applies(P, options):
+                    continue;
+                norx = PyNORX(backend='c' if name.startswith("compiled") else 'python',
+                    executor=executor if name in ("lane executor", "stream executor") else None,
+                    state_cache=4 if name == "state cache" else 0, **kw);
+                for case in cases:
+                    try:
+                        if encrypt is not None and bytes(encrypt(norx, case)) != case.c:
+                            fail(where + " path " + name + ": encrypt differs, " + case.describe());
+                        if decrypt is not None and [__norm__(decrypt(norx, case, x)) for x in (case.c, case.forged)
+                                ] != case.opened:
+                            fail(where + " path " + name + ": decrypt differs, " + case.describe());
+                    except Exception as e:
+                        fail(where + " path " + name + ": " + repr(e) + ", " + case.describe());
+            norx = PyNORX(backend='python', **kw);
+            records = [(case.h, case.m, case.t, case.n, case.k) for case in cases];
+            forged = [(case.h, x, case.t, case.n, case.k) for case in cases for x in (case.c, case.forged)];
+            for (name, encrypt, decrypt) in __batch_paths__(P, options):
+                try:
+                    if [bytes(c) for c in encrypt(norx, records)] != [case.c for case in cases]:
+                        fail(where + " batch path " + name + ": encrypt differs");
+                    if [__norm__(x) for x in decrypt(norx, forged)] != [x for case in cases for x in case.opened]:
+                        fail(where + " batch path " + name + ": decrypt differs");
+                except Exception as e:
+                    fail(where + " batch path " + name + ": " + repr(e));
+    return failures;
+
+def gate(threshold = 0.25, configs = None, *, min_time = 0.2):
+    """
+    Time aead_encrypt/aead_decrypt (pure Python backend) against the reference for every configuration of
+    GATE (or configs, a dict of the same shape) (returns tuple(list of failure descriptions, dict of the
+    measured speedups)). A speedup below recorded * (1 - threshold) is a failure.
+    """
+    import os;
+    import PyNORXBENCH;
+    failures, measured = [], {};
+    for config, recorded in sorted((configs or GATE).items()):
+        W, R, P, T = config;
+        kw = dict(Word_Size_Bits=W, Rounds=R, Lanes=P, Tag_Size_Bits=T);
+        norx, ref = PyNORX(backend='python', **kw), ReferenceNORX(**kw);
+        m, n, k = os.urandom(GATE_SIZE), os.urandom(norx.BYTES_NONCE), os.urandom(norx.BYTES_KEY);
+        c = norx.aead_encrypt(b'', m, b'', n, k);
+        best = lambda fn: PyNORXBENCH.measure(fn, GATE_SIZE, min_time=min_time, memory=False)["latency_s"]["min"];
+        for op, fast, slow in (
+                ("aead_encrypt", lambda: norx.aead_encrypt(b'', m, b'', n, k), lambda: ref.aead_encrypt(b'', m, b'', n, k)),
+                ("aead_decrypt", lambda: norx.aead_decrypt(b'', c, b'', n, k), lambda: ref.aead_decrypt(b'', c, b'', n, k))):
+            speedup = best(slow) / best(fast);
+            measured[str(config) + " " + op] = speedup;
+            if speedup < recorded * (1 - threshold):
+                failures.append(op + " " + str(config) + ": " + "%.2fx faster than the reference, recorded %.2fx"
+                    % (speedup, recorded) + " (threshold " + str(threshold) + ")");
+    return (failures, measured);
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="PyNORX differential fuzzing and performance gate");
+    commands = parser.add_subparsers(dest="command", required=True);
+    run = commands.add_parser("fuzz", help="compare every fast path against the frozen reference");
+    run.add_argument("--iterations", type=int, default=100, help="random configurations, default 100");
+    run.add_argument("--seed", type=int, default=None, help="seed to replay, default random");
+    run.add_argument("--batch", type=int, default=4, help="most messages per configuration, default 4");
+    timing = commands.add_parser("gate", help="fail on a throughput regression relative to the reference");
+    timing.add_argument("--threshold", type=float, default=0.25, help="allowed drop of the speedup, default 0.25");
+    timing.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement, default 0.2");
+    args = parser.parse_args(argv);
+    if args.command == "fuzz":
+        seed = random.randrange(0, 1 << 32) if args.seed is None else args.seed;
+        failures = fuzz(args.iterations, seed, batch=args.batch, log=print);
+        print(("FAILED: " + str(len(failures))) if failures else "PASS", "(seed " + str(seed) + ")");
+    else:
+        failures, measured = gate(args.threshold, min_time=args.min_time);
+        for name in measured:
+            print(name, "%.2fx" % measured[name]);
+        for failure in failures:
+            print("REGRESSION:", failure);
+    return 1 if failures else 0;
+
+if (__name__ == "__main__"):
+    sys.exit(main());
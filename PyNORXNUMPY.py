@@ -0,0 +1,216 @@
+__doc__ = """
+    Optional NumPy backend for PyNORX: runs the NORX permutation over many independent States at once.
+    N States are held as a (16, N) array of 32- or 64-bit words and every G step is a handful of vectorized
+    XOR/AND/shift operations over all N columns, which amortizes the Python overhead of the scalar code.
+    Used automatically by PyNORX.aead_encrypt_many/aead_decrypt_many (Lanes = 1) for batches of many records of
+    similar length, when numpy can be imported (see PyNORX.NUMPY_BATCH_MIN).
+    Messages of different lengths are handled by masking: at every block step only the States that still
+    have a block in the current phase are advanced.
+    """
+
+try:
+    import numpy;
+except ImportError: # numpy is optional, AVAILABLE tells callers whether this backend can be used
+    numpy = None;
+
+from PyNORX import __ROT_CONSTS__;
+
+AVAILABLE = numpy is not None;
+
+__STEPS__ = ((0, 4, 8, 12), (1, 5, 9, 13), (2, 6, 10, 14), (3, 7, 11, 15), # Column step
+             (0, 5, 10, 15), (1, 6, 11, 12), (2, 7, 8, 13), (3, 4, 9, 14)); # Diagonal step
+
+def __dtype__(w):
+    return numpy.dtype('<u4' if w == 32 else '<u8');
+
+def numpy_f_funct(S, w, r):
+    """
+    Apply r rounds of the NORX F permutation (w-bit words) to every column of the (16, N) State array S, in place
+    """
+    t = S.dtype.type;
+    rc = __ROT_CONSTS__[w];
+    rr = [(t(n), t(w - n)) for n in rc];
+    one = t(1);
+    s = [S[i].copy() for i in range(0, 16)];
+    for i in range(0, r):
+        for (a, b, c, d) in __STEPS__:
+            for j in (0, 2):
+                s[a] = (s[a] ^ s[b]) ^ ((s[a] & s[b]) << one); # H
+                x = s[a] ^ s[d];
+                s[d] = (x >> rr[j][0]) | (x << rr[j][1]); # ROT
+                s[c] = (s[c] ^ s[d]) ^ ((s[c] & s[d]) << one);
+                x = s[b] ^ s[c];
+                s[b] = (x >> rr[j+1][0]) | (x << rr[j+1][1]);
+    for i in range(0, 16):
+        S[i] = s[i];
+
+def __words__(norx, xs):
+    # (4, N) array of the key or nonce words of every record
+    return numpy.frombuffer(b''.join(bytes(x) for x in xs), dtype=__dtype__(norx.NORX_W_BITS)).reshape(-1, 4).T;
+
+def __blocks__(norx, xs, pad):
+    # concatenate every x as whole rate blocks (the last one padded, or zero-filled when pad is False)
+    # returns tuple(words array (total blocks, WORDS_RATE), first block of each x, block count of each x)
+    b = norx.BYTES_RATE;
+    counts = numpy.array([len(x) // b + 1 if len(x) > 0 else 0 for x in xs], dtype=numpy.int64);
+    starts = numpy.zeros(len(xs), dtype=numpy.int64);
+    if len(xs) > 1:
+        starts[1:] = numpy.cumsum(counts)[:-1];
+    buf = bytearray(int(counts.sum()) * b);
+    for j in range(0, len(xs)):
+        o = int(starts[j]) * b;
+        buf[o:o+len(xs[j])] = xs[j];
+        if pad and counts[j] > 0:
+            buf[o+len(xs[j])] ^= 0x01;
+            buf[o+int(counts[j])*b-1] ^= 0x80;
+    words = numpy.frombuffer(buf, dtype=__dtype__(norx.NORX_W_BITS)).reshape(-1, norx.WORDS_RATE);
+    return (words, starts, counts);
+
+def __steps__(S, counts):
+    # yield tuple(block index, indices of the States that have that block) for every block step of a phase
+    everyone = numpy.arange(S.shape[1]);
+    for i in range(0, int(counts.max()) if len(counts) else 0):
+        active = counts > i;
+        yield (i, everyone if active.all() else numpy.nonzero(active)[0]);
+
+def __gather__(S, act):
+    return S if act.size == S.shape[1] else S[:, act];
+
+def __scatter__(S, act, Sa):
+    if Sa is not S:
+        S[:, act] = Sa;
+
+def numpy_init(norx, nonces, keys):
+    """
+    Vectorized PyNORX.init for every (nonce, key) pair (returns tuple((16, N) State array, (4, N) key words))
+    """
+    N, K = __words__(norx, nonces), __words__(norx, keys);
+    S = numpy.empty((16, N.shape[1]), dtype=N.dtype);
+    S[0:4] = N;
+    S[4:8] = K;
+    S[8:16] = numpy.array(norx.__INIT_CONST__, dtype=N.dtype)[:, None];
+    S[12] ^= S.dtype.type(norx.NORX_W_BITS); # mix in session parameters
+    S[13] ^= S.dtype.type(norx.NORX_R);
+    S[14] ^= S.dtype.type(norx.NORX_P);
+    S[15] ^= S.dtype.type(norx.NORX_T_BITS);
+    numpy_f_funct(S, norx.NORX_W_BITS, norx.NORX_R);
+    S[12:16] ^= K;
+    return (S, K);
+
+def numpy_absorb(norx, S, xs, tag):
+    """
+    Vectorized PyNORX.__absorb__ of xs[j] into the State column j
+    """
+    words, starts, counts = __blocks__(norx, xs, True);
+    tag = S.dtype.type(tag);
+    for (i, act) in __steps__(S, counts):
+        Sa = __gather__(S, act);
+        Sa[15] ^= tag;
+        numpy_f_funct(Sa, norx.NORX_W_BITS, norx.NORX_R);
+        Sa[:norx.WORDS_RATE] ^= words[starts[act] + i].T;
+        __scatter__(S, act, Sa);
+
+def numpy_encrypt(norx, S, xs):
+    """
+    Vectorized PyNORX.__encryptP1__ of xs[j] with the State column j (returns list of ciphertexts)
+    """
+    words, starts, counts = __blocks__(norx, xs, True);
+    out = numpy.empty_like(words);
+    tag = S.dtype.type(norx.DOMAIN_PYLD_TAG);
+    for (i, act) in __steps__(S, counts):
+        Sa = __gather__(S, act);
+        Sa[15] ^= tag;
+        numpy_f_funct(Sa, norx.NORX_W_BITS, norx.NORX_R);
+        rows = starts[act] + i;
+        Sa[:norx.WORDS_RATE] ^= words[rows].T;
+        out[rows] = Sa[:norx.WORDS_RATE].T;
+        __scatter__(S, act, Sa);
+    return __split__(norx, out, starts, xs);
+
+def numpy_decrypt(norx, S, xs):
+    """
+    Vectorized PyNORX.__decryptP1__ of xs[j] with the State column j (returns list of plaintexts)
+    """
+    b = norx.BYTES_RATE;
+    words, starts, counts = __blocks__(norx, xs, False);
+    rem = numpy.array([len(x) % b for x in xs], dtype=numpy.int64);
+    out = numpy.empty_like(words);
+    tag = S.dtype.type(norx.DOMAIN_PYLD_TAG);
+    for (i, act) in __steps__(S, counts):
+        Sa = __gather__(S, act);
+        Sa[15] ^= tag;
+        numpy_f_funct(Sa, norx.NORX_W_BITS, norx.NORX_R);
+        rows = starts[act] + i;
+        C = words[rows]; # (active, WORDS_RATE)
+        last = counts[act] - 1 == i;
+        if last.any(): # last (partial, possibly empty) block: the key stream fills the gap after the ciphertext
+            K = numpy.ascontiguousarray(Sa[:norx.WORDS_RATE, last].T).view(numpy.uint8);
+            X = numpy.ascontiguousarray(C[last]).view(numpy.uint8);
+            r = rem[act][last];
+            X = numpy.where(numpy.arange(b)[None, :] < r[:, None], X, K);
+            X[numpy.arange(len(r)), r] ^= 0x01; # apply padding bits at length and last byte
+            X[:, -1] ^= 0x80;
+            C = C.copy();
+            C[last] = X.view(words.dtype);
+        out[rows] = Sa[:norx.WORDS_RATE].T ^ C;
+        Sa[:norx.WORDS_RATE] = C.T;
+        __scatter__(S, act, Sa);
+    return __split__(norx, out, starts, xs);
+
+def __split__(norx, out, starts, xs):
+    out = out.tobytes();
+    b = norx.BYTES_RATE;
+    return [out[int(starts[j])*b:int(starts[j])*b+len(xs[j])] for j in range(0, len(xs))];
+
+def numpy_gen_tag(norx, S, K):
+    """
+    Vectorized PyNORX.__gen_tag__ for every State column (returns list of tags, the States are burned)
+    """
+    S[15] ^= S.dtype.type(norx.DOMAIN_FIN_TAG);
+    numpy_f_funct(S, norx.NORX_W_BITS, norx.NORX_R);
+    S[12:16] ^= K; # added in v3.0, mix key into Capacity of State
+    numpy_f_funct(S, norx.NORX_W_BITS, norx.NORX_R);
+    S[12:16] ^= K;
+    t = numpy.ascontiguousarray(S[norx.WORDS_RATE:16].T).tobytes();
+    S[:] = 0; # burn states, no longer needed
+    n = norx.BYTES_CAPACITY;
+    return [t[j*n:j*n+norx.BYTES_TAG] for j in range(0, S.shape[1])];
+
+def aead_encrypt_batch(norx, records):
+    """
+    Vectorized aead_encrypt of every record tuple(h, m, t, n, k) with the parameters of norx (Lanes = 1 only),
+    keys and nonces must already be validated (returns list of bytes(ciphertext if any + tag))
+    """
+    assert AVAILABLE and norx.NORX_P == 1;
+    if not records:
+        return [];
+    H, M, T, N, K = zip(*records);
+    S, K = numpy_init(norx, N, K);
+    numpy_absorb(norx, S, H, norx.DOMAIN_HEAD_TAG);
+    C = numpy_encrypt(norx, S, M);
+    numpy_absorb(norx, S, T, norx.DOMAIN_TRAIL_TAG);
+    return [c + t for c, t in zip(C, numpy_gen_tag(norx, S, K))];
+
+def aead_decrypt_batch(norx, records):
+    """
+    Vectorized aead_decrypt of every record tuple(h, c, t, n, k) with the parameters of norx (Lanes = 1 only),
+    keys, nonces and ciphertext lengths must already be validated
+    (returns list of tuple(True/False, bytearray of plaintext or None))
+    """
+    assert AVAILABLE and norx.NORX_P == 1;
+    if not records:
+        return [];
+    H, C, T, N, K = zip(*records);
+    d = norx.BYTES_TAG;
+    tags = [c[len(c)-d:] for c in C];
+    S, K = numpy_init(norx, N, K);
+    numpy_absorb(norx, S, H, norx.DOMAIN_HEAD_TAG);
+    M = numpy_decrypt(norx, S, [memoryview(c)[:len(c)-d] for c in C]);
+    numpy_absorb(norx, S, T, norx.DOMAIN_TRAIL_TAG);
+    results = [];
+    for m, t0, t1 in zip(M, tags, numpy_gen_tag(norx, S, K)):
+        if not norx.__verify_tag__(t0, t1):
+            results.append((False, None)); # validation failed, return nothing
+        else:
+            results.append((True, bytearray(m) if m else None));
+    return results;
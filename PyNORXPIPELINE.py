@@ -0,0 +1,295 @@
+__doc__ = """
+    Pipelined PyNORX for many concurrent single-lane (Lanes = 1) messages: up to width messages advance through
+    the permutation in lockstep, one permutation per message per step, and free slots are refilled from the
+    queue as soon as earlier messages finish (continuous batching).
+    The permutation is fused across messages without any dependency: word i of every slot is packed into one
+    Python integer (slot j at bits j*w..j*w+w-1), so each H/ROT of the F kernel is a handful of big integer
+    operations for all slots at once, with masks stopping carries and rotations at the slot boundaries.
+    Every step unpacks the States once (array extended slices), lets each message compute what to XOR into its
+    State (block, key, padding, the next domain tag), and packs all of that back in one go.
+    Aggregate throughput grows with width, at the cost of latency: a message takes as many steps as it has
+    permutations, and every step costs about as much as width/10 scalar permutations.
+    Used by PyNORX.aead_encrypt_many/aead_decrypt_many (Lanes = 1) without the compiled core, unless the batch is
+    large enough for the NumPy backend (see PyNORX.PIPELINE_BATCH_MIN / NUMPY_BATCH_MIN); NorxPipeline itself
+    serves queue consumers that take messages as they come.
+    """
+
+import array;
+import collections;
+import sys;
+
+from PyNORX import __ROT_CONSTS__;
+
+__FUSED_KERNELS__ = {}; # (Word_Size_Bits, Rounds) -> generated fused permutation
+# array typecode holding exactly one word, for unpacking the States
+__STATE_TYPECODES__ = {w: [x for x in ('I', 'L', 'Q') if array.array(x).itemsize * 8 == w][0] for w in (32, 64)};
+
+# what a message does with its State after a permutation
+__KEY__, __ABSORB__, __ENC__, __DEC__, __TAG__ = range(0, 5);
+
+def __fused_kernel__(w, r):
+    """
+    Return the straight-line F permutation over packed States for w-bit words and r rounds (generated once,
+    then cached). Called as F(S, HM, L0, H0, L1, H1, L2, H2, L3, H3): S holds 16 packed integers and is permuted
+    in place, HM drops the carries of H across slots, Li/Hi keep the two halves of rotation i inside each slot.
+    """
+    kernel = __FUSED_KERNELS__.get((w, r));
+    if kernel is None:
+        kernel = __build_fused_kernel__(w, r);
+        __FUSED_KERNELS__[(w, r)] = kernel;
+    return kernel;
+
+def __build_fused_kernel__(w, r):
+    rc = __ROT_CONSTS__.get(w);
+    if rc is None: raise Exception("Unsupported word size: " + str(w));
+    s = ["s" + str(i) for i in range(0, 16)];
+    def H(x, y): # x = H(x, y), per slot
+        return "    %s = (%s ^ %s) ^ (((%s & %s) << 1) & HM)" % (x, x, y, x, y);
+    def ROT(x, y, i): # x = ROT(x ^ y, rc[i]), per slot
+        return "    %s ^= %s; %s = ((%s >> %d) & L%d) | ((%s << %d) & H%d)" % (x, y, x, x, rc[i], i, x, w - rc[i], i);
+    steps = ((0, 4, 8, 12), (1, 5, 9, 13), (2, 6, 10, 14), (3, 7, 11, 15), # Column step
+             (0, 5, 10, 15), (1, 6, 11, 12), (2, 7, 8, 13), (3, 4, 9, 14)); # Diagonal step
+    src = ["def F(S, HM, L0, H0, L1, H1, L2, H2, L3, H3):", "    " + ", ".join(s) + " = S"];
+    for i in range(0, r):
+        for (a, b, c, d) in steps:
+            a, b, c, d = s[a], s[b], s[c], s[d];
+            src.append(H(a, b));
+            src.append(ROT(d, a, 0));
+            src.append(H(c, d));
+            src.append(ROT(b, c, 1));
+            src.append(H(a, b));
+            src.append(ROT(d, a, 2));
+            src.append(H(c, d));
+            src.append(ROT(b, c, 3));
+    src.append("    " + ", ".join("S[" + str(i) + "]" for i in range(0, 16)) + " = " + ", ".join(s));
+    scope = {};
+    exec(compile("\n".join(src), "<NORX fused F kernel W=%d R=%d>" % (w, r), "exec"), scope);
+    return scope["F"];
+
+def __xor__(x, y):
+    # bytes x ^ y, both of the same length
+    return (int.from_bytes(x, 'little') ^ int.from_bytes(y, 'little')).to_bytes(len(x), 'little');
+
+class NorxPipeline(object):
+    """
+    Continuous batching scheduler for one PyNORX configuration (Lanes = 1).
+    submit() queues a message and returns its ticket, step() advances every slot by one permutation and
+    returns the messages finished by it, as list of tuple(ticket, result) with the results of aead_encrypt /
+    aead_decrypt. drain() steps until everything submitted is done; run() does the same for an iterable of
+    records, pulling records only as slots free up, so it can consume an unbounded queue.
+    """
+
+    def __init__(self, norx, width = 64):
+        assert norx.NORX_P == 1; # lanes of one message are not pipelined, see PyNORX executor
+        assert width >= 1;
+        self.norx = norx;
+        self.width = width;
+        w, bw = norx.NORX_W_BITS, norx.BYTES_WORD;
+        self.__F__ = __fused_kernel__(w, norx.NORX_R);
+        ones = int.from_bytes(b'\x01'.ljust(bw, b'\0') * width, 'little'); # bit 0 of every slot
+        masks = [((1 << (w * width)) - 1) ^ ones]; # HM
+        for n in norx.__ROT_CONST__:
+            masks += [((1 << (w - n)) - 1) * ones, (((1 << n) - 1) << (w - n)) * ones]; # Li, Hi
+        self.__MASKS__ = masks;
+        U = norx.__INIT_CONST__;
+        codec = norx.__WORD4_CODEC__;
+        self.__INIT_TAIL__ = codec.pack(*U[0:4]) + codec.pack( # State words 8-15 of init(), parameters mixed in
+            U[4] ^ norx.NORX_W_BITS, U[5] ^ norx.NORX_R, U[6] ^ norx.NORX_P, U[7] ^ norx.NORX_T_BITS);
+        self.__S__ = [0] * 16; # every slot starts (and ends) all zero
+        self.__lanes__ = [None] * width; # the message in each slot, or None
+        self.__queue__ = collections.deque();
+        self.__done__ = []; # results of malformed messages, reported by the next step
+        self.__tickets__ = 0;
+
+    def __len__(self):
+        # messages submitted and not reported yet
+        return len(self.__queue__) + len(self.__done__) + sum(1 for x in self.__lanes__ if x is not None);
+
+    def submit(self, h, x, t, n, k, decrypt = False):
+        """
+        Queue aead_encrypt(h, x, t, n, k) (or aead_decrypt with decrypt = True) (returns its ticket, an int)
+        """
+        norx = self.norx;
+        ticket = self.__tickets__;
+        self.__tickets__ += 1;
+        if decrypt and (len(k) != norx.BYTES_KEY or len(n) != norx.BYTES_NONCE or len(x) < norx.BYTES_TAG):
+            self.__done__.append((ticket, (False, None))); # malformed, fails like aead_decrypt_many
+            return ticket;
+        assert len(k) == norx.BYTES_KEY;
+        assert len(n) == norx.BYTES_NONCE;
+        self.__queue__.append((ticket, self.__program__(h, x, t, decrypt), bytes(n), bytes(k), decrypt));
+        return ticket;
+
+    def __blocks__(self, x, kind, tag):
+        # steps for the blocks of x: full ones, then the padded (possibly empty) last one, when x is not empty
+        b = self.norx.BYTES_RATE;
+        x = memoryview(x).cast('B');
+        steps = [];
+        if len(x) > 0:
+            full = len(x) // b * b;
+            for i in range(0, full, b):
+                steps.append((tag, kind, x[i:i+b], b));
+            y = x[full:];
+            if kind == __DEC__:
+                steps.append((tag, kind, y, len(y))); # padded against the key stream, see step
+            else:
+                steps.append((tag, kind, self.norx.__pad__(y), len(y)));
+        return steps;
+
+    def __program__(self, h, x, t, decrypt):
+        # every permutation of one message as tuple(domain tag XORed in before it, what follows it, data, length)
+        norx = self.norx;
+        d = norx.BYTES_TAG;
+        payload = memoryview(x)[:len(x)-d] if decrypt else x;
+        steps = [(0, __KEY__, None, 0)]; # init
+        steps += self.__blocks__(h, __ABSORB__, norx.DOMAIN_HEAD_TAG);
+        steps += self.__blocks__(payload, __DEC__ if decrypt else __ENC__, norx.DOMAIN_PYLD_TAG);
+        steps += self.__blocks__(t, __ABSORB__, norx.DOMAIN_TRAIL_TAG);
+        t0 = bytes(x[len(x)-d:]) if decrypt else None; # the tag to verify
+        steps += [(norx.DOMAIN_FIN_TAG, __KEY__, None, 0), (0, __TAG__, t0, 0)];
+        return steps;
+
+    def step(self):
+        """
+        Refill free slots from the queue and advance every busy slot by one permutation
+        (returns list of tuple(ticket, result) for the messages that finished)
+        """
+        finished, self.__done__ = self.__done__, [];
+        norx = self.norx;
+        bw = norx.BYTES_WORD;
+        size = 16 * bw; # bytes of one State
+        width = self.width;
+        slots = self.__lanes__;
+        if not any(x is not None for x in slots): # nothing in flight, only admit
+            delta = bytearray(size * width);
+            self.__admit__(delta);
+            self.__apply__(delta);
+            return finished;
+        self.__F__(self.__S__, *self.__MASKS__);
+        states = self.__unpack__();
+        delta = bytearray(size * width);
+        b = norx.BYTES_RATE;
+        for j in range(0, width):
+            lane = slots[j];
+            if lane is None:
+                continue;
+            o = j * size;
+            ticket, steps, i, out, k, decrypt = lane;
+            tag, kind, x, length = steps[i];
+            if kind == __KEY__:
+                delta[o+b:o+size] = k; # key into the capacity, after init and in the tag
+            elif kind == __ABSORB__:
+                delta[o:o+b] = x;
+            elif kind == __ENC__:
+                delta[o:o+b] = x;
+                out.append(__xor__(states[o:o+b], x)[:length]);
+            elif kind == __DEC__:
+                if length < b: # last block: the key stream fills the gap after the ciphertext, then padding
+                    y = bytearray(states[o:o+b]);
+                    y[:length] = x;
+                    y[length] ^= 0x01;
+                    y[-1] ^= 0x80;
+                    x = y;
+                m = __xor__(states[o:o+b], x); # the State takes the ciphertext: XOR in the plaintext
+                delta[o:o+b] = m;
+                out.append(m[:length]);
+            else: # __TAG__
+                t = __xor__(states[o+b:o+size], k)[:norx.BYTES_TAG];
+                delta[o:o+size] = states[o:o+size]; # burn the slot back to all zero
+                slots[j] = None;
+                finished.append((ticket, self.__result__(out, t, x, decrypt)));
+                continue;
+            i += 1;
+            delta[o+15*bw] ^= steps[i][0]; # domain tag of the next permutation
+            lane[2] = i;
+        self.__admit__(delta);
+        self.__apply__(delta);
+        return finished;
+
+    def __result__(self, out, t, t0, decrypt):
+        if not decrypt:
+            return b''.join(out) + bytes(t);
+        if not self.norx.__verify_tag__(t0, t):
+            return (False, None); # validation failed, return nothing
+        m = bytearray(b''.join(out));
+        return (True, m if m else None);
+
+    def __admit__(self, delta):
+        # move queued messages into free slots: their init() State is XORed into the (all zero) slot
+        size = 16 * self.norx.BYTES_WORD;
+        slots, queue = self.__lanes__, self.__queue__;
+        for j in range(0, self.width):
+            if not queue:
+                return;
+            if slots[j] is None:
+                ticket, steps, n, k, decrypt = queue.popleft();
+                o = j * size;
+                delta[o:o+size] = __xor__(delta[o:o+size], n + k + self.__INIT_TAIL__);
+                slots[j] = [ticket, steps, 0, [], k, decrypt];
+
+    def __unpack__(self):
+        # the States of all slots, one after the other (returns bytes, State j at j*16 words)
+        norx = self.norx;
+        width, bw = self.width, norx.BYTES_WORD;
+        flat = array.array(__STATE_TYPECODES__[norx.NORX_W_BITS], bytes(16 * bw * width));
+        for i in range(0, 16):
+            word = array.array(__STATE_TYPECODES__[norx.NORX_W_BITS], self.__S__[i].to_bytes(bw * width, 'little'));
+            flat[i::16] = word;
+        if sys.byteorder != 'little':
+            flat.byteswap();
+        return flat.tobytes();
+
+    def __apply__(self, delta):
+        # XOR the per slot delta (same layout as __unpack__) into the packed States
+        norx = self.norx;
+        flat = array.array(__STATE_TYPECODES__[norx.NORX_W_BITS], delta);
+        if sys.byteorder != 'little':
+            flat.byteswap();
+        S = self.__S__;
+        for i in range(0, 16):
+            S[i] ^= int.from_bytes(flat[i::16].tobytes(), 'little');
+
+    def drain(self):
+        """
+        Step until every submitted message is done (generator of tuple(ticket, result), in completion order)
+        """
+        while len(self) > 0:
+            for result in self.step():
+                yield result;
+
+    def run(self, records, decrypt = False):
+        """
+        Process an iterable of record tuple(h, m or c, t, n, k), submitting records as slots free up
+        (generator of tuple(index of the record, result), in completion order)
+        """
+        assert len(self) == 0; # tickets of earlier submissions would not map to record indices
+        records = iter(records);
+        first = self.__tickets__;
+        more = True;
+        while True:
+            while more and len(self.__queue__) < self.width - sum(1 for x in self.__lanes__ if x is not None):
+                record = next(records, None);
+                if record is None:
+                    more = False;
+                else:
+                    self.submit(*record, decrypt=decrypt);
+            if len(self) == 0:
+                return;
+            for (ticket, result) in self.step():
+                yield (ticket - first, result);
+
+def aead_encrypt_batch(norx, records, width = 64):
+    """
+    Pipelined aead_encrypt of every record tuple(h, m, t, n, k) with the parameters of norx (Lanes = 1 only)
+    (returns list of bytes(ciphertext if any + tag), in record order)
+    """
+    results = dict(NorxPipeline(norx, width).run(records));
+    return [results[j] for j in range(0, len(results))];
+
+def aead_decrypt_batch(norx, records, width = 64):
+    """
+    Pipelined aead_decrypt of every record tuple(h, c, t, n, k) with the parameters of norx (Lanes = 1 only)
+    (returns list of tuple(True/False, bytearray of plaintext or None), in record order)
+    """
+    results = dict(NorxPipeline(norx, width).run(records, decrypt=True));
+    return [results[j] for j in range(0, len(results))];
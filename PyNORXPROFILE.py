@@ -0,0 +1,193 @@
+__doc__ = """
+    PyNORX profiling: runs a workload (one parameter set, some payload sizes, encrypt and/or decrypt) through
+    aead_encrypt/aead_decrypt once under cProfile and once under tracemalloc and writes, next to --output PREFIX:
+        PREFIX.pstats       raw cProfile data (python -m pstats PREFIX.pstats, snakeviz, ...)
+        PREFIX.cpu.folded   collapsed stacks "frame;frame;...;frame microseconds", time per call stack
+        PREFIX.mem.folded   collapsed allocation stacks "frame;...;frame bytes", largest live size per stack
+        PREFIX.mem.txt      allocations by line and the peak traced memory of every operation
+    The .folded files are what flamegraph.pl, inferno-flamegraph and speedscope read, e.g.:
+        python PyNORXPROFILE.py --sizes 64,4096 --ops encrypt,decrypt --output prof/norx
+        flamegraph.pl prof/norx.cpu.folded > cpu.svg; flamegraph.pl --countname bytes prof/norx.mem.folded > mem.svg
+    cProfile only records caller/callee pairs, so the CPU stacks split every function's time over its callers
+    in proportion to the time spent under each of them. Live allocations are sampled at every phase boundary
+    (see PyNORX.enable_stats), which always runs the Python code; the CPU pass uses --backend.
+    """
+
+import argparse;
+import cProfile;
+import collections;
+import os;
+import pstats;
+import sys;
+import time;
+import tracemalloc;
+
+from PyNORX import PyNORX;
+from PyNORXBENCH import parse_size;
+
+OPS = ('encrypt', 'decrypt');
+
+def workload(norx, sizes, ops = OPS, iterations = 10, header = 0, trailer = 0):
+    """
+    The calls to profile (returns list of tuple(name, fn, args)), every op for every size, repeated iterations
+    times; fixed random inputs, decryption gets the matching (valid) ciphertext
+    """
+    assert all(op in OPS for op in ops);
+    calls = [];
+    for size in sizes:
+        h, m, t = os.urandom(header), os.urandom(size), os.urandom(trailer);
+        n, k = os.urandom(norx.BYTES_NONCE), os.urandom(norx.BYTES_KEY);
+        if 'encrypt' in ops:
+            calls.append(("aead_encrypt " + str(size), norx.aead_encrypt, (h, m, t, n, k)));
+        if 'decrypt' in ops:
+            c = norx.aead_encrypt(h, m, t, n, k);
+            calls.append(("aead_decrypt " + str(size), norx.aead_decrypt, (h, c, t, n, k)));
+    return calls * iterations;
+
+def __label__(func):
+    # flame graph frame name for a cProfile (file, line, name) or tracemalloc (file, line) location
+    filename, line = os.path.basename(func[0]), func[1];
+    if len(func) < 3:
+        return filename + ":" + str(line);
+    if filename == '~': # built-in
+        return func[2].replace(';', ',');
+    return func[2] + " (" + filename + ":" + str(line) + ")";
+
+def profile_cpu(calls):
+    """
+    Run calls under cProfile (returns pstats.Stats)
+    """
+    profiler = cProfile.Profile();
+    def run():
+        for (name, fn, args) in calls:
+            fn(*args);
+    profiler.runcall(run);
+    return pstats.Stats(profiler);
+
+def collapse(stats, min_us = 1):
+    """
+    Collapsed stacks of a pstats.Stats (returns list of "frame;...;frame microseconds" lines, heaviest first)
+    """
+    entries = stats.stats; # (file, line, name): (calls, primitive calls, own time, cumulative time, callers)
+    callees = collections.defaultdict(list);
+    for f, (cc, nc, tt, ct, callers) in entries.items():
+        for g, edge in callers.items():
+            callees[g].append((f, edge[3])); # cumulative time of f under g
+    folded = collections.Counter();
+    def walk(f, share, path, seen):
+        ct = entries[f][3];
+        if ct <= 0 or share * 1e6 < min_us / 2:
+            return;
+        path = path + (__label__(f),);
+        folded[';'.join(path)] += share * entries[f][2] / ct;
+        for (g, edge) in callees[f]:
+            if g not in seen: # recursion folds into the outermost call
+                walk(g, share * edge / ct, path, seen | {g});
+    for f, entry in entries.items():
+        if not entry[4] and not f[2].startswith("<method 'disable'"): # roots: no callers
+            walk(f, entry[3], (), {f});
+    lines = [(round(us * 1e6), stack) for (stack, us) in folded.items()];
+    return [stack + " " + str(us) for (us, stack) in sorted(lines, reverse=True) if us >= min_us];
+
+def profile_memory(norx, calls, nframes = 32):
+    """
+    Run calls under tracemalloc (with statistics enabled on norx, the Python code) and sample the live
+    allocations at every phase boundary
+    (returns tuple(list of folded "frame;...;frame bytes" lines, list of tuple(bytes, "file:line"),
+    list of tuple(name, peak bytes)), the largest sample per stack / line, heaviest first)
+    """
+    stacks, lines = collections.Counter(), collections.Counter();
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>"),
+        tracemalloc.Filter(False, __file__));
+    def sample(phase, size, seconds):
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore);
+        for stat in snapshot.statistics('traceback'):
+            stack = ';'.join(__label__((frame.filename, frame.lineno)) for frame in stat.traceback);
+            stacks[stack] = max(stacks[stack], stat.size);
+        for stat in snapshot.statistics('lineno'):
+            line = __label__((stat.traceback[0].filename, stat.traceback[0].lineno));
+            lines[line] = max(lines[line], stat.size);
+    was_enabled = norx.stats() is not None;
+    norx.enable_stats(sample);
+    peaks = [];
+    try:
+        # the first call runs twice: in a throwaway session, where the filters compile (and cache) their patterns
+        # on first use, and again with the rest; tracemalloc.stop() forgets whatever the throwaway run allocated
+        for (j, run) in enumerate((calls[:1], calls)):
+            tracemalloc.start(nframes);
+            try:
+                for (name, fn, args) in run:
+                    tracemalloc.reset_peak();
+                    base = tracemalloc.get_traced_memory()[0];
+                    fn(*args);
+                    peaks.append((name, tracemalloc.get_traced_memory()[1] - base));
+            finally:
+                tracemalloc.stop();
+            if j == 0:
+                stacks.clear(); lines.clear(); peaks.clear();
+    finally:
+        if not was_enabled:
+            norx.disable_stats();
+    folded = [stack + " " + str(size) for (stack, size) in stacks.most_common() if size > 0];
+    return (folded, [(size, line) for (line, size) in lines.most_common()], peaks);
+
+def report(peaks, lines, top = 25):
+    """
+    Text report of profile_memory's peaks and lines (returns str)
+    """
+    out = ["Peak traced memory per operation (bytes, smallest / largest of all iterations):"];
+    seen = collections.OrderedDict();
+    for (name, peak) in peaks:
+        seen.setdefault(name, []).append(peak);
+    out += ["  %-28s %12d %12d" % (name, min(x), max(x)) for (name, x) in seen.items()];
+    out += ["", "Largest live allocations by line at a phase boundary (bytes):"];
+    out += ["  %12d  %s" % (size, line) for (size, line) in lines[:top]];
+    return "\n".join(out) + "\n";
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Profile PyNORX aead_encrypt/aead_decrypt (cProfile, tracemalloc)");
+    parser.add_argument("--words", type=int, default=64, help="Word_Size_Bits, default 64");
+    parser.add_argument("--rounds", type=int, default=4, help="Rounds, default 4");
+    parser.add_argument("--lanes", type=int, default=1, help="Lanes, default 1");
+    parser.add_argument("--tag-bits", type=int, default=None, help="Tag_Size_Bits, default 4 words");
+    parser.add_argument("--sizes", type=lambda x: tuple(parse_size(y) for y in x.split(',')), default=(64, 4096),
+        help="payload sizes, comma separated, K/M/G suffixes allowed, default 64,4096");
+    parser.add_argument("--header", type=parse_size, default=0, help="header size, default 0");
+    parser.add_argument("--trailer", type=parse_size, default=0, help="trailer size, default 0");
+    parser.add_argument("--ops", type=lambda x: tuple(x.split(',')), default=OPS,
+        help="operations, comma separated, default encrypt,decrypt");
+    parser.add_argument("--iterations", type=int, default=10, help="repetitions of the workload, default 10");
+    parser.add_argument("--backend", choices=('c', 'python'), default='python',
+        help="backend for the cProfile pass, default python");
+    parser.add_argument("--nframes", type=int, default=32, help="tracemalloc stack depth, default 32");
+    parser.add_argument("--top", type=int, default=25, help="lines in the printed reports, default 25");
+    parser.add_argument("--output", default="pynorx-profile", help="output file prefix, default pynorx-profile");
+    args = parser.parse_args(argv);
+    if any(op not in OPS for op in args.ops):
+        parser.error("--ops takes " + ",".join(OPS));
+    norx = PyNORX(Word_Size_Bits=args.words, Rounds=args.rounds, Lanes=args.lanes,
+        Tag_Size_Bits=args.tag_bits if args.tag_bits is not None else 4 * args.words, backend=args.backend);
+    calls = workload(norx, args.sizes, args.ops, args.iterations, args.header, args.trailer);
+    for (name, fn, arguments) in calls[:len(calls) // args.iterations]:
+        fn(*arguments); # warm up: F kernels are generated (and cached) on first use
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True);
+    started = time.perf_counter();
+    stats = profile_cpu(calls);
+    stats.dump_stats(args.output + ".pstats");
+    with open(args.output + ".cpu.folded", "w") as f:
+        f.write("\n".join(collapse(stats)) + "\n");
+    mem_folded, lines, peaks = profile_memory(norx, calls, args.nframes); # the calls are bound to norx
+    with open(args.output + ".mem.folded", "w") as f:
+        f.write("\n".join(mem_folded) + "\n");
+    text = report(peaks, lines, args.top);
+    with open(args.output + ".mem.txt", "w") as f:
+        f.write(text);
+    stats.sort_stats('tottime').print_stats(args.top);
+    print(text);
+    print("Profiled in %.1f s, wrote %s.{pstats,cpu.folded,mem.folded,mem.txt}" % (time.perf_counter() - started,
+        args.output));
+    return 0;
+
+if (__name__ == "__main__"):
+    sys.exit(main());
@@ -0,0 +1,176 @@
+__doc__ = """
+    Seekable, chunked PyNORX container: random-access decryption of large objects.
+    The plaintext is cut into fixed-size chunks and every chunk is sealed on its own with aead_encrypt:
+        nonce of chunk i = base nonce + i (as a little-endian integer, wrapping around)
+        header of chunk i = container header | chunk index (8 bytes) | final flag (1 byte)
+    so chunks can not be reordered, dropped, truncated or moved to another container without failing
+    validation. Container layout (all integers little-endian):
+        magic b'NRXS' | version (1 byte) | W | R | P (1 byte each) | Tag_Size_Bits (2 bytes) | chunk size (4 bytes)
+        | plaintext size (8 bytes) | base nonce (4 words) | chunk 0 (ciphertext + tag) | chunk 1 | ...
+    Every chunk but the last holds exactly chunk size bytes of plaintext, an empty object is a single empty chunk.
+    Reading a byte range only decrypts the chunks that cover it; chunks are sealed/opened through
+    aead_encrypt_many/aead_decrypt_many, so an executor (or the pipelined backend) processes them in parallel.
+    """
+
+import os;
+import struct;
+
+from PyNORX import PyNORX;
+from PyNORXFILE import MIN_TAG_BITS, check_parameters, chunk_header, chunk_nonce;
+
+MAGIC = b'NRXS';
+VERSION = 1;
+__HEADER__ = struct.Struct('<4sBBBBHIQ'); # magic, version, W, R, P, T, chunk size, plaintext size (nonce follows)
+DEFAULT_CHUNK_SIZE = 64 * 1024;
+
+def chunk_count(size, chunk_size):
+    """
+    Number of chunks for a plaintext of size bytes (an empty plaintext is one empty chunk)
+    """
+    return max(1, -(-size // chunk_size));
+
+def __chunk_header__(h, i, count):
+    return chunk_header(h, i, i == count - 1); # chunks are sealed as in PyNORXFILE
+
+def __records__(h, n, k, count, chunks, first):
+    # aead record tuple(h, m or c, t, n, k) for every chunk, chunks[j] being chunk number first + j
+    return [(__chunk_header__(h, first + j, count), chunks[j], b'', chunk_nonce(n, first + j), k)
+            for j in range(0, len(chunks))];
+
+class NorxSeekableWriter(object):
+    """
+    Produce a seekable container for a plaintext of a known size, one group of chunks at a time
+    (see seal/seal_file for the usual entry points)
+    """
+
+    def __init__(self, size, k, n = None, *, Word_Size_Bits = 64, Rounds = 4, Lanes = 1, Tag_Size_Bits = 256,
+                 chunk_size = DEFAULT_CHUNK_SIZE, executor = None):
+        assert size >= 0;
+        assert 0 < chunk_size < (1 << 32);
+        self.norx = PyNORX(Word_Size_Bits=Word_Size_Bits, Rounds=Rounds, Lanes=Lanes, Tag_Size_Bits=Tag_Size_Bits);
+        assert len(k) == self.norx.BYTES_KEY;
+        if n is None:
+            n = os.urandom(self.norx.BYTES_NONCE);
+        assert len(n) == self.norx.BYTES_NONCE;
+        self.size = size;
+        self.chunk_size = chunk_size;
+        self.count = chunk_count(size, chunk_size);
+        self.executor = executor;
+        self.header = __HEADER__.pack(MAGIC, VERSION, Word_Size_Bits, Rounds, Lanes, Tag_Size_Bits, chunk_size,
+            size) + bytes(n);
+        self.__n__ = bytes(n);
+        self.__k__ = bytes(k);
+        self.__sealed__ = 0; # index of the next chunk to seal
+
+    def seal_chunks(self, chunks):
+        """
+        Seal the next len(chunks) chunks of plaintext, in order (returns list of bytes, ciphertext + tag each)
+        """
+        first = self.__sealed__;
+        assert first + len(chunks) <= self.count;
+        for j in range(0, len(chunks)):
+            i = first + j;
+            assert len(chunks[j]) == (self.chunk_size if i < self.count - 1 else
+                self.size - (self.count - 1) * self.chunk_size);
+        self.__sealed__ += len(chunks);
+        records = __records__(self.header, self.__n__, self.__k__, self.count, chunks, first);
+        return self.norx.aead_encrypt_many(records, executor=self.executor, chunk_size=1);
+
+def seal(m, k, n = None, **options):
+    """
+    Seal the bytes-like m into a seekable container (returns bytes), options as for NorxSeekableWriter
+    """
+    m = memoryview(m).cast('B');
+    writer = NorxSeekableWriter(len(m), k, n, **options);
+    b = writer.chunk_size;
+    return writer.header + b''.join(writer.seal_chunks([m[i*b:(i+1)*b] for i in range(0, writer.count)]));
+
+def seal_file(src, dst, k, n = None, *, group = 64, **options):
+    """
+    Seal the file src into the seekable container file dst, group chunks at a time (bounded memory)
+    (returns the number of bytes written), options as for NorxSeekableWriter
+    """
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        writer = NorxSeekableWriter(os.fstat(fin.fileno()).st_size, k, n, **options);
+        written = fout.write(writer.header);
+        for first in range(0, writer.count, group):
+            chunks = [fin.read(writer.chunk_size) for i in range(first, min(first + group, writer.count))];
+            for c in writer.seal_chunks(chunks):
+                written += fout.write(c);
+    return written;
+
+class NorxSeekableReader(object):
+    """
+    Random-access reader over a seekable container held in a bytes-like object (bytes, bytearray, mmap, ...) or
+    an open binary file. read(offset, length) decrypts and validates only the chunks covering that range and
+    raises an Exception when any of them fails validation.
+    The header is checked before it is used, as in PyNORXFILE.decrypt_file: parameters given as keyword arguments
+    must match it and tags shorter than min_tag_bits are refused.
+    """
+
+    def __init__(self, source, k, *, executor = None, Word_Size_Bits = None, Rounds = None, Lanes = None,
+                 Tag_Size_Bits = None, min_tag_bits = MIN_TAG_BITS):
+        self.__source__ = source;
+        self.executor = executor;
+        raw = self.__fetch__(0, __HEADER__.size);
+        magic, version, W, R, P, T, chunk_size, size = __HEADER__.unpack(raw);
+        if magic != MAGIC or version != VERSION or W not in (32, 64) or chunk_size == 0:
+            raise Exception("Not a seekable PyNORX container (or an unsupported version).");
+        check_parameters(W, R, P, T, Word_Size_Bits=Word_Size_Bits, Rounds=Rounds, Lanes=Lanes,
+            Tag_Size_Bits=Tag_Size_Bits, min_tag_bits=min_tag_bits);
+        self.norx = PyNORX(Word_Size_Bits=W, Rounds=R, Lanes=P, Tag_Size_Bits=T);
+        assert len(k) == self.norx.BYTES_KEY;
+        self.__n__ = self.__fetch__(__HEADER__.size, self.norx.BYTES_NONCE);
+        self.header = raw + self.__n__;
+        self.__k__ = bytes(k);
+        self.size = size;
+        self.chunk_size = chunk_size;
+        self.count = chunk_count(size, chunk_size);
+
+    def __fetch__(self, offset, length):
+        source = self.__source__;
+        if hasattr(source, 'read'):
+            source.seek(offset);
+            x = source.read(length);
+        else:
+            x = bytes(memoryview(source)[offset:offset+length]);
+        if len(x) != length:
+            raise Exception("Truncated seekable PyNORX container.");
+        return x;
+
+    def __span__(self, i):
+        # tuple(offset, length) of chunk i (ciphertext + tag) in the container
+        b, d = self.chunk_size, self.norx.BYTES_TAG;
+        m = b if i < self.count - 1 else self.size - (self.count - 1) * b;
+        return (len(self.header) + i * (b + d), m + d);
+
+    def chunks(self, first, last):
+        """
+        Decrypt and validate chunks first..last (inclusive) (returns list of bytes plaintext)
+        """
+        assert 0 <= first <= last < self.count;
+        start, stop = self.__span__(first)[0], sum(self.__span__(last));
+        run = memoryview(self.__fetch__(start, stop - start)); # one read for the whole run of chunks
+        ciphertexts = [];
+        for i in range(first, last + 1):
+            o, length = self.__span__(i);
+            ciphertexts.append(run[o-start:o-start+length]);
+        records = __records__(self.header, self.__n__, self.__k__, self.count, ciphertexts, first);
+        results = self.norx.aead_decrypt_many(records, executor=self.executor, chunk_size=1);
+        for j in range(0, len(results)):
+            if not results[j][0]:
+                raise Exception("Chunk " + str(first + j) + " of the seekable PyNORX container failed validation.");
+        return [bytes(m) if m else b'' for (valid, m) in results];
+
+    def read(self, offset = 0, length = None):
+        """
+        Decrypt and validate length bytes (None = up to the end) starting at plaintext offset (returns bytes)
+        """
+        assert 0 <= offset;
+        end = self.size if length is None else min(self.size, offset + length);
+        if offset >= end:
+            return b'';
+        b = self.chunk_size;
+        first, last = offset // b, (end - 1) // b;
+        data = b''.join(self.chunks(first, last));
+        return data[offset - first * b:end - first * b];
@@ -1,16 +1,35 @@
-import hashlib;
+__doc__ = """
+    PyNORX self-tests: python PyNORXTESTS.py (or python PyNORX.py) prints a PASS/FAIL line per check,
+    python -m pytest runs every section as a test (see test_PyNORX.py). Only PyNORX and the test vectors are 
+    imported up front: every section imports what it exercises, and colors are used when colorama/termcolor 
+    are installed. The wall-clock performance gate only runs with PYNORX_PERF_GATE=1 set in the environment
+    (or through python PyNORXFUZZ.py gate).
+    """
+
+import os;
 from PyNORX import PyNORX;
 from PyNORXTESTCASES import PyNORXTestCases;
-import colorama;
-from termcolor import cprint;
 
-def RUN_TESTS():
-    colorama.init();
-    cprint("PyNORX Self-Tests:", 'cyan')
-    
-    #32-bit====================================================================================================
+FAILURES = []; # messages of the failed checks since the last RUN_TESTS/RUN_SECTION
+__COLORED__ = [];
+
+def cprint(text, color):
+    """
+    Print text in color (termcolor, when installed), failures ('red') are also recorded in FAILURES
+    """
+    if not __COLORED__:
+        try:
+            from termcolor import colored;
+        except ImportError:
+            colored = lambda text, color: text;
+        __COLORED__.append(colored);
+    if (color == 'red'): FAILURES.append(text);
+    print(__COLORED__[0](text, color));
+
+#32-bit========================================================================================================
+def TEST_32_BIT():
     cprint("--32-bit Tests--", 'cyan');
-    test = PyNORX(Word_Size_Bits = 32, Rounds = 4, Lanes = 1, Tag_Size_Bits = 128);
+    test = PyNORX(Word_Size_Bits = 32, Rounds = 4, Lanes = 1, Tag_Size_Bits = 128, backend = 'python');
     #internals
     S = [0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15];
     test.__f_funct__(S, 2)
@@ -19,13 +38,21 @@ def RUN_TESTS():
         0x335463EB, 0xF994220B, 0xBE0BF5C9, 0xD7C49104];
     if (S[8:] != expected): cprint("*32 F FUNCT FAIL!*", 'red');
     else: cprint("32 F FUNCT PASS!", 'green');
+    for r in (1, 4, 6, 63): # generated kernels vs. the G function reference
+        S = [0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15];
+        S_ref = S[:];
+        test.__f_funct__(S, r);
+        test.__f_funct_ref__(S_ref, r);
+        if (S != S_ref): cprint("*32 F KERNEL R=" + str(r) + " FAIL!*", 'red');
+        else: cprint("32 F KERNEL R=" + str(r) + " PASS!", 'green');
 
     #encryption
     cases = PyNORXTestCases(32);
     for i in range(0, len(cases)):
         cprint('--Test #' + str(i) + '--', 'yellow');
         case = cases[i];
-        test = PyNORX(Word_Size_Bits=32, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+        test = PyNORX(Word_Size_Bits=32, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8),
+            backend='python');
         result = test.aead_encrypt(case.H, case.P, case.T, case.IV, case.K);
         expected = bytearray(case.C[:]);
         expected.extend(case.Tag[:]);
@@ -48,9 +75,11 @@ def RUN_TESTS():
                 else: cprint(" Match at index " + str(j), 'blue');
         else: cprint("PyNORX 32-" + str(case.R) + "-" + str(case.L) + " Decrypt Pass!", 'green');
 
-    #64-bit====================================================================================================
+
+#64-bit========================================================================================================
+def TEST_64_BIT():
     cprint("--64-bit Tests--", 'cyan');
-    test = PyNORX(Word_Size_Bits = 64, Rounds = 4, Lanes = 1, Tag_Size_Bits = 256);
+    test = PyNORX(Word_Size_Bits = 64, Rounds = 4, Lanes = 1, Tag_Size_Bits = 256, backend = 'python');
     #internals
     S = [0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15];
     test.__f_funct__(S, 2)
@@ -59,13 +88,21 @@ def RUN_TESTS():
         0xB5E9E22493DFFB96, 0xB980C852479FAFBD, 0xDA24516BF55EAFD4, 0x86026AE8536F1501];
     if (S[8:] != expected): cprint("*64 F FUNCT FAIL!*", 'red');
     else: cprint("64 F FUNCT PASS!", 'green');
+    for r in (1, 4, 6, 63): # generated kernels vs. the G function reference
+        S = [0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15];
+        S_ref = S[:];
+        test.__f_funct__(S, r);
+        test.__f_funct_ref__(S_ref, r);
+        if (S != S_ref): cprint("*64 F KERNEL R=" + str(r) + " FAIL!*", 'red');
+        else: cprint("64 F KERNEL R=" + str(r) + " PASS!", 'green');
     
     #encryption
     cases = PyNORXTestCases(64);
     for i in range(0, len(cases)):
         cprint('--Test #' + str(i) + '--', 'yellow');
         case = cases[i];
-        test = PyNORX(Word_Size_Bits=64, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+        test = PyNORX(Word_Size_Bits=64, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8),
+            backend='python');
         result = test.aead_encrypt(case.H, case.P, case.T, case.IV, case.K);
         expected = bytearray(case.C[:]);
         expected.extend(case.Tag[:]);
@@ -88,5 +125,569 @@ def RUN_TESTS():
                 else: cprint(" Match at index " + str(j), 'blue');
         else: cprint("PyNORX 64-" + str(case.R) + "-" + str(case.L) + " Decrypt Pass!", 'green');
 
+
+#streaming=====================================================================================================
+def TEST_STREAMING():
+    from concurrent.futures import ThreadPoolExecutor;
+    cprint("--Streaming Tests--", 'cyan');
+    executor = ThreadPoolExecutor(4);
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            options = dict(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+            base = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            for (test, size) in [(PyNORX(**options), size) for size in (1, 7, 1000)] + \
+                    ([(PyNORX(executor=executor, **options), 7)] if case.L > 1 else []):
+                name = base + (" (executor)" if test.executor is not None else "");
+                enc, dec = test.encryptor(case.IV, case.K), test.decryptor(case.IV, case.K);
+                enc.LANE_RUN_BLOCKS = dec.LANE_RUN_BLOCKS = 1; # executor: hand every lane its blocks right away
+                result = bytearray();
+                for j in range(0, len(case.H), size): enc.update_header(case.H[j:j+size]);
+                for j in range(0, len(case.P), size): result += enc.update(case.P[j:j+size]);
+                for j in range(0, len(case.T), size): enc.update_trailer(case.T[j:j+size]);
+                result += enc.finalize();
+                if (result != case.C + case.Tag):
+                    cprint("*" + name + " Stream Encrypt (chunk " + str(size) + ") FAILED!*", 'red');
+                else: cprint(name + " Stream Encrypt (chunk " + str(size) + ") Pass!", 'green');
+                plain = bytearray();
+                for j in range(0, len(case.H), size): dec.update_header(case.H[j:j+size]);
+                for j in range(0, len(case.C), size): plain += dec.update(case.C[j:j+size]);
+                for j in range(0, len(case.T), size): dec.update_trailer(case.T[j:j+size]);
+                valid, rest = dec.finalize(case.Tag);
+                if (not valid or plain + rest != case.P):
+                    cprint("*" + name + " Stream Decrypt (chunk " + str(size) + ") FAILED!*", 'red');
+                else: cprint(name + " Stream Decrypt (chunk " + str(size) + ") Pass!", 'green');
+    executor.shutdown();
+
+
+#zero-copy=====================================================================================================
+def TEST_ZERO_COPY():
+    cprint("--Zero-Copy (_into) Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            out = bytearray(5 + len(case.C) + len(case.Tag));
+            written = test.aead_encrypt_into(memoryview(out), case.H, case.P, case.T, case.IV, case.K, 5);
+            if (written != len(out) - 5 or out[5:] != case.C + case.Tag):
+                cprint("*" + name + " Encrypt Into FAILED!*", 'red');
+            else: cprint(name + " Encrypt Into Pass!", 'green');
+            plain = bytearray(len(case.P));
+            result = test.aead_decrypt_into(plain, case.H, memoryview(out)[5:], case.T, case.IV, case.K);
+            if (result != (True, len(case.P)) or plain != case.P):
+                cprint("*" + name + " Decrypt Into FAILED!*", 'red');
+            else: cprint(name + " Decrypt Into Pass!", 'green');
+
+
+#lane executor=================================================================================================
+def TEST_LANE_EXECUTOR():
+    from concurrent.futures import ProcessPoolExecutor;
+    cprint("--Lane Executor Tests--", 'cyan');
+    with ProcessPoolExecutor() as executor:
+        for w in (32, 64):
+            for case in PyNORXTestCases(w):
+                if (case.L == 1): continue;
+                test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8),
+                    executor=executor, backend='python');
+                name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+                result = test.aead_encrypt(case.H, case.P, case.T, case.IV, case.K);
+                if (result != case.C + case.Tag): cprint("*" + name + " Executor Encrypt FAILED!*", 'red');
+                else: cprint(name + " Executor Encrypt Pass!", 'green');
+                result = test.aead_decrypt(case.H, result, case.T, case.IV, case.K);
+                if (result != (True, case.P)): cprint("*" + name + " Executor Decrypt FAILED!*", 'red');
+                else: cprint(name + " Executor Decrypt Pass!", 'green');
+
+
+#batch=========================================================================================================
+def TEST_BATCH():
+    cprint("--Batch Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8),
+                backend='python');
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            records = [(case.H, case.P[:j], case.T, case.IV, case.K) for j in (0, 1, len(case.P))];
+            expected = [test.aead_encrypt(*record) for record in records];
+            result = test.aead_encrypt_many(records, chunk_size=2);
+            if (result != expected): cprint("*" + name + " Batch Encrypt FAILED!*", 'red');
+            else: cprint(name + " Batch Encrypt Pass!", 'green');
+            records = [(case.H, result[j], case.T, case.IV, case.K) for j in range(0, len(result))];
+            records.append((case.H, result[-1][:-1], case.T, case.IV, case.K)); # truncated, must fail on its own
+            result = test.aead_decrypt_many(records, chunk_size=2);
+            if (result != [(True, None), (True, case.P[:1]), (True, case.P), (False, None)]):
+                cprint("*" + name + " Batch Decrypt FAILED!*", 'red');
+            else: cprint(name + " Batch Decrypt Pass!", 'green');
+    import PyNORXNUMPY, PyNORXPIPELINE;
+    test = PyNORX(Word_Size_Bits=64, Rounds=4, Lanes=1, Tag_Size_Bits=256, backend='python');
+    numpy = PyNORXNUMPY if PyNORXNUMPY.AVAILABLE else PyNORXPIPELINE;
+    short, long = (b'', bytes(64), b'', None, None), (b'', bytes(65536), b'', None, None);
+    choices = [(2, [], None), (8, [], PyNORXPIPELINE), (191, [], PyNORXPIPELINE), (192, [], numpy),
+        (0, [long] * 8, PyNORXPIPELINE), (0, [long] * 192, numpy), (100, [long], None), (2000, [long], PyNORXPIPELINE)];
+    if (any(test.__batch_backend__([short] * count + extra) is not backend for (count, extra, backend) in choices)):
+        cprint("*Batch Backend Crossover FAILED!*", 'red');
+    else: cprint("Batch Backend Crossover Pass!", 'green');
+
+
+#key context===================================================================================================
+def TEST_KEY_CONTEXT():
+    cprint("--Key Context Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8),
+                backend='python');
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            context = test.key_context(case.K, cache_size=1);
+            results = [context.aead_encrypt(case.H, case.P, case.T, case.IV) for j in range(0, 2)];
+            if (results != [case.C + case.Tag] * 2 or context.cache.stats()["hits"] != 1):
+                cprint("*" + name + " Key Context Encrypt FAILED!*", 'red');
+            else: cprint(name + " Key Context Encrypt Pass!", 'green');
+            result = context.aead_decrypt(case.H, results[0], case.T, case.IV);
+            if (result != (True, case.P)): cprint("*" + name + " Key Context Decrypt FAILED!*", 'red');
+            else: cprint(name + " Key Context Decrypt Pass!", 'green');
+            context.burn();
+
+
+#session=======================================================================================================
+def TEST_SESSION():
+    import threading;
+    cprint("--Session Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            # the test vector nonce is prefix | counter, the session must land on it and then move on
+            session = test.session(case.K, case.IV[:-8], counter=int.from_bytes(case.IV[-8:], 'little'));
+            n0, c0 = session.aead_encrypt(case.H, case.P, case.T);
+            n1, c1 = session.aead_encrypt(case.H, case.P, case.T);
+            if (n0 != case.IV or c0 != case.C + case.Tag or n1 == n0 or 
+                    session.aead_decrypt(case.H, c1, case.T, n1) != (True, case.P)):
+                cprint("*" + name + " Session FAILED!*", 'red');
+            else: cprint(name + " Session Pass!", 'green');
+    test = PyNORX(Word_Size_Bits=32, Rounds=4, Lanes=1, Tag_Size_Bits=128);
+    session = test.session(bytes(16), counter=(1 << 64) - 2, block_size=1);
+    results = [session.aead_encrypt(b'', b'', b'')[0][-8:] for j in range(0, 2)];
+    try:
+        session.aead_encrypt(b'', b'', b'');
+        cprint("*Session Counter Exhaustion FAILED!*", 'red');
+    except Exception:
+        if (results != [((1 << 64) - 2).to_bytes(8, 'little'), b'\xff' * 8]): 
+            cprint("*Session Counter Exhaustion FAILED!*", 'red');
+        else: cprint("Session Counter Exhaustion Pass!", 'green');
+    session = test.session(bytes(16), block_size=7);
+    nonces = [];
+    def worker():
+        nonces.extend([session.next_nonce() for j in range(0, 500)]);
+    threads = [threading.Thread(target=worker) for j in range(0, 4)];
+    for thread in threads: thread.start();
+    for thread in threads: thread.join();
+    if (len(set(nonces)) != 2000 or len(set(n[:8] for n in nonces)) != 1): 
+        cprint("*Session Threaded Nonces FAILED!*", 'red');
+    else: cprint("Session Threaded Nonces Pass!", 'green');
+
+#asyncio=======================================================================================================
+def TEST_ASYNC():
+    import asyncio;
+    from PyNORXASYNC import AsyncPyNORX;
+    cprint("--Async Tests--", 'cyan');
+    async def chunked(x, size):
+        for j in range(0, len(x), size): yield x[j:j+size];
+    async def roundtrip(anorx, case):
+        c = await anorx.aead_encrypt(case.H, case.P, case.T, case.IV, case.K);
+        s = b''.join([x async for x in anorx.encrypt_stream(case.H, chunked(case.P, 50), case.T, case.IV, case.K)]);
+        m = b''.join([x async for x in anorx.decrypt_stream(case.H, chunked(case.C, 50), case.T, case.Tag, 
+            case.IV, case.K)]);
+        return (c, s, m, await anorx.aead_decrypt(case.H, c, case.T, case.IV, case.K));
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            for threshold in (0, 1 << 20): # everything in the executor, everything inline
+                c, s, m, result = asyncio.run(roundtrip(AsyncPyNORX(test, inline_threshold=threshold), case));
+                if (c != case.C + case.Tag or s != c or m != case.P or result != (True, case.P)):
+                    cprint("*" + name + " Async (threshold " + str(threshold) + ") FAILED!*", 'red');
+                else: cprint(name + " Async (threshold " + str(threshold) + ") Pass!", 'green');
+
+
+#file container================================================================================================
+def TEST_FILE_CONTAINER():
+    import tempfile;
+    import PyNORXFILE;
+    cprint("--File Container Tests--", 'cyan');
+    with tempfile.TemporaryDirectory() as folder:
+        plain, sealed, opened = (os.path.join(folder, x) for x in ("plain", "sealed", "opened"));
+        for w in (32, 64):
+            for case in PyNORXTestCases(w):
+                name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+                with open(plain, "wb") as f: f.write(case.P);
+                PyNORXFILE.encrypt_file(plain, sealed, case.K, case.IV, Word_Size_Bits=w, Rounds=case.R,
+                    Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8), chunk_size=7);
+                valid = PyNORXFILE.decrypt_file(sealed, opened, case.K, Word_Size_Bits=w, Rounds=case.R,
+                    Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+                with open(opened, "rb") as f: result = f.read();
+                if (not valid or result != case.P): cprint("*" + name + " File Round Trip FAILED!*", 'red');
+                else: cprint(name + " File Round Trip Pass!", 'green');
+                with open(sealed, "rb") as f: container = bytearray(f.read());
+                last = (len(case.P) - 1) % 7 + 1 + len(case.Tag); # size of the last chunk, ciphertext + tag
+                with open(sealed, "wb") as f: f.write(container[:-last]);
+                if (len(case.P) <= 7 or PyNORXFILE.decrypt_file(sealed, opened, case.K) or os.path.exists(opened)):
+                    cprint("*" + name + " File Dropped Chunk FAILED!*", 'red'); # the last chunk is gone
+                else: cprint(name + " File Dropped Chunk Pass!", 'green');
+                test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+                legacy = PyNORXFILE.__HEADER__.pack(b'NORX', 1, w, case.R, case.L, len(case.Tag)*8, 7) + case.IV;
+                with open(sealed, "wb") as f: f.write(legacy + test.aead_encrypt(legacy, case.P, b'', case.IV, case.K));
+                valid = PyNORXFILE.decrypt_file(sealed, opened, case.K);
+                with open(opened, "rb") as f: result = f.read();
+                if (not valid or result != case.P): cprint("*" + name + " File Version 1 FAILED!*", 'red');
+                else: cprint(name + " File Version 1 Pass!", 'green');
+                container[8:10] = bytes(2); # Tag_Size_Bits = 0: a downgrade that would accept any ciphertext
+                container[-1] ^= 0x01;
+                with open(sealed, "wb") as f: f.write(container);
+                refused = 0;
+                for expected in ({}, {"Tag_Size_Bits": int(len(case.Tag)*8)}, {"min_tag_bits": 0, "Rounds": 63}):
+                    try:
+                        PyNORXFILE.decrypt_file(sealed, opened, case.K, **expected);
+                    except Exception:
+                        refused += 1;
+                if (refused != 3 or os.path.getsize(opened) != len(case.P)): # refused before dst was touched
+                    cprint("*" + name + " File Header Downgrade FAILED!*", 'red');
+                else: cprint(name + " File Header Downgrade Pass!", 'green');
+        with open(plain, "wb") as f: f.write(bytes(100));
+        key = ["--key-hex", "00" * 32];
+        PyNORXFILE.main(["encrypt", plain, sealed, "--rounds", "6", "--chunk-size", "30"] + key);
+        try:
+            PyNORXFILE.main(["decrypt", sealed, opened] + key); # expects the default 4 rounds
+            cprint("*File CLI Expected Parameters FAILED!*", 'red');
+        except Exception:
+            if (PyNORXFILE.main(["decrypt", sealed, opened, "--rounds", "6"] + key) != 0):
+                cprint("*File CLI Expected Parameters FAILED!*", 'red');
+            else: cprint("File CLI Expected Parameters Pass!", 'green');
+
+
+#seekable container============================================================================================
+def TEST_SEEKABLE_CONTAINER():
+    import PyNORXSEEK;
+    cprint("--Seekable Container Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            sealed = PyNORXSEEK.seal(case.P, case.K, case.IV, Word_Size_Bits=w, Rounds=case.R, Lanes=case.L,
+                Tag_Size_Bits=int(len(case.Tag)*8), chunk_size=30);
+            reader = PyNORXSEEK.NorxSeekableReader(sealed, case.K, Word_Size_Bits=w, Rounds=case.R, Lanes=case.L,
+                Tag_Size_Bits=int(len(case.Tag)*8));
+            ranges = [(0, None), (0, 1), (29, 2), (45, 60), (127, 5), (200, 1)];
+            if ([reader.read(o, l) for (o, l) in ranges] != [bytes(case.P[o:None if l is None else o+l])
+                    for (o, l) in ranges]):
+                cprint("*" + name + " Seekable Read FAILED!*", 'red');
+            else: cprint(name + " Seekable Read Pass!", 'green');
+            sealed = bytearray(sealed);
+            sealed[-1] ^= 0x01; # last chunk tampered with, the other chunks must still read back fine
+            reader = PyNORXSEEK.NorxSeekableReader(sealed, case.K);
+            try:
+                reader.read(120, 1);
+                cprint("*" + name + " Seekable Tamper Detection FAILED!*", 'red');
+            except Exception:
+                if (reader.read(0, 90) != case.P[:90]): cprint("*" + name + " Seekable Tamper Detection FAILED!*", 'red');
+                else: cprint(name + " Seekable Tamper Detection Pass!", 'green');
+            sealed[8:10] = bytes(2); # Tag_Size_Bits = 0: a downgrade that would accept any ciphertext
+            refused = 0;
+            for expected in ({}, {"Tag_Size_Bits": int(len(case.Tag)*8)}, {"min_tag_bits": 0, "Lanes": 255}):
+                try:
+                    PyNORXSEEK.NorxSeekableReader(sealed, case.K, **expected);
+                except Exception:
+                    refused += 1;
+            if (refused != 3): cprint("*" + name + " Seekable Header Downgrade FAILED!*", 'red');
+            else: cprint(name + " Seekable Header Downgrade Pass!", 'green');
+
+
+#instrumentation===============================================================================================
+def TEST_INSTRUMENTATION():
+    cprint("--Instrumentation Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            events = [];
+            test.enable_stats(lambda phase, size, seconds: events.append((phase, size)));
+            result = test.aead_encrypt(case.H, case.P, case.T, case.IV, case.K);
+            stats = test.stats();
+            blocks = lambda x: len(x) // test.BYTES_RATE + 1; # full blocks + the padded last one
+            # init + header + (branch + lane merges) + payload + trailer + 2 for the tag
+            expected = 1 + blocks(case.H) + (1 + case.L if case.L > 1 else 0) + blocks(case.P) + blocks(case.T) + 2;
+            test.disable_stats();
+            if (result != case.C + case.Tag or stats["permutations"] != expected or 
+                    stats["rounds"] != expected * case.R or stats["phases"]["payload"]["bytes"] != len(case.P) or
+                    [e[0] for e in events] != ['init', 'header', 'payload'] + (['merge'] if case.L > 1 else []) + 
+                    ['trailer', 'tag'] or test.stats() is not None):
+                cprint("*" + name + " Instrumentation FAILED!*", 'red');
+            else: cprint(name + " Instrumentation Pass!", 'green');
+            test.enable_stats();
+            enc = test.encryptor(case.IV, case.K);
+            for j in range(0, len(case.H), 7): enc.update_header(case.H[j:j+7]);
+            result = b''.join([enc.update(case.P[j:j+7]) for j in range(0, len(case.P), 7)]);
+            for j in range(0, len(case.T), 7): enc.update_trailer(case.T[j:j+7]);
+            result += enc.finalize();
+            stream = test.stats();
+            test.reset_stats();
+            valid, chunks = test.aead_decrypt_lazy(case.H, case.C + case.Tag, case.T, case.IV, case.K, 50);
+            plain = b''.join(chunks);
+            lazy = test.stats(); # two passes: verify, then release
+            test.disable_stats();
+            sizes = lambda stats: [stats["phases"][phase]["bytes"] for phase in ('header', 'payload', 'trailer')];
+            if (result != case.C + case.Tag or sizes(stream) != [len(case.H), len(case.P), len(case.T)] or
+                    stream["permutations"] != expected or not valid or plain != case.P or
+                    sizes(lazy) != [2 * len(case.H), 2 * len(case.P), 2 * len(case.T)] or
+                    lazy["permutations"] != 2 * expected or lazy["phases"]["tag"]["calls"] != 2):
+                cprint("*" + name + " Stream/Lazy Instrumentation FAILED!*", 'red');
+            else: cprint(name + " Stream/Lazy Instrumentation Pass!", 'green');
+
+
+#verify-then-release===========================================================================================
+def TEST_LAZY_DECRYPT():
+    cprint("--Lazy Decrypt Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            for size in (1, 50, 1000):
+                valid, chunks = test.aead_decrypt_lazy(case.H, case.C + case.Tag, case.T, case.IV, case.K, size);
+                written = [];
+                forged = test.aead_decrypt_to(written.append, case.H, case.C + case.Tag[:-1] + b'\0', case.T,
+                    case.IV, case.K, size);
+                if (not valid or b''.join(chunks) != case.P or forged or written):
+                    cprint("*" + name + " Lazy Decrypt (chunk " + str(size) + ") FAILED!*", 'red');
+                else: cprint(name + " Lazy Decrypt (chunk " + str(size) + ") Pass!", 'green');
+
+
+#pipeline======================================================================================================
+def TEST_PIPELINE():
+    import PyNORXPIPELINE;
+    cprint("--Pipeline Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            if (case.L != 1): continue; # lanes are not pipelined
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8),
+                backend='python');
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            # ragged queue, more messages than slots: every prefix length of the payload
+            records = [(case.H[:j], case.P[:j], case.T, case.IV, case.K) for j in range(0, len(case.P) + 1)];
+            expected = [test.aead_encrypt(*record) for record in records];
+            result = PyNORXPIPELINE.aead_encrypt_batch(test, records, width=5);
+            if (result != expected or result[-1] != case.C + case.Tag):
+                cprint("*" + name + " Pipeline Encrypt FAILED!*", 'red');
+            else: cprint(name + " Pipeline Encrypt Pass!", 'green');
+            records = [(case.H[:j], result[j], case.T, case.IV, case.K) for j in range(0, len(result))];
+            records[7] = (case.H[:7], result[7][:-1] + bytes([result[7][-1] ^ 1]), case.T, case.IV, case.K);
+            result = PyNORXPIPELINE.aead_decrypt_batch(test, records, width=5);
+            if (result != [test.aead_decrypt(*record) for record in records] or result[-1] != (True, case.P) or
+                    result[7] != (False, None)):
+                cprint("*" + name + " Pipeline Decrypt FAILED!*", 'red');
+            else: cprint(name + " Pipeline Decrypt Pass!", 'green');
+
+#shared parameters=============================================================================================
+def TEST_SHARED_PARAMETERS():
+    cprint("--Shared Parameters Tests--", 'cyan');
+    for w in (32, 64):
+        a = PyNORX(Word_Size_Bits=w, Rounds=4, Lanes=1, Tag_Size_Bits=4*w);
+        b = PyNORX(Word_Size_Bits=w, Rounds=4, Lanes=1, Tag_Size_Bits=4*w);
+        S = a.init(bytes(a.BYTES_NONCE), bytes(a.BYTES_KEY));
+        if (a.__PARAMS__ is not b.__PARAMS__ or a.BYTES_RATE != 12*w//8 or len(S) != 16 or 
+                type(S) is not list or hasattr(a, '__dict__')):
+            cprint("*PyNORX " + str(w) + " Shared Parameters FAILED!*", 'red');
+        else: cprint("PyNORX " + str(w) + " Shared Parameters Pass!", 'green');
+
+
+#compiled backend==============================================================================================
+def TEST_COMPILED_BACKEND():
+    import random;
+    import PyNORXC;
+    if (not PyNORXC.AVAILABLE):
+        cprint("--Compiled Backend Tests SKIPPED (run: python PyNORXC.py build)--", 'yellow');
+    else:
+        cprint("--Compiled Backend Tests--", 'cyan');
+        for w in (32, 64):
+            for case in PyNORXTestCases(w):
+                name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+                options = dict(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+                ref, test = PyNORX(backend='python', **options), PyNORX(backend='c', **options);
+                results = [x.aead_encrypt(case.H, case.P, case.T, case.IV, case.K) for x in (ref, test)];
+                results += [x.aead_decrypt(case.H, case.C + case.Tag, case.T, case.IV, case.K) for x in (ref, test)];
+                if (results != [case.C + case.Tag] * 2 + [(True, case.P)] * 2 or test.backend != 'c'):
+                    cprint("*" + name + " Compiled Backend FAILED!*", 'red');
+                else: cprint(name + " Compiled Backend Pass!", 'green');
+        rng = random.Random(16); # random configurations and lengths, same run every time
+        fails = 0;
+        for i in range(0, 200):
+            w = rng.choice((32, 64));
+            options = dict(Word_Size_Bits=w, Rounds=rng.choice((1, 2, 4, 6, rng.randint(1, 63))),
+                Lanes=rng.choice((1, 1, 2, 3, 4, rng.randint(1, 255))), Tag_Size_Bits=8*rng.randint(0, w//2));
+            ref, test = PyNORX(backend='python', **options), PyNORX(backend='c', **options);
+            h, m, t = [bytes(rng.getrandbits(8) for j in range(0, rng.randint(0, 300))) for x in range(0, 3)];
+            n, k = [bytes(rng.getrandbits(8) for j in range(0, w//2)) for x in range(0, 2)];
+            c = ref.aead_encrypt(h, m, t, n, k);
+            forged = bytearray(c);
+            if (forged): forged[rng.randrange(0, len(c))] ^= 1 << rng.randrange(0, 8); # one flipped bit
+            if (test.aead_encrypt(h, m, t, n, k) != c or 
+                    test.aead_decrypt(h, c, t, n, k) != ref.aead_decrypt(h, c, t, n, k) or
+                    test.aead_decrypt(h, forged, t, n, k) != ref.aead_decrypt(h, forged, t, n, k)):
+                fails += 1;
+                cprint("*Compiled Backend Fuzz FAILED for " + str(options) + "*", 'red');
+        if (fails == 0): cprint("Compiled Backend Fuzz (200 random inputs) Pass!", 'green');
+        from concurrent.futures import ThreadPoolExecutor;
+        selected = [PyNORX(Lanes=2, executor=ThreadPoolExecutor).backend, PyNORX(state_cache=1).backend];
+        for options in ({"Lanes": 2, "executor": ThreadPoolExecutor}, {"state_cache": 1}):
+            try:
+                PyNORX(backend='c', **options);
+                selected.append('c');
+            except Exception:
+                selected.append(None);
+        if (selected != ['python', 'python', None, None]):
+            cprint("*Compiled Backend Selection (executor, state_cache) FAILED!*", 'red');
+        else: cprint("Compiled Backend Selection (executor, state_cache) Pass!", 'green');
+
+
+#numpy backend=================================================================================================
+def TEST_NUMPY_BACKEND():
+    import PyNORXNUMPY;
+    if (not PyNORXNUMPY.AVAILABLE):
+        cprint("--NumPy Backend Tests SKIPPED (numpy not installed)--", 'yellow');
+        return;
+    cprint("--NumPy Backend Tests--", 'cyan');
+    for w in (32, 64):
+        cases = [case for case in PyNORXTestCases(w) if case.L == 1]; # lanes are not vectorized
+        for case in cases:
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            # ragged batch: every prefix length of the payload, from empty to the full test vector
+            records = [(case.H, case.P[:j], case.T, case.IV, case.K) for j in range(0, len(case.P) + 1)];
+            expected = [test.aead_encrypt(*record) for record in records];
+            result = PyNORXNUMPY.aead_encrypt_batch(test, records);
+            if (result != expected or result[-1] != case.C + case.Tag):
+                cprint("*" + name + " NumPy Encrypt FAILED!*", 'red');
+            else: cprint(name + " NumPy Encrypt Pass!", 'green');
+            records = [(case.H, result[j], case.T, case.IV, case.K) for j in range(0, len(result))];
+            result = PyNORXNUMPY.aead_decrypt_batch(test, records);
+            if (result != [test.aead_decrypt(*record) for record in records] or result[-1] != (True, case.P)):
+                cprint("*" + name + " NumPy Decrypt FAILED!*", 'red');
+            else: cprint(name + " NumPy Decrypt Pass!", 'green');
+
+#differential fuzzing==========================================================================================
+def TEST_DIFFERENTIAL_FUZZ():
+    import PyNORXFUZZ;
+    cprint("--Differential Fuzz Tests--", 'cyan');
+    failures = PyNORXFUZZ.fuzz(12, 20, batch=3); # same run every time, see PyNORXFUZZ.py for longer runs
+    for failure in failures:
+        cprint("*Differential Fuzz FAILED: " + failure + "*", 'red');
+    if (not failures): cprint("Differential Fuzz (12 random configurations, every path) Pass!", 'green');
+
+#performance gate==============================================================================================
+def TEST_PERFORMANCE_GATE():
+    import PyNORXFUZZ;
+    cprint("--Performance Gate Tests--", 'cyan');
+    failures, measured = PyNORXFUZZ.gate(0.25, min_time=0.1);
+    for failure in failures:
+        cprint("*Performance Gate FAILED: " + failure + "*", 'red');
+    if (not failures): cprint("Performance Gate (" + str(len(measured)) + " measurements vs. reference) Pass!", 'green');
+
+#MAC and detached tags=========================================================================================
+def TEST_MAC_DETACHED():
+    cprint("--MAC and Detached Tag Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8));
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            c, tag = test.aead_encrypt_detached(case.H, case.P, case.T, case.IV, case.K);
+            forged = bytes([tag[0] ^ 1]) + tag[1:];
+            if (c != case.C or tag != case.Tag or
+                    test.aead_decrypt_detached(case.H, case.C, case.T, case.IV, case.K, case.Tag) != (True, case.P) or
+                    test.aead_decrypt_detached(case.H, case.C, case.T, case.IV, case.K, forged) != (False, None)):
+                cprint("*" + name + " Detached Tag FAILED!*", 'red');
+            else: cprint(name + " Detached Tag Pass!", 'green');
+            data = case.H + case.P + case.T; # header-only message, the tag must match aead_encrypt's
+            expected = test.aead_encrypt(data, b'', b'', case.IV, case.K);
+            for size in (1, 7, 1000):
+                mac = test.mac(case.IV, case.K);
+                for j in range(0, len(data), size): mac.update(data[j:j+size]);
+                if (mac.digest() != expected or not mac.verify(expected) or mac.verify(forged)):
+                    cprint("*" + name + " MAC (chunk " + str(size) + ") FAILED!*", 'red');
+                else: cprint(name + " MAC (chunk " + str(size) + ") Pass!", 'green');
+            if (test.mac(case.IV, case.K).digest() != test.aead_encrypt(b'', b'', b'', case.IV, case.K)):
+                cprint("*" + name + " MAC (no data) FAILED!*", 'red');
+            else: cprint(name + " MAC (no data) Pass!", 'green');
+
+#post-header State cache=======================================================================================
+def TEST_STATE_CACHE():
+    cprint("--State Cache Tests--", 'cyan');
+    for w in (32, 64):
+        for case in PyNORXTestCases(w):
+            test = PyNORX(Word_Size_Bits=w, Rounds=case.R, Lanes=case.L, Tag_Size_Bits=int(len(case.Tag)*8),
+                backend='python', state_cache=2);
+            name = "PyNORX " + str(w) + "-" + str(case.R) + "-" + str(case.L);
+            cache = test.state_cache;
+            results = [test.aead_encrypt(case.H, case.P, case.T, case.IV, case.K), # miss, then hits
+                test.aead_decrypt(case.H, case.C + case.Tag, case.T, case.IV, case.K),
+                test.aead_decrypt(case.H, case.C + bytes(len(case.Tag)), case.T, case.IV, case.K),
+                test.aead_decrypt_detached(case.H, case.C, case.T, case.IV, case.K, case.Tag)];
+            if (results != [case.C + case.Tag, (True, case.P), (False, None), (True, case.P)] or
+                    (cache.hits, cache.misses, cache.evictions) != (3, 1, 0)):
+                cprint("*" + name + " State Cache FAILED!*", 'red');
+            else: cprint(name + " State Cache Pass!", 'green');
+            oldest = list(cache.__entries__.values())[0];
+            for i in range(1, 3): # two other nonces push the first State out
+                test.aead_encrypt(case.H, case.P, case.T, bytes([i]) * len(case.IV), case.K);
+            if (cache.stats()["evictions"] != 1 or cache.stats()["size"] != 2 or any(oldest) or 
+                    test.aead_encrypt(case.H, case.P, case.T, case.IV, case.K) != case.C + case.Tag):
+                cprint("*" + name + " State Cache Eviction FAILED!*", 'red');
+            else: cprint(name + " State Cache Eviction Pass!", 'green');
+
+#profiling=====================================================================================================
+def TEST_PROFILING():
+    import PyNORXPROFILE;
+    cprint("--Profiling Tests--", 'cyan');
+    test = PyNORX(Word_Size_Bits=64, Rounds=4, Lanes=2, Tag_Size_Bits=256, backend='python');
+    calls = PyNORXPROFILE.workload(test, (0, 200), iterations=2);
+    folded = PyNORXPROFILE.collapse(PyNORXPROFILE.profile_cpu(calls));
+    if (not folded or not all(x.rsplit(' ', 1)[1].isdigit() for x in folded) or
+            not any("aead_decrypt (PyNORX.py" in x and ";F (<NORX F kernel" in x for x in folded)):
+        cprint("*Profiling CPU Collapsed Stacks FAILED!*", 'red');
+    else: cprint("Profiling CPU Collapsed Stacks Pass!", 'green');
+    folded, lines, peaks = PyNORXPROFILE.profile_memory(test, calls);
+    if (len(peaks) != len(calls) or not any(line.startswith("PyNORX.py:") for (size, line) in lines) or
+            not folded or test.stats() is not None or not PyNORXPROFILE.report(peaks, lines)):
+        cprint("*Profiling Allocations FAILED!*", 'red');
+    else: cprint("Profiling Allocations Pass!", 'green');
+
+SECTIONS = (
+    TEST_32_BIT, TEST_64_BIT, TEST_STREAMING, TEST_ZERO_COPY,
+    TEST_LANE_EXECUTOR, TEST_BATCH, TEST_KEY_CONTEXT, TEST_SESSION,
+    TEST_ASYNC, TEST_FILE_CONTAINER, TEST_SEEKABLE_CONTAINER, TEST_INSTRUMENTATION,
+    TEST_LAZY_DECRYPT, TEST_PIPELINE, TEST_SHARED_PARAMETERS, TEST_COMPILED_BACKEND,
+    TEST_NUMPY_BACKEND, TEST_DIFFERENTIAL_FUZZ, TEST_MAC_DETACHED, TEST_STATE_CACHE,
+    TEST_PROFILING,
+);
+if os.environ.get("PYNORX_PERF_GATE") == "1": # timing depends on the machine and its load, opt-in only
+    SECTIONS += (TEST_PERFORMANCE_GATE,);
+
+def RUN_SECTION(section):
+    """
+    Run one section of SECTIONS (returns list of the failure messages, empty when everything passed)
+    """
+    del FAILURES[:];
+    section();
+    return list(FAILURES);
+
+def RUN_TESTS():
+    """
+    Run every section of SECTIONS (returns list of the failure messages, empty when everything passed)
+    """
+    try:
+        import colorama;
+        colorama.init();
+    except ImportError: # plain output
+        pass;
+    cprint("PyNORX Self-Tests:", 'cyan')
+    failures = [];
+    for section in SECTIONS:
+        failures += RUN_SECTION(section);
+    return failures;
+
 if (__name__ == "__main__"):
-    RUN_TESTS();
+    raise SystemExit(1 if RUN_TESTS() else 0);
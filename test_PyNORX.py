@@ -0,0 +1,13 @@
+__doc__ = """
+    pytest entry point for the PyNORX self-tests: every section of PyNORXTESTS is one test, e.g.
+        python -m pytest -q test_PyNORX.py
+    """
+
+import pytest;
+
+import PyNORXTESTS;
+
+@pytest.mark.parametrize("section", PyNORXTESTS.SECTIONS, ids=lambda section: section.__name__)
+def test_section(section):
+    failures = PyNORXTESTS.RUN_SECTION(section);
+    assert failures == [], "\n".join(failures);